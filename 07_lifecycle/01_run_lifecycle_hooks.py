@@ -9,19 +9,30 @@ Key Concepts:
 - RunHooks for global lifecycle monitoring
 - Event tracking across agent transitions
 - Performance monitoring and metrics collection
+- Opt-in tracemalloc memory profiling per agent and tool
 - System-wide logging and observability
 - Cross-agent analytics and insights
+- Composing several RunHooks with per-hook time budgets
+- Head and tail sampling to bound hook overhead at high volume
 
 Based on: https://openai.github.io/openai-agents-python/ref/lifecycle/
 """
 
 import asyncio
+import sys
 import time
-from typing import Any, Dict, List
+import tracemalloc
+from collections import Counter, OrderedDict, defaultdict, deque
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
 from datetime import datetime
+from types import SimpleNamespace
 
 from agents import Agent, Runner, handoff, function_tool
 from agents.lifecycle import RunHooks
+from agents.tracing import function_span, get_current_span, trace
+
+from hook_sampling import SampledRunHooks
+from streaming_stats import FixedBucketHistogram
 
 
 # ================================
@@ -154,9 +165,16 @@ class BasicRunHooks(RunHooks):
 # ================================
 
 class PerformanceMonitoringHooks(RunHooks):
-    """Advanced RunHooks for detailed performance monitoring."""
+    """Advanced RunHooks for detailed performance monitoring.
 
-    def __init__(self):
+    Start times are keyed per invocation, so one instance can be shared by
+    concurrent runs and parallel tool calls: agents by (run context, agent)
+    and tools by (run context, agent, tool, tool call). Durations use
+    time.perf_counter_ns and are recorded in fixed-bucket histograms.
+    """
+
+    def __init__(self, verbose: bool = True):
+        self.verbose = verbose
         self.performance_data = {
             "agents": {},
             "tools": {},
@@ -164,14 +182,45 @@ class PerformanceMonitoringHooks(RunHooks):
             "session_start": None,
             "memory_snapshots": []
         }
-        self.active_operations = {}
+        # Invocation key -> start times (ns), oldest first
+        self.active_operations: Dict[Tuple, List[int]] = {}
+        self.agent_histograms: Dict[str, FixedBucketHistogram] = defaultdict(
+            FixedBucketHistogram)
+        self.tool_histograms: Dict[str, FixedBucketHistogram] = defaultdict(
+            FixedBucketHistogram)
+
+    @staticmethod
+    def _tool_call_id() -> Optional[int]:
+        """Identify the running tool call.
+
+        The SDK runs each tool call inside its own tracing span, and the hooks
+        inherit it, so start and end of one call see the same span object even
+        when the same tool runs in parallel.
+        """
+        span = get_current_span()
+        return id(span) if span is not None else None
+
+    def _start(self, key: Tuple) -> None:
+        self.active_operations.setdefault(key, []).append(time.perf_counter_ns())
+
+    def _finish(self, key: Tuple) -> Optional[float]:
+        """Seconds since the matching start, or None if it was never seen."""
+        starts = self.active_operations.get(key)
+        if not starts:
+            return None
+        start_ns = starts.pop(0)
+        if not starts:
+            del self.active_operations[key]
+        return (time.perf_counter_ns() - start_ns) / 1e9
+
+    def _record_agent_time(self, agent_name: str, duration: float) -> None:
+        self.performance_data["agents"][agent_name]["total_time"] += duration
+        self.agent_histograms[agent_name].observe(duration)
 
     async def on_agent_start(self, context: Any, agent: Agent) -> None:
         """Track agent performance metrics."""
-        start_time = time.time()
-
         if self.performance_data["session_start"] is None:
-            self.performance_data["session_start"] = start_time
+            self.performance_data["session_start"] = time.time()
 
         # Initialize agent tracking
         if agent.name not in self.performance_data["agents"]:
@@ -183,27 +232,30 @@ class PerformanceMonitoringHooks(RunHooks):
             }
 
         self.performance_data["agents"][agent.name]["activations"] += 1
-        self.active_operations[f"agent_{agent.name}"] = start_time
+        self._start(("agent", id(context), agent.name))
 
-        print(
-            f"📊 [PERF] Agent {agent.name} started (activation #{self.performance_data['agents'][agent.name]['activations']})")
+        if self.verbose:
+            print(
+                f"📊 [PERF] Agent {agent.name} started (activation #{self.performance_data['agents'][agent.name]['activations']})")
 
     async def on_agent_end(self, context: Any, agent: Agent, output: Any) -> None:
         """Calculate agent performance metrics."""
-        end_time = time.time()
-        operation_key = f"agent_{agent.name}"
-
-        if operation_key in self.active_operations:
-            duration = end_time - self.active_operations[operation_key]
-            self.performance_data["agents"][agent.name]["total_time"] += duration
-            del self.active_operations[operation_key]
-
-            print(f"📊 [PERF] Agent {agent.name} completed in {duration:.3f}s")
+        duration = self._finish(("agent", id(context), agent.name))
+        if duration is not None:
+            self._record_agent_time(agent.name, duration)
+            if self.verbose:
+                print(f"📊 [PERF] Agent {agent.name} completed in {duration:.3f}s")
 
     async def on_handoff(self, context: Any, from_agent: Agent, to_agent: Agent) -> None:
         """Track handoff performance."""
         handoff_time = time.time()
 
+        # The SDK only calls on_agent_end for the final agent, so a handoff
+        # ends the source agent's activation
+        duration = self._finish(("agent", id(context), from_agent.name))
+        if duration is not None:
+            self._record_agent_time(from_agent.name, duration)
+
         handoff_data = {
             "from": from_agent.name,
             "to": to_agent.name,
@@ -212,16 +264,16 @@ class PerformanceMonitoringHooks(RunHooks):
         }
 
         self.performance_data["handoffs"].append(handoff_data)
-        print(
-            f"📊 [PERF] Handoff {from_agent.name} → {to_agent.name} at session time {handoff_data['session_time']:.3f}s")
+        if self.verbose:
+            print(
+                f"📊 [PERF] Handoff {from_agent.name} → {to_agent.name} at session time {handoff_data['session_time']:.3f}s")
 
     async def on_tool_start(self, context: Any, agent: Agent, tool) -> None:
         """Track tool performance."""
-        start_time = time.time()
-
         if tool.name not in self.performance_data["tools"]:
             self.performance_data["tools"][tool.name] = {
                 "calls": 0,
+                "completed": 0,
                 "total_time": 0,
                 "average_time": 0,
                 "called_by_agents": set()
@@ -230,24 +282,28 @@ class PerformanceMonitoringHooks(RunHooks):
         self.performance_data["tools"][tool.name]["calls"] += 1
         self.performance_data["tools"][tool.name]["called_by_agents"].add(
             agent.name)
-        self.active_operations[f"tool_{tool.name}_{agent.name}"] = start_time
+        self._start(("tool", id(context), agent.name,
+                    tool.name, self._tool_call_id()))
 
-        print(
-            f"📊 [PERF] Tool {tool.name} started by {agent.name} (call #{self.performance_data['tools'][tool.name]['calls']})")
+        if self.verbose:
+            print(
+                f"📊 [PERF] Tool {tool.name} started by {agent.name} (call #{self.performance_data['tools'][tool.name]['calls']})")
 
     async def on_tool_end(self, context: Any, agent: Agent, tool, result: str) -> None:
         """Calculate tool performance metrics."""
-        end_time = time.time()
-        operation_key = f"tool_{tool.name}_{agent.name}"
-
-        if operation_key in self.active_operations:
-            duration = end_time - self.active_operations[operation_key]
-            tool_data = self.performance_data["tools"][tool.name]
-            tool_data["total_time"] += duration
-            tool_data["average_time"] = tool_data["total_time"] / \
-                tool_data["calls"]
-            del self.active_operations[operation_key]
-
+        duration = self._finish(("tool", id(context), agent.name,
+                                 tool.name, self._tool_call_id()))
+        if duration is None:
+            return
+
+        tool_data = self.performance_data["tools"][tool.name]
+        tool_data["completed"] += 1
+        tool_data["total_time"] += duration
+        tool_data["average_time"] = tool_data["total_time"] / \
+            tool_data["completed"]
+        self.tool_histograms[tool.name].observe(duration)
+
+        if self.verbose:
             print(
                 f"📊 [PERF] Tool {tool.name} completed in {duration:.3f}s (avg: {tool_data['average_time']:.3f}s)")
 
@@ -268,6 +324,11 @@ class PerformanceMonitoringHooks(RunHooks):
             "session_duration": round(total_session_time, 3),
             "agents_performance": self.performance_data["agents"],
             "tools_performance": tools_report,
+            "latency_percentiles": {
+                "agents": {name: self._percentiles(histogram) for name, histogram in self.agent_histograms.items()},
+                "tools": {name: self._percentiles(histogram) for name, histogram in self.tool_histograms.items()}
+            },
+            "in_flight_operations": sum(len(starts) for starts in self.active_operations.values()),
             "handoffs_timeline": self.performance_data["handoffs"],
             "efficiency_metrics": {
                 "total_agent_time": sum(data["total_time"] for data in self.performance_data["agents"].values()),
@@ -276,6 +337,163 @@ class PerformanceMonitoringHooks(RunHooks):
             }
         }
 
+    @staticmethod
+    def _percentiles(histogram: FixedBucketHistogram) -> Dict[str, Any]:
+        return {
+            "count": histogram.count,
+            "p50": histogram.quantile(0.5),
+            "p95": histogram.quantile(0.95),
+            "p99": histogram.quantile(0.99)
+        }
+
+
+class MemoryProfilingHooks(PerformanceMonitoringHooks):
+    """Opt-in memory profiling on top of PerformanceMonitoringHooks.
+
+    Uses tracemalloc to measure the traced-memory delta of every agent
+    activation and tool call, fills `memory_snapshots` and per-agent
+    `peak_memory`, and diffs snapshots taken around each invocation to find
+    its top allocation sites. Reading the traced-memory counters is cheap;
+    snapshots copy every live trace, so by default only one in 100
+    invocations takes them. Pass `snapshot_every=1` for every invocation
+    when debugging, or `top_sites=0` for counters only. A snapshot runs
+    synchronously, so it blocks the event loop, and with it every concurrent
+    run, for its whole duration. Memory is sampled before the timer starts
+    and after it stops, so snapshots never count toward recorded durations.
+    Deltas of overlapping invocations include each other's allocations, so
+    attribution is approximate under concurrency.
+    """
+
+    def __init__(self, verbose: bool = True, top_sites: int = 5, snapshot_every: int = 100,
+                 nframes: int = 1, max_snapshots: int = 1000):
+        super().__init__(verbose=verbose)
+        self.top_sites = top_sites
+        self.snapshot_every = max(1, snapshot_every)
+        self.performance_data["memory_snapshots"] = deque(maxlen=max_snapshots)
+        # Invocation key -> (traced bytes, snapshot or None) at start, oldest first
+        self.memory_starts: Dict[Tuple, List[Tuple[int, Optional[tracemalloc.Snapshot]]]] = {}
+        self.memory_deltas: Dict[str, Dict[str, int]] = {"agents": defaultdict(int), "tools": defaultdict(int)}
+        self.allocation_sites: Dict[str, Dict[str, Counter]] = {"agents": defaultdict(Counter), "tools": defaultdict(Counter)}
+        self.result_bytes: Dict[str, int] = defaultdict(int)
+        self._invocations = 0
+        self._filters = [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<unknown>")
+        ]
+
+        # Leave tracing alone if someone else already started it
+        self.started_tracing = not tracemalloc.is_tracing()
+        if self.started_tracing:
+            tracemalloc.start(nframes)
+
+    def stop(self) -> None:
+        """Stop tracemalloc if these hooks started it."""
+        if self.started_tracing and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self.started_tracing = False
+
+    def _memory_start(self, key: Tuple) -> None:
+        if not tracemalloc.is_tracing():
+            return
+        self._invocations += 1
+        snapshot = None
+        if self.top_sites and self._invocations % self.snapshot_every == 0:
+            snapshot = tracemalloc.take_snapshot().filter_traces(self._filters)
+        current, _ = tracemalloc.get_traced_memory()
+        self.memory_starts.setdefault(key, []).append((current, snapshot))
+
+    def _memory_finish(self, key: Tuple, kind: str, name: str, agent_name: str) -> None:
+        starts = self.memory_starts.get(key)
+        if not starts or not tracemalloc.is_tracing():
+            return
+        start_bytes, start_snapshot = starts.pop(0)
+        if not starts:
+            del self.memory_starts[key]
+
+        current, peak = tracemalloc.get_traced_memory()
+        delta = current - start_bytes
+        self.memory_deltas[kind][name] += delta
+
+        agent_data = self.performance_data["agents"].get(agent_name)
+        if agent_data is not None:
+            agent_data["peak_memory"] = max(agent_data["peak_memory"], current)
+
+        if start_snapshot is not None:
+            end_snapshot = tracemalloc.take_snapshot().filter_traces(self._filters)
+            sites = self.allocation_sites[kind][name]
+            for stat in end_snapshot.compare_to(start_snapshot, "lineno")[:self.top_sites]:
+                if stat.size_diff > 0:
+                    frame = stat.traceback[0]
+                    sites[f"{frame.filename}:{frame.lineno}"] += stat.size_diff
+
+        self.performance_data["memory_snapshots"].append({
+            "timestamp": time.time(),
+            "kind": kind,
+            "name": name,
+            "agent": agent_name,
+            "current_bytes": current,
+            "peak_bytes": peak,
+            "delta_bytes": delta
+        })
+
+    async def on_agent_start(self, context: Any, agent: Agent) -> None:
+        self._memory_start(("agent", id(context), agent.name))
+        await super().on_agent_start(context, agent)
+
+    async def on_agent_end(self, context: Any, agent: Agent, output: Any) -> None:
+        await super().on_agent_end(context, agent, output)
+        self._memory_finish(("agent", id(context), agent.name),
+                            "agents", agent.name, agent.name)
+
+    async def on_handoff(self, context: Any, from_agent: Agent, to_agent: Agent) -> None:
+        await super().on_handoff(context, from_agent, to_agent)
+        self._memory_finish(("agent", id(context), from_agent.name),
+                            "agents", from_agent.name, from_agent.name)
+
+    async def on_tool_start(self, context: Any, agent: Agent, tool) -> None:
+        self._memory_start(("tool", id(context), agent.name,
+                            tool.name, self._tool_call_id()))
+        await super().on_tool_start(context, agent, tool)
+
+    async def on_tool_end(self, context: Any, agent: Agent, tool, result: str) -> None:
+        await super().on_tool_end(context, agent, tool, result)
+        # Results stay in the conversation history; track their shallow size separately
+        self.result_bytes[tool.name] += sys.getsizeof(result)
+        self._memory_finish(("tool", id(context), agent.name, tool.name, self._tool_call_id()),
+                            "tools", tool.name, agent.name)
+
+    def get_memory_report(self) -> Dict[str, Any]:
+        """Net allocation deltas and top allocation sites per agent and tool."""
+        def section(kind: str) -> Dict[str, Any]:
+            return {
+                name: {
+                    "net_bytes": delta,
+                    "top_sites": self.allocation_sites[kind][name].most_common(self.top_sites)
+                }
+                for name, delta in self.memory_deltas[kind].items()
+            }
+
+        current, peak = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (0, 0)
+        tools = section("tools")
+        for name, data in tools.items():
+            data["result_bytes"] = self.result_bytes[name]
+        return {
+            "traced_current_bytes": current,
+            "traced_peak_bytes": peak,
+            "agents": section("agents"),
+            "tools": tools,
+            "peak_memory_by_agent": {
+                name: data["peak_memory"] for name, data in self.performance_data["agents"].items()
+            }
+        }
+
+    def get_performance_report(self) -> Dict[str, Any]:
+        report = super().get_performance_report()
+        report["memory_profile"] = self.get_memory_report()
+        report["memory_snapshots"] = list(self.performance_data["memory_snapshots"])
+        return report
+
 
 # ================================
 # 3. Security & Audit RunHooks
@@ -404,7 +622,140 @@ class SecurityAuditHooks(RunHooks):
 
 
 # ================================
-# 4. Demo Tools and Agents
+# 4. Composite RunHooks
+# ================================
+
+class CompositeRunHooks(RunHooks):
+    """Fans every lifecycle callback out to several RunHooks concurrently.
+
+    Child hooks run together with asyncio.gather, so the run waits for the
+    slowest one rather than for their sum. Each hook gets a time budget per
+    callback (`timeout`, overridable per hook in `timeouts`). A hook that
+    exceeds it is cancelled, or with `detach_slow_hooks=True` left to finish in
+    the background; either way the run continues. Exceptions are counted and
+    logged instead of failing the run. Detached hooks may see later callbacks
+    before they finish the current one.
+    """
+
+    def __init__(self, hooks: Sequence[RunHooks], timeout: Optional[float] = 1.0,
+                 timeouts: Optional[Dict[str, float]] = None,
+                 detach_slow_hooks: bool = False, max_tracked_runs: int = 1000):
+        self.hooks: Dict[str, RunHooks] = {}
+        for hook in hooks:
+            name = type(hook).__name__
+            if name in self.hooks:
+                name = f"{name}#{len(self.hooks) + 1}"
+            self.hooks[name] = hook
+
+        self.timeout = timeout
+        self.timeouts = timeouts or {}
+        self.detach_slow_hooks = detach_slow_hooks
+        self.max_tracked_runs = max_tracked_runs
+
+        self.background: Set[asyncio.Task] = set()
+        self.costs: Dict[str, Dict[str, Any]] = {
+            name: {"calls": 0, "total_time": 0.0, "max_time": 0.0, "timeouts": 0,
+                   "detached": 0, "errors": 0, "by_callback": defaultdict(float)}
+            for name in self.hooks
+        }
+        # Per-run cost for the most recent runs, keyed by context identity
+        self.run_costs: "OrderedDict[int, Dict[str, float]]" = OrderedDict()
+
+    async def on_agent_start(self, context: Any, agent: Agent) -> None:
+        await self._fan_out("on_agent_start", context, agent)
+
+    async def on_agent_end(self, context: Any, agent: Agent, output: Any) -> None:
+        await self._fan_out("on_agent_end", context, agent, output)
+
+    async def on_handoff(self, context: Any, from_agent: Agent, to_agent: Agent) -> None:
+        await self._fan_out("on_handoff", context, from_agent, to_agent)
+
+    async def on_tool_start(self, context: Any, agent: Agent, tool) -> None:
+        await self._fan_out("on_tool_start", context, agent, tool)
+
+    async def on_tool_end(self, context: Any, agent: Agent, tool, result: str) -> None:
+        await self._fan_out("on_tool_end", context, agent, tool, result)
+
+    async def _fan_out(self, callback: str, context: Any, *args: Any) -> None:
+        run_cost = self._run_cost(context)
+        await asyncio.gather(*(
+            self._call(name, hook, callback, run_cost, context, *args)
+            for name, hook in self.hooks.items()
+        ))
+
+    def _run_cost(self, context: Any) -> Dict[str, float]:
+        key = id(context)
+        run_cost = self.run_costs.get(key)
+        if run_cost is None:
+            run_cost = self.run_costs[key] = defaultdict(float)
+            if len(self.run_costs) > self.max_tracked_runs:
+                self.run_costs.popitem(last=False)
+        else:
+            self.run_costs.move_to_end(key)
+        return run_cost
+
+    async def _call(self, name: str, hook: RunHooks, callback: str,
+                    run_cost: Dict[str, float], context: Any, *args: Any) -> None:
+        start = time.perf_counter()
+        task = asyncio.ensure_future(getattr(hook, callback)(context, *args))
+        done, _ = await asyncio.wait({task}, timeout=self.timeouts.get(name, self.timeout))
+        elapsed = time.perf_counter() - start
+
+        cost = self.costs[name]
+        cost["calls"] += 1
+        cost["total_time"] += elapsed
+        cost["max_time"] = max(cost["max_time"], elapsed)
+        cost["by_callback"][callback] += elapsed
+        run_cost[name] += elapsed
+
+        if done:
+            self._record_error(name, callback, task)
+        elif self.detach_slow_hooks:
+            cost["detached"] += 1
+            self.background.add(task)
+            task.add_done_callback(self.background.discard)
+            task.add_done_callback(
+                lambda finished: self._record_error(name, callback, finished))
+            print(f"⏳ [COMPOSITE] {name}.{callback} over budget, detached")
+        else:
+            cost["timeouts"] += 1
+            task.cancel()
+            print(f"⏱️  [COMPOSITE] {name}.{callback} over budget, cancelled")
+
+    def _record_error(self, name: str, callback: str, task: asyncio.Task) -> None:
+        if task.cancelled() or task.exception() is None:
+            return
+        self.costs[name]["errors"] += 1
+        print(f"❌ [COMPOSITE] {name}.{callback} failed: {task.exception()}")
+
+    async def drain(self, timeout: Optional[float] = None) -> None:
+        """Wait for detached hooks, e.g. before shutdown."""
+        if self.background:
+            await asyncio.wait(set(self.background), timeout=timeout)
+
+    def get_cost_report(self) -> Dict[str, Any]:
+        """Time each hook added to the run, in milliseconds."""
+        runs = len(self.run_costs)
+        report = {}
+        for name, cost in self.costs.items():
+            run_times = [run_cost[name] for run_cost in self.run_costs.values()]
+            report[name] = {
+                "calls": cost["calls"],
+                "total_ms": round(cost["total_time"] * 1000, 3),
+                "avg_ms_per_call": round(cost["total_time"] * 1000 / cost["calls"], 3) if cost["calls"] else 0,
+                "max_ms": round(cost["max_time"] * 1000, 3),
+                "avg_ms_per_run": round(sum(run_times) * 1000 / runs, 3) if runs else 0,
+                "timeouts": cost["timeouts"],
+                "detached": cost["detached"],
+                "errors": cost["errors"],
+                "by_callback_ms": {callback: round(seconds * 1000, 3)
+                                   for callback, seconds in cost["by_callback"].items()}
+            }
+        return report
+
+
+# ================================
+# 5. Demo Tools and Agents
 # ================================
 
 @function_tool
@@ -453,7 +804,7 @@ def create_admin_agent() -> Agent:
 
 
 # ================================
-# 5. Demo Functions
+# 6. Demo Functions
 # ================================
 
 async def demo_basic_run_hooks():
@@ -574,8 +925,9 @@ async def demo_combined_hooks():
     perf_hooks = PerformanceMonitoringHooks()
     security_hooks = SecurityAuditHooks()
 
-    # Note: In practice, you'd create a composite hooks class or use a monitoring system
-    # For this demo, we'll run with basic hooks and show how to combine insights
+    # All three run concurrently on every callback, each with a 0.5s budget
+    composite_hooks = CompositeRunHooks(
+        [basic_hooks, perf_hooks, security_hooks], timeout=0.5)
 
     # Create complex agent setup
     customer_agent = create_customer_service_agent()
@@ -587,11 +939,10 @@ async def demo_combined_hooks():
         handoff(admin_agent, tool_name_override="escalate_to_admin")
     ]
 
-    # Run with basic hooks (in production, you'd implement a composite hooks pattern)
     result = await Runner.run(
         customer_agent,
         input="I have a billing issue that may require admin intervention",
-        hooks=basic_hooks
+        hooks=composite_hooks
     )
 
     print(f"\nFinal Result: {result.final_output}")
@@ -604,10 +955,195 @@ async def demo_combined_hooks():
     print(f"  Tool Calls: {summary['tool_calls']}")
     print(f"  Duration: {summary['total_duration_seconds']}s")
     print(f"  Events/Second: {summary['events_per_second']}")
+    print(f"  Tool Time: {perf_hooks.get_performance_report()['efficiency_metrics']['total_tool_time']:.3f}s")
+    print(
+        f"  Security Events: {security_hooks.get_audit_report()['audit_summary']['security_events']}")
+
+    print(f"\n💰 Hook Cost per Run:")
+    for name, cost in composite_hooks.get_cost_report().items():
+        print(f"  {name}: {cost['avg_ms_per_run']}ms over {cost['calls']} calls "
+              f"(max {cost['max_ms']}ms, timeouts {cost['timeouts']}, errors {cost['errors']})")
+
+
+async def demo_hook_time_budgets():
+    """Demonstrate per-hook time budgets with a slow and a failing hook."""
+    print("\n=== Hook Time Budgets Demo ===")
+
+    class SlowExporterHooks(RunHooks):
+        """Stands in for a hook that ships events over a slow network."""
+
+        def __init__(self):
+            self.exported = 0
+
+        async def on_tool_end(self, context: Any, agent: Agent, tool, result: str) -> None:
+            await asyncio.sleep(0.3)
+            self.exported += 1
+
+    class FlakyHooks(RunHooks):
+        async def on_tool_start(self, context: Any, agent: Agent, tool) -> None:
+            raise ConnectionError("metrics backend unavailable")
+
+    agent = create_billing_agent()
+    tool = agent.tools[0]
+    context = object()  # The hooks only use the context's identity
+
+    for detach in (False, True):
+        exporter = SlowExporterHooks()
+        composite_hooks = CompositeRunHooks(
+            [BasicRunHooks(), exporter, FlakyHooks()], timeout=0.05,
+            detach_slow_hooks=detach)
+
+        start = time.perf_counter()
+        await composite_hooks.on_agent_start(context, agent)
+        for _ in range(3):
+            await composite_hooks.on_tool_start(context, agent, tool)
+            await composite_hooks.on_tool_end(context, agent, tool, "Payment processed")
+        await composite_hooks.on_agent_end(context, agent, "Done")
+        run_seconds = time.perf_counter() - start
+        await composite_hooks.drain()
+
+        mode = "detach" if detach else "cancel"
+        print(f"\n  [{mode}] hook time on the run path: {run_seconds:.3f}s, "
+              f"events exported: {exporter.exported}/3")
+        for name, cost in composite_hooks.get_cost_report().items():
+            print(f"    {name}: {cost['total_ms']}ms, timeouts {cost['timeouts']}, "
+                  f"detached {cost['detached']}, errors {cost['errors']}")
+
+
+async def demo_concurrent_run_timing():
+    """Demonstrate per-invocation timing with 1000 concurrent runs sharing one hooks instance."""
+    print("\n=== Concurrent Run Timing Demo ===")
+
+    perf_hooks = PerformanceMonitoringHooks(verbose=False)
+    agent = create_billing_agent()
+    tool = agent.tools[0]
+    runs = 1000
+
+    async def tool_call(context: Any, delay: float):
+        # Mirrors the SDK: one tracing span per tool call, hooks gathered inside it
+        with function_span(tool.name):
+            await asyncio.gather(perf_hooks.on_tool_start(context, agent, tool))
+            await asyncio.sleep(delay)
+            await asyncio.gather(perf_hooks.on_tool_end(context, agent, tool, "ok"))
+
+    async def simulated_run(index: int):
+        context = object()  # The hooks only use the context's identity
+        await perf_hooks.on_agent_start(context, agent)
+        # Two parallel calls of the same tool with different durations
+        await asyncio.gather(tool_call(context, 0.2), tool_call(context, 0.05))
+        await perf_hooks.on_agent_end(context, agent, f"run {index} done")
+
+    start = time.perf_counter()
+    with trace("concurrent_run_timing", disabled=True):
+        await asyncio.gather(*(simulated_run(index) for index in range(runs)))
+    elapsed = time.perf_counter() - start
 
+    report = perf_hooks.get_performance_report()
+    tool_latency = report["latency_percentiles"]["tools"][tool.name]
+    agent_latency = report["latency_percentiles"]["agents"][agent.name]
+    print(f"  {runs} runs in {elapsed:.2f}s, operations still in flight: {report['in_flight_operations']}")
+    tool_average = report["tools_performance"][tool.name]["average_time"]
+    print(f"  Tool calls timed: {tool_latency['count']}, average {tool_average:.3f}s "
+          f"(calls sleep 0.05s or 0.2s, plus scheduling delay)")
+    print(f"  Tool latency buckets: p50 ~{tool_latency['p50']:.3f}s, p95 ~{tool_latency['p95']:.3f}s")
+    print(f"  Agent runs timed: {agent_latency['count']}, p50 ~{agent_latency['p50']:.3f}s")
+
+async def demo_memory_profiling():
+    """Demonstrate tracemalloc-based memory attribution per agent and tool."""
+    print("\n=== Memory Profiling Demo ===")
+
+    # A handful of runs, so snapshot every invocation instead of sampling
+    memory_hooks = MemoryProfilingHooks(verbose=False, top_sites=3, snapshot_every=1)
+    agent = create_billing_agent()
+    payment_tool, lookup_tool = agent.tools
+    history: List[Any] = []  # Results stay referenced, like a run's conversation items
+
+    def lookup_user(user_id: int) -> List[Dict[str, Any]]:
+        return [{"user_id": user_id, "order": index, "notes": "x" * 200} for index in range(2000)]
+
+    def charge(amount: float) -> str:
+        return f"Charged ${amount:.2f}"
+
+    async def tool_call(context: Any, tool, work):
+        with function_span(tool.name):
+            await memory_hooks.on_tool_start(context, agent, tool)
+            result = work()
+            history.append(result)
+            await memory_hooks.on_tool_end(context, agent, tool, result)
+
+    try:
+        with trace("memory_profiling", disabled=True):
+            for run in range(5):
+                context = object()  # The hooks only use the context's identity
+                await memory_hooks.on_agent_start(context, agent)
+                await tool_call(context, lookup_tool, lambda: lookup_user(run))
+                await tool_call(context, payment_tool, lambda: charge(19.99))
+                await memory_hooks.on_agent_end(context, agent, "done")
+
+        report = memory_hooks.get_memory_report()
+    finally:
+        memory_hooks.stop()
+
+    print(f"  Snapshots recorded: {len(memory_hooks.performance_data['memory_snapshots'])}")
+    print(f"  Peak traced memory for {agent.name}: {report['peak_memory_by_agent'][agent.name] / 1024:.0f} KiB")
+    for tool_name, data in report["tools"].items():
+        print(f"  🔧 {tool_name}: net {data['net_bytes'] / 1024:.0f} KiB, "
+              f"results {data['result_bytes'] / 1024:.1f} KiB")
+        for site, size in data["top_sites"]:
+            print(f"     {size / 1024:8.0f} KiB  {site.rsplit('/', 1)[-1]}")
+
+async def demo_hook_sampling():
+    """Demonstrate head and tail sampling in front of a full-detail hook."""
+    print("\n=== Hook Sampling Demo ===")
+
+    perf_hooks = PerformanceMonitoringHooks(verbose=False)
+    sampled_hooks = SampledRunHooks(
+        perf_hooks,
+        sample_rate=0.05,
+        tenant_rates={"enterprise": 1.0},  # Always keep full detail for this tenant
+        slow_after=0.1,
+        # Hash a stable request id, so every process makes the same head decisions
+        run_id_of=lambda context: context.context["request_id"]
+    )
+    agent = create_billing_agent()
+    tool = agent.tools[0]
+
+    async def simulated_run(index: int):
+        tenant = "enterprise" if index % 50 == 0 else "self-serve"
+        context = SimpleNamespace(context={"tenant_id": tenant, "request_id": f"req-{index:04d}"})
+        await sampled_hooks.on_agent_start(context, agent)
+        await sampled_hooks.on_tool_start(context, agent, tool)
+        if index % 97 == 0:
+            await asyncio.sleep(0.15)  # A slow run
+        if index % 89 == 0:
+            result = "An error occurred while running the tool. Please try again. Error: card declined"
+        else:
+            result = "Payment processed"
+        await sampled_hooks.on_tool_end(context, agent, tool, result)
+        if index % 250 == 0:
+            raise RuntimeError("model call failed")  # Never reaches on_agent_end
+        await sampled_hooks.on_agent_end(context, agent, "done")
+
+    async def guarded_run(index: int):
+        try:
+            async with sampled_hooks.run_scope():
+                await simulated_run(index)
+        except RuntimeError:
+            pass
+
+    with trace("hook_sampling", disabled=True):
+        await asyncio.gather(*(guarded_run(index) for index in range(1000)))
+
+    stats = sampled_hooks.get_stats()
+    print(f"  Runs counted: {stats['runs']} (p95 latency ~{stats['run_latency']['p95']:.3f}s)")
+    print(f"  Head sampled: {stats['head_sampled']}, kept for being slow: {stats['tail_kept_slow']}, "
+          f"kept for errors: {stats['tail_kept_error']}, dropped: {stats['dropped']}")
+    print(f"  Events seen: {stats['events']}, forwarded to the full hooks: {stats['events_forwarded']}")
+    print(f"  Full-detail activations recorded: "
+          f"{perf_hooks.performance_data['agents'][agent.name]['activations']}")
 
 # ================================
-# 6. Main Demo Function
+# 7. Main Demo Function
 # ================================
 
 async def main():
@@ -620,6 +1156,10 @@ async def main():
     await demo_performance_monitoring()
     await demo_security_audit()
     await demo_combined_hooks()
+    await demo_hook_time_budgets()
+    await demo_concurrent_run_timing()
+    await demo_memory_profiling()
+    await demo_hook_sampling()
 
     print("\n" + "=" * 60)
     print("✅ Run lifecycle hooks demonstration complete!")
@@ -629,6 +1169,10 @@ async def main():
     print("3. Security audit trails ensure compliance and governance")
     print("4. Combined hooks enable comprehensive system observability")
     print("5. Lifecycle events are crucial for production monitoring")
+    print("6. Per-hook time budgets keep one slow hook from stalling the run")
+    print("7. Per-invocation timing keys stay correct across concurrent runs")
+    print("8. tracemalloc deltas attribute memory growth to agents and tools")
+    print("9. Head and tail sampling keep full detail where it matters")
 
 
 if __name__ == "__main__":
@@ -637,7 +1181,7 @@ if __name__ == "__main__":
 
 
 # ================================
-# 7. Production Implementation Notes
+# 8. Production Implementation Notes
 # ================================
 
 """
@@ -19,16 +19,27 @@ Based on: https://openai.github.io/openai-agents-python/ref/lifecycle/
 """
 
 import asyncio
+import bisect
+import itertools
+import math
+import multiprocessing
 import time
-from typing import Any, Dict, List, Optional, Set, Union, Callable
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union, Callable
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 from enum import Enum
 import json
-from collections import defaultdict
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 
 from agents import Agent, Runner, handoff, function_tool
 from agents.lifecycle import RunHooks, AgentHooks
+from agents.tracing import function_span, get_current_span, trace
+
+from binary_codec import BinaryCodec, optional
+from lifecycle_journal import FLAG_CONTINUATION, LifecycleJournal
+from shm_ring import SharedMemoryRing
+from streaming_stats import OnlineTrendEstimator, QuantileSketch
 
 
 # ================================
@@ -83,6 +94,22 @@ class SystemAlert:
     resolved: bool = False
 
 
+@dataclass
+class CorrelatedInterval:
+    """A start event paired with its end event."""
+    kind: str  # "agent", "tool" or "handoff"
+    name: str
+    agent_name: str
+    context_id: str
+    start: datetime
+    end: datetime
+    duration_seconds: float
+    start_event_id: str
+    end_event_id: str
+    call_id: Optional[str] = None
+    end_reason: str = "completed"
+
+
 @dataclass
 class AnalyticsReport:
     """Comprehensive analytics report."""
@@ -100,14 +127,506 @@ class AnalyticsReport:
 # 2. Event Bus and Storage
 # ================================
 
-class LifecycleEventBus:
-    """Centralized event bus for lifecycle events."""
+class _EventIndex:
+    """Sequence numbers and events for one index key, both in publish order."""
+
+    __slots__ = ("seqs", "events")
 
     def __init__(self):
+        self.seqs: List[int] = []
         self.events: List[LifecycleEvent] = []
+
+    def append(self, seq: int, event: LifecycleEvent) -> None:
+        self.seqs.append(seq)
+        self.events.append(event)
+
+    def trim(self, first_live_seq: int) -> None:
+        """Drop entries for evicted sequence numbers."""
+        cut = bisect.bisect_left(self.seqs, first_live_seq)
+        if cut:
+            del self.seqs[:cut]
+            del self.events[:cut]
+
+
+class IndexedEventStore:
+    """Event storage with secondary indexes by type, agent and time.
+
+    Events get an increasing sequence number; each index keeps the sequence
+    numbers and events of its key, so a filtered query bisects one list by time
+    and slices out only the matches. Retention (`max_events`, `max_age`) evicts from the head
+    lazily and compacts the lists once half of them is stale, which keeps
+    eviction amortized O(1).
+
+    Events published out of timestamp order are indexed at the latest
+    timestamp seen so far; `since` filters still compare the real timestamps.
+    """
+
+    def __init__(self, max_events: Optional[int] = None, max_age: Optional[timedelta] = None):
+        self.max_events = max_events
+        self.max_age = max_age
+
+        self._events: List[LifecycleEvent] = []
+        self._time_keys: List[float] = []
+        self._base_seq = 0  # Sequence number of self._events[0]
+        self._head = 0  # Evicted entries still physically at the front
+        self._next_seq = 0
+        self._latest_time = -math.inf
+        self._out_of_order = False
+        self.evicted = 0
+
+        self.by_type: Dict[EventType, _EventIndex] = defaultdict(_EventIndex)
+        self.by_agent: Dict[str, _EventIndex] = defaultdict(_EventIndex)
+        self.by_type_agent: Dict[Tuple[EventType, str],
+                                 _EventIndex] = defaultdict(_EventIndex)
+
+    def __len__(self) -> int:
+        return len(self._events) - self._head
+
+    def __iter__(self) -> Iterator[LifecycleEvent]:
+        return itertools.islice(self._events, self._head, None)
+
+    def _time_key(self, seq: int) -> float:
+        return self._time_keys[seq - self._base_seq]
+
+    def add(self, event: LifecycleEvent) -> None:
+        """Store an event and index it, then apply retention."""
+        seq = self._next_seq
+        self._next_seq += 1
+        timestamp = event.timestamp.timestamp()
+        if timestamp < self._latest_time:
+            self._out_of_order = True
+        else:
+            self._latest_time = timestamp
+
+        self._events.append(event)
+        self._time_keys.append(self._latest_time)
+        self.by_type[event.event_type].append(seq, event)
+        self.by_agent[event.agent_name].append(seq, event)
+        self.by_type_agent[(event.event_type, event.agent_name)].append(
+            seq, event)
+
+        self._enforce_retention()
+
+    def _enforce_retention(self) -> None:
+        """Evict events beyond the size limit or older than max_age."""
+        drop = 0
+        if self.max_events is not None:
+            drop = max(0, len(self) - self.max_events)
+        if self.max_age is not None:
+            cutoff = self._latest_time - self.max_age.total_seconds()
+            expired = bisect.bisect_left(
+                self._time_keys, cutoff, lo=self._head) - self._head
+            drop = max(drop, expired)
+
+        if drop:
+            self._head += drop
+            self.evicted += drop
+            if self._head * 2 > len(self._events):
+                self._compact()
+
+    def _compact(self) -> None:
+        """Physically drop evicted events and their index entries."""
+        del self._events[:self._head]
+        del self._time_keys[:self._head]
+        self._base_seq += self._head
+        self._head = 0
+
+        for index in (self.by_type, self.by_agent, self.by_type_agent):
+            for key in list(index):
+                index[key].trim(self._base_seq)
+                if not index[key].seqs:
+                    del index[key]
+
+    def query(self,
+              event_type: Optional[EventType] = None,
+              agent_name: Optional[str] = None,
+              since: Optional[datetime] = None,
+              limit: Optional[int] = None,
+              until: Optional[datetime] = None) -> List[LifecycleEvent]:
+        """Matching events in publish order, in O(matches + log n).
+
+        `since` is inclusive and `until` exclusive.
+        """
+        first_live_seq = self._base_seq + self._head
+        if event_type and agent_name:
+            index = self.by_type_agent.get((event_type, agent_name))
+        elif event_type:
+            index = self.by_type.get(event_type)
+        elif agent_name:
+            index = self.by_agent.get(agent_name)
+        else:
+            index = None
+
+        if index is not None:
+            seqs, events = index.seqs, index.events
+            start = bisect.bisect_left(seqs, first_live_seq)
+        elif event_type or agent_name:
+            return []
+        else:
+            seqs = range(self._base_seq, self._next_seq)
+            events = self._events
+            start = self._head
+
+        # Skip everything indexed before `since`
+        if since:
+            start = bisect.bisect_left(seqs, since.timestamp(), lo=start,
+                                       key=self._time_key)
+        # Time keys equal real timestamps unless events arrived out of order
+        if not (since or until) or not self._out_of_order:
+            end = len(events)
+            if until:
+                end = bisect.bisect_left(seqs, until.timestamp(), lo=start,
+                                         key=self._time_key)
+            if limit:
+                start = max(start, end - limit)
+            return events[start:end]
+
+        # Walk back from the newest match so `limit` stays exact
+        matches = []
+        for position in range(len(events) - 1, start - 1, -1):
+            event = events[position]
+            if (since and event.timestamp < since) or (until and event.timestamp >= until):
+                continue
+            matches.append(event)
+            if limit and len(matches) == limit:
+                break
+        matches.reverse()
+        return matches
+
+
+class EventRollup:
+    """Event count plus per-metric count, sum and quantile sketch."""
+
+    __slots__ = ("count", "metric_counts", "metric_sums", "metric_sketches")
+
+    def __init__(self):
+        self.count = 0
+        self.metric_counts: Dict[str, int] = {}
+        self.metric_sums: Dict[str, float] = {}
+        self.metric_sketches: Dict[str, QuantileSketch] = {}
+
+    def add(self, event: LifecycleEvent) -> None:
+        self.count += 1
+        for name, value in event.metrics.items():
+            self.metric_counts[name] = self.metric_counts.get(name, 0) + 1
+            self.metric_sums[name] = self.metric_sums.get(name, 0.0) + value
+            sketch = self.metric_sketches.get(name)
+            if sketch is None:
+                sketch = self.metric_sketches[name] = QuantileSketch()
+            sketch.add(value)
+
+    def add_many(self, events: List[LifecycleEvent]) -> None:
+        """Add a batch of events, one sketch update per metric name."""
+        self.count += len(events)
+        values: Dict[str, List[float]] = defaultdict(list)
+        for event in events:
+            for name, value in event.metrics.items():
+                values[name].append(value)
+
+        for name, batch in values.items():
+            self.metric_counts[name] = self.metric_counts.get(name, 0) + len(batch)
+            self.metric_sums[name] = self.metric_sums.get(name, 0.0) + sum(batch)
+            sketch = self.metric_sketches.get(name)
+            if sketch is None:
+                sketch = self.metric_sketches[name] = QuantileSketch()
+            sketch.add_many(batch)
+
+    def merge(self, other: "EventRollup", include_sketches: bool = True) -> None:
+        self.count += other.count
+        for name, count in other.metric_counts.items():
+            self.metric_counts[name] = self.metric_counts.get(name, 0) + count
+            self.metric_sums[name] = self.metric_sums.get(
+                name, 0.0) + other.metric_sums[name]
+            if not include_sketches:
+                continue
+            sketch = self.metric_sketches.get(name)
+            if sketch is None:
+                sketch = self.metric_sketches[name] = QuantileSketch()
+            sketch.merge(other.metric_sketches[name])
+
+    def metric_average(self, name: str) -> float:
+        """Mean over the events that carried the metric."""
+        count = self.metric_counts.get(name, 0)
+        return self.metric_sums[name] / count if count else 0.0
+
+    @classmethod
+    def group(cls, events: Iterable[LifecycleEvent]) -> Dict[Tuple[EventType, str], "EventRollup"]:
+        """Roll raw events up by (event type, agent)."""
+        grouped: Dict[Tuple[EventType, str], EventRollup] = {}
+        for event in events:
+            key = (event.event_type, event.agent_name)
+            rollup = grouped.get(key)
+            if rollup is None:
+                rollup = grouped[key] = cls()
+            rollup.add(event)
+        return grouped
+
+
+class TieredEventRollups:
+    """Per-minute and per-hour rollups by (event type, agent).
+
+    Every event updates both its minute and its hour bucket when published.
+    Minute buckets are kept for `minute_retention` and hour buckets for
+    `hour_retention`, so memory depends on the number of buckets, event types
+    and agents rather than on event volume. A query reads hour buckets for
+    whole hours and minute buckets only for the partial hour at its start.
+    """
+
+    def __init__(self, minute_retention: timedelta = timedelta(hours=24),
+                 hour_retention: timedelta = timedelta(days=30)):
+        self.minute_retention = minute_retention
+        self.hour_retention = hour_retention
+        self.minutes: Dict[int, Dict[Tuple[EventType, str], EventRollup]] = {}
+        self.hours: Dict[int, Dict[Tuple[EventType, str], EventRollup]] = {}
+        self._latest_minute = -1
+        self._oldest_minute = math.inf
+
+    @staticmethod
+    def next_minute(timestamp: datetime) -> datetime:
+        """First minute boundary at or after `timestamp`."""
+        minute = math.ceil(timestamp.timestamp() / 60)
+        return datetime.fromtimestamp(minute * 60)
+
+    def _first_kept_minute(self) -> int:
+        return self._latest_minute + 1 - int(self.minute_retention.total_seconds() // 60)
+
+    def add(self, event: LifecycleEvent) -> None:
+        minute = int(event.timestamp.timestamp() // 60)
+        self._bucket(self.hours, minute // 60, event).add(event)
+        if minute < self._first_kept_minute():
+            return  # Late event; its minute has already been dropped
+
+        self._bucket(self.minutes, minute, event).add(event)
+        self._oldest_minute = min(self._oldest_minute, minute)
+        if minute > self._latest_minute:
+            self._latest_minute = minute
+            self._expire()
+
+    def add_many(self, events: Iterable[LifecycleEvent]) -> None:
+        """Add a batch, grouped by minute, type and agent so each bucket is updated once."""
+        groups: Dict[Tuple[int, EventType, str], List[LifecycleEvent]] = defaultdict(list)
+        for event in events:
+            minute = int(event.timestamp.timestamp() // 60)
+            groups[(minute, event.event_type, event.agent_name)].append(event)
+
+        for (minute, _, _), group in groups.items():
+            self._bucket(self.hours, minute // 60, group[0]).add_many(group)
+            if minute < self._first_kept_minute():
+                continue  # Late events; their minute has already been dropped
+
+            self._bucket(self.minutes, minute, group[0]).add_many(group)
+            self._oldest_minute = min(self._oldest_minute, minute)
+            if minute > self._latest_minute:
+                self._latest_minute = minute
+                self._expire()
+
+    @staticmethod
+    def _bucket(tier: Dict[int, Dict[Tuple[EventType, str], EventRollup]], bucket: int,
+                event: LifecycleEvent) -> EventRollup:
+        cells = tier.get(bucket)
+        if cells is None:
+            cells = tier[bucket] = {}
+        key = (event.event_type, event.agent_name)
+        rollup = cells.get(key)
+        if rollup is None:
+            rollup = cells[key] = EventRollup()
+        return rollup
+
+    def _expire(self) -> None:
+        """Drop minute and hour buckets past their retention."""
+        first_kept = self._first_kept_minute()
+        if self._oldest_minute >= first_kept:
+            return
+
+        for minute in [m for m in self.minutes if m < first_kept]:
+            del self.minutes[minute]
+        self._oldest_minute = min(self.minutes, default=math.inf)
+
+        first_hour = (self._latest_minute // 60 -
+                      int(self.hour_retention.total_seconds() // 3600))
+        for hour in [h for h in self.hours if h < first_hour]:
+            del self.hours[hour]
+
+    def query(self, since: datetime,
+              event_type: Optional[EventType] = None,
+              agent_name: Optional[str] = None,
+              include_sketches: bool = False) -> Dict[Tuple[EventType, str], EventRollup]:
+        """Merge the buckets covering [since, now].
+
+        Exact from the minute containing `since` onwards while that minute is
+        retained; otherwise the whole hour containing `since` is counted.
+        Sketches are only merged when `include_sketches` is set.
+        """
+        since_ts = since.timestamp()
+        first_minute = int(since_ts // 60)
+        first_full_hour = math.ceil(since_ts / 3600)
+        cells_to_merge = []
+
+        if first_minute >= self._first_kept_minute():
+            cells_to_merge.extend(self.minutes.get(minute, {})
+                                  for minute in range(first_minute, first_full_hour * 60))
+        else:
+            first_full_hour = int(since_ts // 3600)
+        cells_to_merge.extend(cells for hour, cells in self.hours.items()
+                              if hour >= first_full_hour)
+
+        summary: Dict[Tuple[EventType, str], EventRollup] = {}
+        for cells in cells_to_merge:
+            for key, rollup in cells.items():
+                if (event_type and key[0] != event_type) or (agent_name and key[1] != agent_name):
+                    continue
+                target = summary.get(key)
+                if target is None:
+                    target = summary[key] = EventRollup()
+                target.merge(rollup, include_sketches)
+        return summary
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "minute_buckets": len(self.minutes),
+            "hour_buckets": len(self.hours),
+            "cells": sum(len(cells) for tier in (self.minutes, self.hours)
+                         for cells in tier.values())
+        }
+
+
+class SubscriberOverflow(str, Enum):
+    """What an async-mode subscriber does when its queue is full."""
+    DROP_NEWEST = "drop_newest"
+    DROP_OLDEST = "drop_oldest"
+    BLOCK = "block"  # Never drop; overflow waits in the subscriber's own backlog
+
+
+class EventSubscription:
+    """One async-mode subscriber with its own bounded queue, worker and stats.
+
+    `offer` never waits, so one subscriber can never stall fan-out to the
+    others. A BLOCK subscriber whose queue is full parks events in its own
+    unbounded backlog, which its worker moves into the queue as it catches
+    up; only that subscriber's memory grows.
+
+    Latency is measured from publish to the end of the callback, so it
+    includes time spent queued behind earlier events.
+    """
+
+    def __init__(self, event_type: Union[EventType, str], callback: Callable[[LifecycleEvent], Any],
+                 max_queue_size: int = 1000,
+                 overflow: SubscriberOverflow = SubscriberOverflow.DROP_NEWEST):
+        self.event_type = event_type
+        self.callback = callback
+        self.name = getattr(callback, "__name__", repr(callback))
+        self.is_async = asyncio.iscoroutinefunction(callback)
+        self.overflow = overflow
+        self.max_queue_size = max_queue_size
+        self._queue: Optional[asyncio.Queue] = None
+        self.backlog: Deque[Tuple[LifecycleEvent, float]] = deque()
+        self.worker: Optional[asyncio.Task] = None
+        self.latency = QuantileSketch()
+        self.stats = {"delivered": 0, "dropped": 0, "errors": 0}
+
+    @property
+    def queue(self) -> asyncio.Queue:
+        """Created on first use, once the bus is dispatching."""
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        return self._queue
+
+    def offer(self, item: Tuple[LifecycleEvent, float]) -> None:
+        """Queue an (event, published_at) pair according to the overflow policy."""
+        if self.overflow == SubscriberOverflow.BLOCK:
+            if self.backlog or self.queue.full():
+                self.backlog.append(item)  # Behind earlier overflow, to keep order
+            else:
+                self.queue.put_nowait(item)
+            return
+
+        try:
+            self.queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self.stats["dropped"] += 1
+            if self.overflow == SubscriberOverflow.DROP_OLDEST:
+                self.queue.get_nowait()
+                self.queue.task_done()
+                self.queue.put_nowait(item)
+
+    def refill(self) -> None:
+        """Move backlogged events into the queue as space frees up."""
+        while self.backlog and not self.queue.full():
+            self.queue.put_nowait(self.backlog.popleft())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Delivery counters, queue depth and latency quantiles in milliseconds."""
+        latency = self.latency.quantiles((0.5, 0.99))
+        return {
+            "subscriber": self.name,
+            "event_type": getattr(self.event_type, "value", self.event_type),
+            "queue_depth": self.queue.qsize(),
+            "backlog": len(self.backlog),
+            **self.stats,
+            "latency_ms": {key: value * 1000 if value is not None else None
+                           for key, value in latency.items()},
+            "max_latency_ms": self.latency.maximum * 1000 if self.latency.count else None
+        }
+
+
+class LifecycleEventBus:
+    """Centralized event bus for lifecycle events.
+
+    By default subscribers are called inline from publish_event. With
+    `async_mode=True`, publish_event only stores the event and puts it on a
+    bounded queue, created when the first event is queued. A single dispatcher
+    task fans events out to per-subscriber queues in publish order, without
+    ever waiting on a subscriber, and each subscriber is served by its own
+    task, with sync callbacks run on a thread pool. A slow or failing
+    subscriber then only delays or loses its own events, never the agent run
+    or the other subscribers.
+
+    Raw events are kept within `max_events` / `max_age`; every event also
+    updates per-minute and per-hour rollups, which `summarize` reads for
+    reports over longer periods.
+    """
+
+    def __init__(self, journal: Optional[LifecycleJournal] = None,
+                 max_events: Optional[int] = 100_000,
+                 max_age: Optional[timedelta] = None,
+                 async_mode: bool = False,
+                 max_queue_size: int = 10_000,
+                 thread_workers: int = 4,
+                 subscriber_queue_size: int = 1000,
+                 subscriber_overflow: SubscriberOverflow = SubscriberOverflow.DROP_NEWEST,
+                 enable_rollups: bool = True):
+        self.store = IndexedEventStore(max_events=max_events, max_age=max_age)
+        # Raw events expire by max_events/max_age; rollups keep the long history
+        self.rollups = TieredEventRollups() if enable_rollups else None
         self.subscribers: Dict[Union[EventType, str], List[Callable[[
             LifecycleEvent], None]]] = defaultdict(list)
         self.event_counter = 0
+        self.journal = journal
+
+        # Async mode
+        self.async_mode = async_mode
+        self.max_queue_size = max_queue_size
+        self._queue: Optional[asyncio.Queue] = None
+        self.thread_workers = thread_workers
+        self.subscriber_queue_size = subscriber_queue_size
+        self.subscriber_overflow = subscriber_overflow
+        self.subscriptions: Dict[Union[EventType, str],
+                                 List[EventSubscription]] = defaultdict(list)
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.dispatch_stats = {"queued": 0, "dropped": 0}
+
+    @property
+    def queue(self) -> asyncio.Queue:
+        """Async-mode event queue, created when the first event is queued."""
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        return self._queue
+
+    def _store(self, event: LifecycleEvent) -> None:
+        self.store.add(event)
+        if self.rollups is not None:
+            self.rollups.add(event)
 
     def generate_event_id(self) -> str:
         """Generate unique event ID."""
@@ -116,7 +635,35 @@ class LifecycleEventBus:
 
     def publish_event(self, event: LifecycleEvent) -> None:
         """Publish event to all subscribers."""
-        self.events.append(event)
+        self._store(event)
+        if self.journal is not None:
+            self._journal_event(event)
+        self._notify(event)
+
+    def publish_events(self, events: List[LifecycleEvent]) -> None:
+        """Publish a batch of events in order, updating the rollups once per batch."""
+        for event in events:
+            self.store.add(event)
+        if self.rollups is not None:
+            self.rollups.add_many(events)
+
+        for event in events:
+            if self.journal is not None:
+                self._journal_event(event)
+            self._notify(event)
+
+    def _notify(self, event: LifecycleEvent) -> None:
+        """Hand a stored event to subscribers, inline or through the queue."""
+        if self.async_mode:
+            # Never block the publisher; a full queue drops the event
+            try:
+                self.queue.put_nowait((event, time.perf_counter()))
+            except asyncio.QueueFull:
+                self.dispatch_stats["dropped"] += 1
+                return
+            self.dispatch_stats["queued"] += 1
+            self._ensure_dispatcher()
+            return
 
         # Notify subscribers
         for callback in self.subscribers[event.event_type]:
@@ -132,38 +679,575 @@ class LifecycleEventBus:
             except Exception as e:
                 print(f"Error in wildcard callback: {e}")
 
-    def subscribe(self, event_type: Union[EventType, str], callback: Callable[[LifecycleEvent], None]) -> None:
-        """Subscribe to events."""
-        self.subscribers[event_type].append(callback)
+    def _journal_event(self, event: LifecycleEvent) -> None:
+        """Write one record per event metric; later records are continuations."""
+        timestamp_ns = int(event.timestamp.timestamp() * 1e9)
+        metrics = list(event.metrics.items()) or [(None, 0.0)]
+
+        for index, (name, value) in enumerate(metrics):
+            self.journal.append(
+                event.event_type.value, float(value), timestamp_ns,
+                agent=event.agent_name, scope=event.context_id, name=name,
+                flags=FLAG_CONTINUATION if index else 0)
+
+    def restore_from_journal(self, directory: str) -> int:
+        """Rebuild the event history from a journal written by publish_event.
+
+        The journal keeps the event type, agent, context, timestamp and numeric
+        metrics; free-form data and tags are not persisted. Subscribers are not
+        notified for replayed events. Returns the number of events restored.
+        """
+        event_types = {event_type.value: event_type for event_type in EventType}
+        restored = 0
+        event: Optional[LifecycleEvent] = None
+
+        for record in LifecycleJournal.replay(directory):
+            if record.flags & FLAG_CONTINUATION:
+                if event is not None and record.name is not None:
+                    event.metrics[record.name] = record.value
+                continue
+
+            event_type = event_types.get(record.kind)
+            if event_type is None:
+                event = None
+                continue
+
+            event = LifecycleEvent(
+                event_id=self.generate_event_id(),
+                event_type=event_type,
+                timestamp=datetime.fromtimestamp(record.timestamp_ns / 1e9),
+                agent_name=record.agent or "",
+                context_id=record.scope or "",
+                tags={"replayed"}
+            )
+            if record.name is not None:
+                event.metrics[record.name] = record.value
+            self._store(event)
+            restored += 1
+
+        return restored
+
+    async def publish(self, event: LifecycleEvent) -> None:
+        """Async-mode publish that waits for queue space instead of dropping."""
+        if not self.async_mode:
+            self.publish_event(event)
+            return
+
+        self._store(event)
+        if self.journal is not None:
+            self._journal_event(event)
+        await self.queue.put((event, time.perf_counter()))
+        self.dispatch_stats["queued"] += 1
+        self._ensure_dispatcher()
+
+    def _ensure_dispatcher(self) -> None:
+        """Start the dispatcher for queued events, if an event loop is running.
+
+        There is only ever one, so every subscriber sees events in publish order.
+        """
+        if self._dispatcher is not None and not self._dispatcher.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # Events wait in the queue until drain() runs in a loop
+        if not self.queue.empty():
+            self._dispatcher = loop.create_task(self._dispatch())
+
+    async def _dispatch(self) -> None:
+        """Fan queued events out to subscriber queues; exit once idle."""
+        while not self.queue.empty():
+            event, published_at = self.queue.get_nowait()
+            try:
+                for key in (event.event_type, "*"):
+                    for subscription in self.subscriptions.get(key, []):
+                        subscription.offer((event, published_at))
+                        self._ensure_subscriber_worker(subscription)
+            finally:
+                self.queue.task_done()
+            # Let subscriber workers run between events
+            await asyncio.sleep(0)
+
+    def _ensure_subscriber_worker(self, subscription: EventSubscription) -> None:
+        if not subscription.queue.empty() and (subscription.worker is None or subscription.worker.done()):
+            subscription.worker = asyncio.get_running_loop().create_task(
+                self._serve_subscriber(subscription))
+
+    async def _serve_subscriber(self, subscription: EventSubscription) -> None:
+        """Deliver one subscriber's events in order; exit once idle."""
+        loop = asyncio.get_running_loop()
+        while not subscription.queue.empty():
+            event, published_at = subscription.queue.get_nowait()
+            # Refill before task_done, so join() cannot finish with a backlog left
+            subscription.refill()
+            try:
+                if subscription.is_async:
+                    await subscription.callback(event)
+                else:
+                    if self._executor is None:
+                        self._executor = ThreadPoolExecutor(
+                            max_workers=self.thread_workers, thread_name_prefix="event-subscriber")
+                    await loop.run_in_executor(self._executor, subscription.callback, event)
+                subscription.stats["delivered"] += 1
+            except Exception as e:
+                subscription.stats["errors"] += 1
+                print(f"Error in event callback {subscription.name}: {e}")
+            finally:
+                subscription.latency.add(time.perf_counter() - published_at)
+                subscription.queue.task_done()
+
+    async def drain(self) -> None:
+        """Wait until every queued event has reached every subscriber."""
+        if self._queue is None:
+            return  # Sync mode, or nothing was ever queued
+        self._ensure_dispatcher()
+        await self.queue.join()
+        for subscriptions in self.subscriptions.values():
+            for subscription in subscriptions:
+                self._ensure_subscriber_worker(subscription)
+                await subscription.queue.join()
+
+    async def close(self) -> None:
+        """Drain pending events and release the subscriber thread pool."""
+        await self.drain()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def get_dispatch_stats(self) -> Dict[str, Any]:
+        """Queue depth, drop counters and per-subscriber delivery latency."""
+        return {
+            "async_mode": self.async_mode,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "queue_capacity": self.max_queue_size,
+            **self.dispatch_stats,
+            "dispatcher_running": self._dispatcher is not None and not self._dispatcher.done(),
+            "subscribers": [subscription.get_stats()
+                            for subscriptions in self.subscriptions.values()
+                            for subscription in subscriptions]
+        }
+
+    def subscribe(self, event_type: Union[EventType, str], callback: Callable[[LifecycleEvent], Any],
+                  max_queue_size: Optional[int] = None,
+                  overflow: Optional[SubscriberOverflow] = None) -> None:
+        """Subscribe to events.
+
+        In async mode the callback may be a coroutine function, and
+        `max_queue_size` / `overflow` override the bus defaults for it.
+        """
+        if not self.async_mode:
+            self.subscribers[event_type].append(callback)
+            return
+
+        self.subscriptions[event_type].append(EventSubscription(
+            event_type, callback,
+            max_queue_size=max_queue_size or self.subscriber_queue_size,
+            overflow=overflow or self.subscriber_overflow))
 
     def get_events(self,
                    event_type: Optional[EventType] = None,
                    agent_name: Optional[str] = None,
                    since: Optional[datetime] = None,
-                   limit: Optional[int] = None) -> List[LifecycleEvent]:
-        """Query events with filters."""
-        filtered_events = self.events
+                   limit: Optional[int] = None,
+                   until: Optional[datetime] = None) -> List[LifecycleEvent]:
+        """Query events with filters, served from the store's indexes."""
+        return self.store.query(event_type, agent_name, since, limit, until)
+
+    def summarize(self, since: datetime,
+                  event_type: Optional[EventType] = None,
+                  agent_name: Optional[str] = None,
+                  include_sketches: bool = False) -> Dict[Tuple[EventType, str], "EventRollup"]:
+        """Aggregates of the events since `since`, keyed by (event type, agent).
+
+        Whole minutes and hours are read from the rollup tiers, so the cost
+        depends on the time range rather than on the raw event volume. The
+        partial minute at the start comes from raw events while they are still
+        retained; after that the whole bucket containing `since` is counted.
+        Metric sketches are merged only when `include_sketches` is set.
+        """
+        if self.rollups is None:
+            return EventRollup.group(self.get_events(event_type, agent_name, since))
+
+        oldest = next(iter(self.store), None)
+        if self.store.evicted and (oldest is None or oldest.timestamp > since):
+            return self.rollups.query(since, event_type, agent_name, include_sketches)
+
+        boundary = self.rollups.next_minute(since)
+        summary = EventRollup.group(self.get_events(
+            event_type, agent_name, since=since, until=boundary))
+        for key, rollup in self.rollups.query(boundary, event_type, agent_name,
+                                              include_sketches).items():
+            summary.setdefault(key, EventRollup()).merge(rollup, include_sketches)
+        return summary
+
+    @property
+    def events(self) -> List[LifecycleEvent]:
+        """All retained events in publish order."""
+        return list(self.store)
 
-        if event_type:
-            filtered_events = [
-                e for e in filtered_events if e.event_type == event_type]
 
-        if agent_name:
-            filtered_events = [
-                e for e in filtered_events if e.agent_name == agent_name]
+# ================================
+# 3. Cross-Process Event Transport
+# ================================
 
-        if since:
-            filtered_events = [
-                e for e in filtered_events if e.timestamp >= since]
+# Binary schemas for events and alerts shipped between processes
+EVENT_CODEC = BinaryCodec()
+EVENT_CODEC.register(LifecycleEvent, [
+    ("event_id", "str"),
+    ("event_type", EventType),
+    ("timestamp", "datetime"),
+    ("agent_name", "symbol"),
+    ("context_id", "symbol"),
+    ("session_id", optional("symbol")),
+    ("data", "any_map"),
+    ("metrics", "float_map"),
+    ("tags", "symbol_set"),
+])
+EVENT_CODEC.register(SystemAlert, [
+    ("alert_id", "str"),
+    ("level", AlertLevel),
+    ("title", "symbol"),
+    ("description", "str"),
+    ("timestamp", "datetime"),
+    ("agent_name", optional("symbol")),
+    ("event_ids", "symbol_list"),
+    ("context", "any_map"),
+    ("resolved", "bool"),
+])
+
+
+def encode_event(event: LifecycleEvent) -> bytes:
+    """Serialize an event as one self-contained binary frame."""
+    return EVENT_CODEC.encode(event)
+
+
+def decode_event(payload: bytes) -> LifecycleEvent:
+    """Rebuild an event written by encode_event."""
+    return EVENT_CODEC.decode(payload)
+
+
+class SharedMemoryEventPublisher:
+    """Forwards a worker's lifecycle events into its shared-memory ring.
+
+    Instances are callables, so a publisher is attached to a worker's bus as a
+    wildcard subscriber. By default it never waits: when the aggregator falls
+    behind and the ring is full, the event is dropped and counted. With
+    `block=True` it waits for ring space instead, for workers that must not
+    lose events.
+    """
+
+    def __init__(self, ring: SharedMemoryRing,
+                 encode: Callable[[LifecycleEvent], bytes] = encode_event,
+                 block: bool = False, retry_interval: float = 0.0005):
+        self.ring = ring
+        self.encode = encode
+        self.block = block
+        self.retry_interval = retry_interval
+        self.stats = {"published": 0, "dropped": 0, "bytes": 0}
+
+    def attach(self, event_bus: LifecycleEventBus) -> None:
+        """Forward every event published on `event_bus`."""
+        event_bus.subscribe("*", self)
+
+    def __call__(self, event: LifecycleEvent) -> None:
+        self.publish(event)
+
+    def publish(self, event: LifecycleEvent) -> bool:
+        """Write one event to the ring; returns False if it was dropped."""
+        payload = self.encode(event)
+        while not self.ring.try_write(payload):
+            if not self.block:
+                self.stats["dropped"] += 1
+                return False
+            time.sleep(self.retry_interval)
+
+        self.stats["published"] += 1
+        self.stats["bytes"] += len(payload)
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "ring_full": self.ring.full_events}
+
+
+class SharedMemoryEventAggregator:
+    """Drains the rings of every worker into one local LifecycleEventBus.
+
+    Each worker owns exactly one ring, so every ring has a single producer and
+    a single consumer and no locks are needed on either side. Events are
+    republished in per-worker order; events from different workers interleave
+    in the order the rings are polled. Every `read_batch` is decoded and then
+    published to the bus as one batch.
+    """
+
+    def __init__(self, rings: List[SharedMemoryRing], event_bus: LifecycleEventBus,
+                 decode: Callable[[bytes], LifecycleEvent] = decode_event,
+                 batch_size: int = 1024):
+        self.rings = rings
+        self.event_bus = event_bus
+        self.decode = decode
+        self.batch_size = batch_size
+        self.received: Dict[str, int] = defaultdict(int)
+        self.decode_errors = 0
 
-        if limit:
-            filtered_events = filtered_events[-limit:]
+    def _decode_batch(self, ring: SharedMemoryRing, payloads: List[bytes]) -> List[LifecycleEvent]:
+        decode = self.decode
+        try:
+            return [decode(payload) for payload in payloads]
+        except Exception:
+            pass  # Fall back to one frame at a time to skip only the bad ones
+
+        events = []
+        for payload in payloads:
+            try:
+                events.append(decode(payload))
+            except Exception as e:
+                self.decode_errors += 1
+                print(f"Error decoding event from {ring.name}: {e}")
+        return events
+
+    def poll(self) -> int:
+        """Republish whatever is waiting in the rings; returns the event count."""
+        received = 0
+        for ring in self.rings:
+            payloads = ring.read_batch(self.batch_size)
+            if not payloads:
+                continue
+            events = self._decode_batch(ring, payloads)
+            self.event_bus.publish_events(events)
+            self.received[ring.name] += len(events)
+            received += len(events)
+        return received
+
+    async def run(self, stop: asyncio.Event, poll_interval: float = 0.005) -> None:
+        """Poll until `stop` is set, then drain what is left.
+
+        While events keep arriving the loop only yields between polls; once
+        the rings are empty it backs off, doubling its sleep up to
+        `poll_interval`.
+        """
+        idle_sleep = 0.0
+        while not stop.is_set():
+            if self.poll():
+                idle_sleep = 0.0
+            else:
+                idle_sleep = min(poll_interval, max(idle_sleep * 2, poll_interval / 64))
+            await asyncio.sleep(idle_sleep)
+        while self.poll():
+            pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "received": sum(self.received.values()),
+            "per_ring": dict(self.received),
+            "decode_errors": self.decode_errors,
+            "pending_bytes": sum(ring.pending_bytes() for ring in self.rings)
+        }
 
-        return filtered_events
+
+def run_ring_worker(ring_name: str, worker_name: str, events: int) -> None:
+    """Worker-process entry point: a local bus whose events go to the ring."""
+    ring = SharedMemoryRing.attach(ring_name)
+    try:
+        event_bus = LifecycleEventBus(max_events=1000)
+        SharedMemoryEventPublisher(ring, block=True).attach(event_bus)
+
+        for sequence in range(events):
+            event_bus.publish_event(LifecycleEvent(
+                event_id=event_bus.generate_event_id(),
+                event_type=EventType.TOOL_END if sequence % 3 else EventType.AGENT_END,
+                timestamp=datetime.now(),
+                agent_name=worker_name,
+                context_id=f"{worker_name}_ctx_{sequence // 10}",
+                data={"tool_name": "search", "worker": worker_name},
+                metrics={"sequence": float(sequence), "duration": 0.05 + sequence % 7 / 100}
+            ))
+    finally:
+        ring.close()
 
 
 # ================================
-# 3. Comprehensive RunHooks
+# 4. Streaming Event Correlation
+# ================================
+
+def current_call_id() -> Optional[str]:
+    """Identify the tool call whose hook is running.
+
+    The SDK runs each tool call inside its own tracing span, and hooks inherit
+    that span through the task context, so on_tool_start and on_tool_end of
+    one call see the same span even when the same tool runs in parallel.
+    """
+    span = get_current_span()
+    if span is None:
+        return None
+    # No-op spans (tracing disabled) share one id, but each call has its own object
+    return span.span_id if span.span_id != "no-op" else f"span_{id(span)}"
+
+
+class EventCorrelator:
+    """Pairs start and end events into intervals as they are published.
+
+    Open work is keyed by context and agent, plus tool name and call id for
+    tools; tool events without a call id pair first-in, first-out. A handoff
+    closes the source agent's span (the SDK only calls on_agent_end for the
+    final agent) and opens a handoff interval that ends when the target agent
+    starts. Only in-flight starts are held: entries older than `stale_after`
+    are expired, and beyond `max_in_flight` new starts are refused.
+    """
+
+    def __init__(self, stale_after: timedelta = timedelta(minutes=10),
+                 max_in_flight: int = 10_000, max_recent: int = 1000,
+                 required_tags: Optional[Set[str]] = None,
+                 expire_every: int = 1000):
+        self.stale_after = stale_after
+        self.max_in_flight = max_in_flight
+        self.required_tags = required_tags
+        self.expire_every = expire_every
+
+        self.open: Dict[Tuple, Deque[LifecycleEvent]] = {}
+        self.in_flight = 0
+        self.recent: Deque[CorrelatedInterval] = deque(maxlen=max_recent)
+        self.durations: Dict[Tuple[str, str], QuantileSketch] = {}
+        self.listeners: List[Callable[[CorrelatedInterval], None]] = []
+        self.stats = {"intervals": 0, "unmatched_ends": 0,
+                      "expired": 0, "refused": 0}
+        self._observed = 0
+
+    def add_listener(self, callback: Callable[[CorrelatedInterval], None]) -> None:
+        """Call `callback` with every completed interval."""
+        self.listeners.append(callback)
+
+    def observe(self, event: LifecycleEvent) -> List[CorrelatedInterval]:
+        """Feed one event; returns the intervals it completed."""
+        if self.required_tags and not self.required_tags & event.tags:
+            return []
+
+        completed: List[CorrelatedInterval] = []
+        context_id = event.context_id
+
+        if event.event_type == EventType.AGENT_START:
+            self._close(("handoff", context_id, event.agent_name),
+                        event, completed, required=False)
+            self._open(("agent", context_id, event.agent_name), event)
+        elif event.event_type == EventType.AGENT_END:
+            self._close(("agent", context_id, event.agent_name),
+                        event, completed)
+        elif event.event_type == EventType.TOOL_START:
+            self._open(self._tool_key(event), event)
+        elif event.event_type == EventType.TOOL_END:
+            self._close(self._tool_key(event), event, completed)
+        elif event.event_type == EventType.HANDOFF:
+            from_agent = event.data.get("from_agent")
+            to_agent = event.data.get("to_agent")
+            if from_agent:
+                self._close(("agent", context_id, from_agent), event, completed,
+                            end_reason="handoff", required=False)
+            if to_agent:
+                self._open(("handoff", context_id, to_agent), event)
+
+        self._observed += 1
+        if self._observed % self.expire_every == 0:
+            self.expire(event.timestamp)
+        return completed
+
+    @staticmethod
+    def _tool_key(event: LifecycleEvent) -> Tuple:
+        return ("tool", event.context_id, event.agent_name,
+                event.data.get("tool_name"), event.data.get("call_id"))
+
+    def _open(self, key: Tuple, event: LifecycleEvent) -> None:
+        if self.in_flight >= self.max_in_flight:
+            self.expire(event.timestamp)
+            if self.in_flight >= self.max_in_flight:
+                self.stats["refused"] += 1
+                return
+        self.open.setdefault(key, deque()).append(event)
+        self.in_flight += 1
+
+    def _close(self, key: Tuple, end_event: LifecycleEvent,
+               completed: List[CorrelatedInterval], end_reason: str = "completed",
+               required: bool = True) -> None:
+        starts = self.open.get(key)
+        if not starts:
+            if required:
+                self.stats["unmatched_ends"] += 1
+            return
+
+        start_event = starts.popleft()
+        if not starts:
+            del self.open[key]
+        self.in_flight -= 1
+
+        kind = key[0]
+        if kind == "tool":
+            name = key[3] or "unknown"
+        elif kind == "handoff":
+            name = f"{start_event.data.get('from_agent')}→{key[2]}"
+        else:
+            name = key[2]
+
+        interval = CorrelatedInterval(
+            kind=kind,
+            name=name,
+            agent_name=key[2],
+            context_id=key[1],
+            start=start_event.timestamp,
+            end=end_event.timestamp,
+            duration_seconds=(end_event.timestamp -
+                              start_event.timestamp).total_seconds(),
+            start_event_id=start_event.event_id,
+            end_event_id=end_event.event_id,
+            call_id=key[4] if kind == "tool" else None,
+            end_reason=end_reason
+        )
+        self._record(interval)
+        completed.append(interval)
+
+    def _record(self, interval: CorrelatedInterval) -> None:
+        self.stats["intervals"] += 1
+        self.recent.append(interval)
+        sketch = self.durations.get((interval.kind, interval.name))
+        if sketch is None:
+            sketch = self.durations[(interval.kind, interval.name)] = QuantileSketch()
+        sketch.add(max(interval.duration_seconds, 0.0))
+
+        for callback in self.listeners:
+            try:
+                callback(interval)
+            except Exception as e:
+                print(f"Error in interval listener: {e}")
+
+    def expire(self, now: Optional[datetime] = None) -> int:
+        """Drop starts that have been open longer than `stale_after`."""
+        cutoff = (now or datetime.now()) - self.stale_after
+        expired = 0
+        for key in list(self.open):
+            starts = self.open[key]
+            while starts and starts[0].timestamp < cutoff:
+                starts.popleft()
+                expired += 1
+            if not starts:
+                del self.open[key]
+
+        self.in_flight -= expired
+        self.stats["expired"] += expired
+        return expired
+
+    def get_summary(self) -> Dict[str, Any]:
+        """Duration statistics per (kind, name) plus in-flight counters."""
+        summary: Dict[str, Any] = {"in_flight": self.in_flight, **self.stats}
+        for (kind, name), sketch in self.durations.items():
+            summary.setdefault(kind, {})[name] = {
+                "count": sketch.count,
+                "avg_seconds": sketch.average,
+                "p50_seconds": sketch.quantile(0.5),
+                "p95_seconds": sketch.quantile(0.95),
+                "max_seconds": sketch.maximum
+            }
+        return summary
+
+
+# ================================
+# 5. Comprehensive RunHooks
 # ================================
 
 class ComprehensiveRunHooks(RunHooks):
@@ -185,6 +1269,12 @@ class ComprehensiveRunHooks(RunHooks):
             "handoff_count": 0,
             "error_count": 0
         }
+        self.correlator = EventCorrelator()
+
+    def _publish(self, event: LifecycleEvent) -> None:
+        """Publish to the bus and pair starts with ends as events arrive."""
+        self.event_bus.publish_event(event)
+        self.correlator.observe(event)
 
     async def on_agent_start(self, context: Any, agent: Agent) -> None:
         """Track agent start with comprehensive monitoring."""
@@ -203,7 +1293,7 @@ class ComprehensiveRunHooks(RunHooks):
             tags={"session", "agent_lifecycle"}
         )
 
-        self.event_bus.publish_event(event)
+        self._publish(event)
         self.session_metrics["total_agents"].add(agent.name)
 
         print(
@@ -231,7 +1321,7 @@ class ComprehensiveRunHooks(RunHooks):
             tags={"session", "agent_lifecycle", "completion"}
         )
 
-        self.event_bus.publish_event(event)
+        self._publish(event)
 
         # Check for quality alerts
         if output_analysis.get("quality_score", 0) < 50:
@@ -269,7 +1359,7 @@ class ComprehensiveRunHooks(RunHooks):
             tags={"session", "handoff", "agent_transition"}
         )
 
-        self.event_bus.publish_event(event)
+        self._publish(event)
 
         # Check for excessive handoffs
         if self.session_metrics["handoff_count"] > self.performance_thresholds["max_handoffs"]:
@@ -294,13 +1384,14 @@ class ComprehensiveRunHooks(RunHooks):
             session_id=self.session_id,
             data={
                 "tool_name": tool.name,
+                "call_id": current_call_id(),
                 "tool_description": getattr(tool, 'description', 'No description'),
                 "agent_context": f"Agent {agent.name} using {tool.name}"
             },
             tags={"session", "tool_usage", "security"}
         )
 
-        self.event_bus.publish_event(event)
+        self._publish(event)
         self.session_metrics["total_tools"].add(tool.name)
 
         # Security monitoring for sensitive tools
@@ -329,6 +1420,7 @@ class ComprehensiveRunHooks(RunHooks):
             session_id=self.session_id,
             data={
                 "tool_name": tool.name,
+                "call_id": current_call_id(),
                 "result_preview": result[:100] + "..." if len(result) > 100 else result,
                 "result_analysis": result_analysis
             },
@@ -339,7 +1431,7 @@ class ComprehensiveRunHooks(RunHooks):
             tags={"session", "tool_completion"}
         )
 
-        self.event_bus.publish_event(event)
+        self._publish(event)
 
         print(f"✅ [GLOBAL] Tool {tool.name} completed by {agent.name}")
 
@@ -409,24 +1501,27 @@ class ComprehensiveRunHooks(RunHooks):
         session_duration = (
             current_time - self.session_metrics["start_time"]).total_seconds()
 
-        # Get session events
-        session_events = self.event_bus.get_events(
+        # Session aggregates come from the bus rollups, not from raw events
+        session_summary = self.event_bus.summarize(
             since=self.session_metrics["start_time"])  # type: ignore
 
         # Event summary
         event_summary: Dict[str, int] = {}
-        for event in session_events:
-            event_summary[event.event_type.value] = event_summary.get(
-                event.event_type.value, 0) + 1
+        agent_totals: Dict[str, EventRollup] = defaultdict(EventRollup)
+        for (event_type, agent_name), rollup in session_summary.items():
+            event_summary[event_type.value] = event_summary.get(
+                event_type.value, 0) + rollup.count
+            # summarize() leaves the sketches out, so merge without them too
+            agent_totals[agent_name].merge(rollup, include_sketches=False)
+        total_events = sum(event_summary.values())
 
         # Agent performance summary
         agent_performance = {}
         for agent_name in self.session_metrics["total_agents"]:
-            agent_events = [
-                e for e in session_events if e.agent_name == agent_name]
+            totals = agent_totals.get(agent_name, EventRollup())
             agent_performance[agent_name] = {
-                "total_events": len(agent_events),
-                "avg_quality_score": sum(e.metrics.get("quality_score", 0) for e in agent_events) / len(agent_events) if agent_events else 0
+                "total_events": totals.count,
+                "avg_quality_score": totals.metric_sums.get("quality_score", 0) / totals.count if totals.count else 0
             }
 
         # System health
@@ -436,8 +1531,10 @@ class ComprehensiveRunHooks(RunHooks):
             "total_tools_used": len(self.session_metrics["total_tools"]),
             "handoff_count": self.session_metrics["handoff_count"],
             "alert_count": len(self.alerts),
-            "events_per_minute": (len(session_events) / session_duration * 60) if session_duration > 0 else 0
+            "events_per_minute": (total_events / session_duration * 60) if session_duration > 0 else 0,
+            "in_flight_spans": self.correlator.in_flight
         }
+        span_summary = self.correlator.get_summary()
 
         # Generate insights
         insights = []
@@ -450,6 +1547,10 @@ class ComprehensiveRunHooks(RunHooks):
         if len(self.session_metrics["total_tools"]) > 10:
             insights.append(
                 f"Extensive tool usage ({len(self.session_metrics['total_tools'])} tools) - consider workflow optimization")
+        for tool_name, durations in span_summary.get("tool", {}).items():
+            if durations["p95_seconds"] > self.performance_thresholds["max_processing_time"]:
+                insights.append(
+                    f"Tool {tool_name} p95 duration is {durations['p95_seconds']:.1f}s across {durations['count']} calls")
 
         # Generate recommendations
         recommendations = []
@@ -476,7 +1577,7 @@ class ComprehensiveRunHooks(RunHooks):
 
 
 # ================================
-# 4. Enhanced AgentHooks with Integration
+# 6. Enhanced AgentHooks with Integration
 # ================================
 
 class IntegratedAgentHooks(AgentHooks):
@@ -492,6 +1593,8 @@ class IntegratedAgentHooks(AgentHooks):
             "handoffs_received": 0,
             "performance_scores": []
         }
+        # Effective window of ~5 scores, matching the recent-activation view
+        self.performance_trend = OnlineTrendEstimator(decay=0.8)
         self.optimization_applied = False
 
     async def on_start(self, context: Any, agent: Agent) -> None:
@@ -531,6 +1634,7 @@ class IntegratedAgentHooks(AgentHooks):
         # Calculate performance score
         performance_score = self._calculate_performance_score(output)
         self.agent_metrics["performance_scores"].append(performance_score)
+        self.performance_trend.update(performance_score)
 
         event = LifecycleEvent(
             event_id=self.event_bus.generate_event_id(),
@@ -664,25 +1768,10 @@ class IntegratedAgentHooks(AgentHooks):
 
     def _analyze_performance_trend(self) -> str:
         """Analyze performance trend over recent activations."""
-        if len(self.agent_metrics["performance_scores"]) < 3:
-            return "insufficient_data"
-
-        recent_scores = self.agent_metrics["performance_scores"][-5:]
-        if len(recent_scores) < 3:
-            return "insufficient_data"
-
-        # Simple trend analysis
-        first_half_avg = sum(
-            recent_scores[:len(recent_scores)//2]) / (len(recent_scores)//2)
-        second_half_avg = sum(recent_scores[len(
-            recent_scores)//2:]) / (len(recent_scores) - len(recent_scores)//2)
-
-        if second_half_avg > first_half_avg + 5:
-            return "improving"
-        elif second_half_avg < first_half_avg - 5:
-            return "declining"
-        else:
-            return "stable"
+        # Absolute threshold: scores are already on a 0-100 scale
+        trend = self.performance_trend.trend(
+            threshold=5.0, relative=False, min_samples=3)
+        return {"increasing": "improving", "decreasing": "declining"}.get(trend, trend)
 
     def _assess_readiness(self) -> Dict[str, Any]:
         """Assess agent readiness for handoff."""
@@ -738,7 +1827,7 @@ class IntegratedAgentHooks(AgentHooks):
 
 
 # ================================
-# 5. Demo Tools and Agents
+# 7. Demo Tools and Agents
 # ================================
 
 @function_tool
@@ -799,7 +1888,7 @@ def create_coordinator_agent(event_bus: LifecycleEventBus) -> Agent:
 
 
 # ================================
-# 6. Demo Functions
+# 8. Demo Functions
 # ================================
 
 async def demo_integrated_lifecycle_monitoring():
@@ -924,6 +2013,15 @@ async def demo_event_correlation_analysis():
     handoff_patterns = [p for p in event_patterns if p["type"] == "handoff"]
     print(f"  Handoff Count: {len(handoff_patterns)}")
 
+    # Start/end pairs were correlated as the events arrived
+    span_summary = run_hooks.correlator.get_summary()
+    for kind in ("agent", "tool", "handoff"):
+        for name, durations in span_summary.get(kind, {}).items():
+            print(f"  {kind:>7} {name}: {durations['count']} spans, "
+                  f"avg {durations['avg_seconds']:.2f}s, p95 {durations['p95_seconds']:.2f}s")
+    print(f"  Still in flight: {span_summary['in_flight']}, "
+          f"unmatched ends: {span_summary['unmatched_ends']}")
+
     # Generate final session report
     final_report = run_hooks.generate_session_report()
     print(f"\n📈 Final Session Report:")
@@ -1044,8 +2142,185 @@ async def demo_production_monitoring_patterns():
     print(f"  Recommendations: {production_report.recommendations}")
 
 
+async def demo_async_event_bus():
+    """Demonstrate non-blocking publishing with isolated, slow and failing subscribers."""
+    print("\n=== Async Event Bus Demo ===")
+
+    event_bus = LifecycleEventBus(async_mode=True, max_queue_size=1000)
+
+    audit_log: List[str] = []
+
+    def slow_audit_writer(event: LifecycleEvent) -> None:
+        time.sleep(0.01)  # Blocking I/O, runs on the subscriber thread pool
+        audit_log.append(event.event_id)
+
+    tool_counts: Dict[str, int] = defaultdict(int)
+
+    async def tool_counter(event: LifecycleEvent) -> None:
+        tool_counts[event.data.get("tool_name", "unknown")] += 1
+
+    def flaky_forwarder(event: LifecycleEvent) -> None:
+        if event.metrics.get("sequence", 0) % 10 == 0:
+            raise ConnectionError("downstream unavailable")
+
+    # The audit writer keeps only the newest 50 events when it falls behind
+    event_bus.subscribe("*", slow_audit_writer, max_queue_size=50,
+                        overflow=SubscriberOverflow.DROP_OLDEST)
+    event_bus.subscribe(EventType.TOOL_END, tool_counter)
+    event_bus.subscribe("*", flaky_forwarder)
+
+    # Publishing 200 events never waits for the subscribers
+    start = time.perf_counter()
+    for sequence in range(200):
+        event_bus.publish_event(LifecycleEvent(
+            event_id=event_bus.generate_event_id(),
+            event_type=EventType.TOOL_END if sequence % 2 else EventType.AGENT_END,
+            timestamp=datetime.now(),
+            agent_name="AsyncDemoAgent",
+            context_id="async_demo",
+            data={"tool_name": "lookup" if sequence % 4 == 1 else "search"},
+            metrics={"sequence": float(sequence)}
+        ))
+    publish_ms = (time.perf_counter() - start) * 1000
+
+    await event_bus.close()
+
+    stats = event_bus.get_dispatch_stats()
+    print(f"  Published 200 events in {publish_ms:.1f} ms "
+          f"(queued: {stats['queued']}, dropped at publish: {stats['dropped']})")
+    print(f"  Queue depth after drain: {stats['queue_depth']}")
+    print(f"  Tool counts: {dict(tool_counts)}")
+    for subscriber in stats["subscribers"]:
+        print(f"  {subscriber['subscriber']:>18}: delivered {subscriber['delivered']}, "
+              f"dropped {subscriber['dropped']}, errors {subscriber['errors']}, "
+              f"p50/p99 latency {subscriber['latency_ms']['p50']:.1f}/{subscriber['latency_ms']['p99']:.1f} ms")
+
+
+async def demo_cross_process_fanout():
+    """Demonstrate one aggregator bus consuming events from several worker processes."""
+    print("\n=== Cross-Process Event Fan-Out Demo ===")
+
+    workers = ["WorkerA", "WorkerB"]
+    events_per_worker = 500
+    rings = [SharedMemoryRing.create(capacity=1 << 20) for _ in workers]
+
+    aggregate_bus = LifecycleEventBus()
+    per_worker: Dict[str, int] = defaultdict(int)
+    out_of_order = 0
+    last_sequence: Dict[str, float] = {}
+
+    def aggregate_monitor(event: LifecycleEvent):
+        nonlocal out_of_order
+        per_worker[event.agent_name] += 1
+        sequence = event.metrics["sequence"]
+        if sequence < last_sequence.get(event.agent_name, -1):
+            out_of_order += 1
+        last_sequence[event.agent_name] = sequence
+
+    aggregate_bus.subscribe("*", aggregate_monitor)
+    aggregator = SharedMemoryEventAggregator(rings, aggregate_bus)
+
+    processes = [
+        multiprocessing.Process(target=run_ring_worker,
+                                args=(ring.name, worker, events_per_worker))
+        for ring, worker in zip(rings, workers)
+    ]
+
+    try:
+        start = time.perf_counter()
+        stop = asyncio.Event()
+        consumer = asyncio.create_task(aggregator.run(stop))
+        for process in processes:
+            process.start()
+        await asyncio.gather(*(asyncio.to_thread(process.join) for process in processes))
+        stop.set()
+        await consumer
+        elapsed = time.perf_counter() - start
+        stats = aggregator.get_stats()
+    finally:
+        for ring in rings:
+            ring.close()
+
+    print(f"  Aggregated {stats['received']} events from {len(workers)} processes "
+          f"in {elapsed:.2f}s (including process start-up)")
+    print(f"  Per worker: {dict(per_worker)}")
+    print(f"  Out-of-order events within a worker: {out_of_order}")
+    tool_ends = aggregate_bus.get_events(event_type=EventType.TOOL_END)
+    print(f"  Tool completions queryable on the aggregator bus: {len(tool_ends)}")
+
+
+async def demo_concurrent_tool_correlation():
+    """Demonstrate start/end pairing when one tool runs several times in parallel."""
+    print("\n=== Concurrent Tool Correlation Demo ===")
+
+    event_bus = LifecycleEventBus()
+    run_hooks = ComprehensiveRunHooks(event_bus)
+    agent = create_analytics_agent(event_bus)
+    tool = agent.tools[0]
+    context = object()  # The hooks only use the context's identity
+
+    async def parallel_tool_call(delay: float):
+        # Mirrors the SDK: one tracing span per tool call, hooks gathered inside it
+        with function_span(tool.name):
+            await asyncio.gather(run_hooks.on_tool_start(context, agent, tool))
+            await asyncio.sleep(delay)
+            await asyncio.gather(run_hooks.on_tool_end(context, agent, tool, f"slept {delay}s"))
+
+    # Calls that start first finish last, so first-in/first-out pairing would be wrong
+    delays = [0.25, 0.2, 0.15, 0.1, 0.05]
+    with trace("concurrent_tool_correlation", disabled=True):
+        await run_hooks.on_agent_start(context, agent)
+        await asyncio.gather(*(parallel_tool_call(delay) for delay in delays))
+        await run_hooks.on_agent_end(context, agent, "All datasets analyzed")
+
+    tool_intervals = [interval for interval in run_hooks.correlator.recent
+                      if interval.kind == "tool"]
+    print(f"\n  Completed tool intervals: {len(tool_intervals)} "
+          f"(distinct calls: {len({interval.call_id for interval in tool_intervals})})")
+    for interval in sorted(tool_intervals, key=lambda interval: interval.start):
+        print(f"    {interval.name} started {interval.start.strftime('%H:%M:%S.%f')[:-3]} "
+              f"ran {interval.duration_seconds:.2f}s")
+
+    agent_intervals = [interval for interval in run_hooks.correlator.recent
+                       if interval.kind == "agent"]
+    for interval in agent_intervals:
+        print(f"  Agent span {interval.name}: {interval.duration_seconds:.2f}s")
+    print(f"  In flight after the run: {run_hooks.correlator.in_flight}")
+
+
+async def demo_multi_minute_session_report():
+    """Demonstrate a session report whose aggregates span several minute buckets."""
+    print("\n=== Multi-Minute Session Report Demo ===")
+
+    event_bus = LifecycleEventBus()
+    run_hooks = ComprehensiveRunHooks(event_bus)
+    now = datetime.now()
+    # Pretend the session started a few minutes ago, so the report reads
+    # the rollup tiers and not only the raw events of the current minute
+    run_hooks.session_metrics["start_time"] = now - timedelta(minutes=5)
+
+    scores = [40.0, 60.0, 80.0, 100.0]
+    for minutes_ago, score in zip(range(4, 0, -1), scores):
+        run_hooks.session_metrics["total_agents"].add("ReportAgent")
+        event_bus.publish_event(LifecycleEvent(
+            event_id=event_bus.generate_event_id(),
+            event_type=EventType.AGENT_END,
+            timestamp=now - timedelta(minutes=minutes_ago),
+            agent_name="ReportAgent",
+            context_id=f"ctx_{minutes_ago}",
+            metrics={"quality_score": score}
+        ))
+
+    report = run_hooks.generate_session_report()
+    performance = report.agent_performance["ReportAgent"]
+    print(f"  Minute buckets: {event_bus.rollups.get_stats()['minute_buckets']}")
+    print(f"  Events in report: {performance['total_events']} (published {len(scores)})")
+    print(f"  Average quality: {performance['avg_quality_score']:.1f} "
+          f"(expected {sum(scores) / len(scores):.1f})")
+
+
 # ================================
-# 7. Main Demo Function
+# 9. Main Demo Function
 # ================================
 
 async def main():
@@ -1057,6 +2332,10 @@ async def main():
     await demo_integrated_lifecycle_monitoring()
     await demo_event_correlation_analysis()
     await demo_production_monitoring_patterns()
+    await demo_async_event_bus()
+    await demo_cross_process_fanout()
+    await demo_concurrent_tool_correlation()
+    await demo_multi_minute_session_report()
 
     print("\n" + "=" * 60)
     print("✅ Combined lifecycle patterns demonstration complete!")
@@ -1066,6 +2345,10 @@ async def main():
     print("3. Production monitoring requires stricter thresholds and alerting")
     print("4. Lifecycle events provide valuable insights for optimization")
     print("5. Combined patterns enable enterprise-grade observability")
+    print("6. Async event buses keep slow subscribers off the agent's critical path")
+    print("7. Shared-memory rings fan events from many processes into one bus")
+    print("8. Streaming correlation pairs starts and ends without rescanning events")
+    print("9. Session reports aggregate rollup buckets, however long the session ran")
 
 
 if __name__ == "__main__":
@@ -1074,7 +2357,7 @@ if __name__ == "__main__":
 
 
 # ================================
-# 8. Production Implementation Notes
+# 10. Production Implementation Notes
 # ================================
 
 """
@@ -19,16 +19,31 @@ Based on: https://openai.github.io/openai-agents-python/ref/lifecycle/
 """
 
 import asyncio
+import math
+import os
+import random
+import tempfile
 import time
 import json
-from typing import Any, Dict, List, Optional, Set
+from abc import ABC, abstractmethod
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
 from datetime import datetime, timedelta
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from enum import Enum
+from collections import OrderedDict, defaultdict, deque
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; only ColumnarMetricStore needs it
+    np = None
 
 from agents import Agent, Runner, handoff, function_tool
 from agents.lifecycle import RunHooks, AgentHooks
 
+from binary_codec import BinaryCodec, optional
+from lifecycle_journal import FLAG_SLA_VIOLATION, LifecycleJournal
+from streaming_stats import FixedBucketHistogram, OnlineTrendEstimator, QuantileSketch
+
 
 # ================================
 # 1. Production Data Models
@@ -94,16 +109,847 @@ class ProductionAlert:
     resolution_time: Optional[datetime] = None
 
 
+# Binary schemas for shipping metrics and alerts off-box
+PRODUCTION_CODEC = BinaryCodec()
+PRODUCTION_CODEC.register(ProductionMetric, [
+    ("metric_id", "str"),
+    ("metric_type", MetricType),
+    ("value", "float"),
+    ("threshold", "float"),
+    ("timestamp", "datetime"),
+    ("tenant_id", optional("symbol")),
+    ("agent_name", optional("symbol")),
+    ("is_sla_violation", "bool"),
+    ("context", "any_map"),
+])
+PRODUCTION_CODEC.register(ProductionAlert, [
+    ("alert_id", "str"),
+    ("severity", SeverityLevel),
+    ("title", "symbol"),
+    ("description", "str"),
+    ("timestamp", "datetime"),
+    ("tenant_id", optional("symbol")),
+    ("agent_name", optional("symbol")),
+    ("metric_values", "float_map"),
+    ("escalated", "bool"),
+    ("resolved", "bool"),
+    ("resolution_time", optional("datetime")),
+])
+
+
 # ================================
-# 2. Production Monitoring System
+# 2. Metric Storage
 # ================================
 
-class ProductionMonitoringSystem:
-    """Centralized production monitoring and alerting system."""
+@dataclass
+class MetricWindowSummary:
+    """Pre-aggregated metric values for a bucket or a query window."""
+    count: int = 0
+    violations: int = 0
+    total: float = 0.0
+    minimum: float = math.inf
+    maximum: float = -math.inf
+    latest: float = 0.0
+    latest_timestamp: float = 0.0
+
+    @property
+    def average(self) -> float:
+        """Mean value of the aggregated samples."""
+        return self.total / self.count if self.count else 0.0
+
+    def add(self, value: float, is_violation: bool, timestamp: float) -> None:
+        """Fold a single sample into the aggregate."""
+        self.count += 1
+        self.violations += 1 if is_violation else 0
+        self.total += value
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+        if timestamp >= self.latest_timestamp:
+            self.latest = value
+            self.latest_timestamp = timestamp
+
+    def merge(self, other: "MetricWindowSummary") -> None:
+        """Fold another aggregate into this one."""
+        if not other.count:
+            return
+        self.count += other.count
+        self.violations += other.violations
+        self.total += other.total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        if other.latest_timestamp >= self.latest_timestamp:
+            self.latest = other.latest
+            self.latest_timestamp = other.latest_timestamp
+
+
+class MetricStore(ABC):
+    """Pluggable storage backend for ProductionMonitoringSystem metrics."""
+
+    @abstractmethod
+    def add(self, metric: ProductionMetric) -> None:
+        """Store a recorded metric."""
+
+    @abstractmethod
+    def summarize(self, metric_type: MetricType, since: datetime,
+                  tenant_id: Optional[str] = None) -> MetricWindowSummary:
+        """Aggregate a metric type over the window starting at `since`."""
+
+
+class _MetricSeries:
+    """Fixed-size ring of per-minute buckets for one (metric type, tenant) series."""
+
+    def __init__(self, retention_minutes: int):
+        self.retention_minutes = retention_minutes
+        self.bucket_minutes: List[int] = [-1] * retention_minutes
+        self.buckets: List[Optional[MetricWindowSummary]] = [
+            None] * retention_minutes
+
+    def add(self, timestamp: float, value: float, is_violation: bool) -> None:
+        """Add a sample to the bucket for its minute, recycling stale slots."""
+        minute = int(timestamp // 60)
+        slot = minute % self.retention_minutes
+
+        if self.bucket_minutes[slot] > minute:
+            return  # Older than the data the ring currently holds
+
+        if self.bucket_minutes[slot] != minute:
+            self.bucket_minutes[slot] = minute
+            self.buckets[slot] = MetricWindowSummary()
+
+        self.buckets[slot].add(value, is_violation, timestamp)
+
+    def summarize_into(self, summary: MetricWindowSummary, since: float, now: float) -> None:
+        """Merge only the buckets covered by the [since, now] window."""
+        last_minute = int(now // 60)
+        first_minute = max(int(since // 60),
+                           last_minute - self.retention_minutes + 1)
+
+        for minute in range(first_minute, last_minute + 1):
+            slot = minute % self.retention_minutes
+            if self.bucket_minutes[slot] == minute:
+                summary.merge(self.buckets[slot])
+
+
+class RingBufferMetricStore(MetricStore):
+    """Metric store with bounded memory per metric type and tenant.
+
+    Each series keeps `retention_minutes` per-minute buckets in a ring, so old
+    data ages out as slots are reused and window queries only touch the buckets
+    they cover. Windows are resolved at minute granularity.
+    """
+
+    def __init__(self, retention_minutes: int = 24 * 60):
+        self.retention_minutes = retention_minutes
+        self.series: Dict[MetricType, Dict[Optional[str],
+                                           _MetricSeries]] = defaultdict(dict)
+
+    def add(self, metric: ProductionMetric) -> None:
+        """Record a metric into its (metric type, tenant) ring."""
+        tenant_series = self.series[metric.metric_type]
+        series = tenant_series.get(metric.tenant_id)
+        if series is None:
+            series = _MetricSeries(self.retention_minutes)
+            tenant_series[metric.tenant_id] = series
+
+        series.add(metric.timestamp.timestamp(),
+                   metric.value, metric.is_sla_violation)
+
+    def _matching_series(self, metric_type: MetricType, tenant_id: Optional[str]) -> List[_MetricSeries]:
+        """Series for one tenant, or for every tenant when tenant_id is None."""
+        tenant_series = self.series.get(metric_type, {})
+        if tenant_id is None:
+            return list(tenant_series.values())
+        series = tenant_series.get(tenant_id)
+        return [series] if series else []
+
+    def summarize(self, metric_type: MetricType, since: datetime,
+                  tenant_id: Optional[str] = None) -> MetricWindowSummary:
+        """Aggregate the buckets covered by the window."""
+        summary = MetricWindowSummary()
+        since_ts = since.timestamp()
+        now_ts = time.time()
+
+        for series in self._matching_series(metric_type, tenant_id):
+            series.summarize_into(summary, since_ts, now_ts)
+
+        return summary
+
+
+class ListMetricStore(MetricStore):
+    """Unbounded list of ProductionMetric objects, rescanned on every query.
+
+    This is the original storage approach, kept as a reference implementation
+    and as the baseline for benchmarks.
+    """
 
     def __init__(self):
         self.metrics: List[ProductionMetric] = []
-        self.alerts: List[ProductionAlert] = []
+
+    def add(self, metric: ProductionMetric) -> None:
+        """Append the metric object."""
+        self.metrics.append(metric)
+
+    def _filter(self, metric_type: MetricType, since: datetime,
+                tenant_id: Optional[str]) -> List[ProductionMetric]:
+        """Full scan for the metrics inside the window."""
+        return [
+            m for m in self.metrics
+            if m.metric_type == metric_type and m.timestamp >= since
+            and (tenant_id is None or m.tenant_id == tenant_id)
+        ]
+
+    def summarize(self, metric_type: MetricType, since: datetime,
+                  tenant_id: Optional[str] = None) -> MetricWindowSummary:
+        """Aggregate by scanning every stored metric."""
+        summary = MetricWindowSummary()
+        for metric in self._filter(metric_type, since, tenant_id):
+            summary.add(metric.value, metric.is_sla_violation,
+                        metric.timestamp.timestamp())
+        return summary
+
+
+class _MetricColumns:
+    """Growable NumPy columns for the samples of one metric type."""
+
+    COLUMN_NAMES = ("values", "timestamps_ns", "tenant_codes",
+                    "agent_codes", "violations")
+
+    def __init__(self, initial_capacity: int):
+        self.size = 0
+        self.last_timestamp_ns = 0
+        self.values = np.empty(initial_capacity, dtype=np.float64)
+        self.timestamps_ns = np.empty(initial_capacity, dtype=np.int64)
+        self.tenant_codes = np.empty(initial_capacity, dtype=np.int32)
+        self.agent_codes = np.empty(initial_capacity, dtype=np.int32)
+        self.violations = np.empty(initial_capacity, dtype=np.bool_)
+
+    def reserve(self, extra: int) -> None:
+        """Grow the columns geometrically so appends stay amortized O(1)."""
+        required = self.size + extra
+        if required <= len(self.values):
+            return
+        capacity = max(required, len(self.values) * 2)
+        for name in self.COLUMN_NAMES:
+            column = getattr(self, name)
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[:self.size] = column[:self.size]
+            setattr(self, name, grown)
+
+    def drop_oldest(self, count: int) -> None:
+        """Discard the oldest `count` samples."""
+        count = min(count, self.size)
+        keep = self.size - count
+        for name in self.COLUMN_NAMES:
+            column = getattr(self, name)
+            column[:keep] = column[count:self.size]
+        self.size = keep
+
+    def window_start(self, since_ns: int) -> int:
+        """Index of the first sample at or after `since_ns` (binary search)."""
+        return int(np.searchsorted(self.timestamps_ns[:self.size], since_ns, side="left"))
+
+
+class ColumnarMetricStore(MetricStore):
+    """Array-backed metric store with vectorized window queries.
+
+    Samples are kept per metric type as float64 values, int64 nanosecond
+    timestamps (clamped to be monotonic so windows are found by binary search)
+    and interned int32 tenant/agent codes. Requires NumPy.
+    """
+
+    NO_CODE = -1
+
+    def __init__(self, initial_capacity: int = 4096, max_samples_per_type: Optional[int] = None):
+        if np is None:
+            raise ImportError(
+                "ColumnarMetricStore requires numpy (pip install numpy)")
+
+        self.initial_capacity = initial_capacity
+        self.max_samples_per_type = max_samples_per_type
+        self.columns: Dict[MetricType, _MetricColumns] = {}
+        self.string_codes: Dict[str, int] = {}
+        self.strings: List[str] = []
+
+    def intern(self, value: Optional[str]) -> int:
+        """Map a tenant or agent name to a compact integer code."""
+        if value is None:
+            return self.NO_CODE
+        code = self.string_codes.get(value)
+        if code is None:
+            code = self.string_codes[value] = len(self.strings)
+            self.strings.append(value)
+        return code
+
+    def _columns_for(self, metric_type: MetricType) -> _MetricColumns:
+        columns = self.columns.get(metric_type)
+        if columns is None:
+            columns = self.columns[metric_type] = _MetricColumns(
+                self.initial_capacity)
+        return columns
+
+    def _enforce_retention(self, columns: _MetricColumns) -> None:
+        """Drop the oldest half once a column group exceeds its cap."""
+        if self.max_samples_per_type and columns.size > self.max_samples_per_type:
+            columns.drop_oldest(
+                columns.size - self.max_samples_per_type // 2)
+
+    def add(self, metric: ProductionMetric) -> None:
+        """Append a single metric as one row."""
+        columns = self._columns_for(metric.metric_type)
+        columns.reserve(1)
+
+        timestamp_ns = max(int(metric.timestamp.timestamp() * 1e9),
+                           columns.last_timestamp_ns)
+        index = columns.size
+        columns.values[index] = metric.value
+        columns.timestamps_ns[index] = timestamp_ns
+        columns.tenant_codes[index] = self.intern(metric.tenant_id)
+        columns.agent_codes[index] = self.intern(metric.agent_name)
+        columns.violations[index] = metric.is_sla_violation
+        columns.size += 1
+        columns.last_timestamp_ns = timestamp_ns
+
+        self._enforce_retention(columns)
+
+    def extend(self, metric_type: MetricType, values: Any, timestamps_ns: Any,
+               violations: Any, tenant_id: Optional[str] = None,
+               agent_name: Optional[str] = None) -> None:
+        """Bulk-append already-columnar samples (e.g. replayed or batched data)."""
+        values = np.asarray(values, dtype=np.float64)
+        count = len(values)
+        if count == 0:
+            return
+
+        columns = self._columns_for(metric_type)
+        columns.reserve(count)
+
+        timestamps = np.maximum.accumulate(
+            np.maximum(np.asarray(timestamps_ns, dtype=np.int64), columns.last_timestamp_ns))
+        window = slice(columns.size, columns.size + count)
+        columns.values[window] = values
+        columns.timestamps_ns[window] = timestamps
+        columns.tenant_codes[window] = self.intern(tenant_id)
+        columns.agent_codes[window] = self.intern(agent_name)
+        columns.violations[window] = np.asarray(violations, dtype=np.bool_)
+        columns.size += count
+        columns.last_timestamp_ns = int(timestamps[-1])
+
+        self._enforce_retention(columns)
+
+    def _window(self, metric_type: MetricType, since: datetime,
+                tenant_id: Optional[str]) -> Tuple[Any, Any, Any]:
+        """Vectorized (values, timestamps, violations) views for a window."""
+        columns = self.columns.get(metric_type)
+        if columns is None or columns.size == 0:
+            empty = np.empty(0)
+            return empty, empty, empty
+
+        start = columns.window_start(int(since.timestamp() * 1e9))
+        window = slice(start, columns.size)
+        values = columns.values[window]
+        timestamps = columns.timestamps_ns[window]
+        violations = columns.violations[window]
+
+        if tenant_id is not None:
+            tenant_code = self.string_codes.get(tenant_id)
+            if tenant_code is None:
+                empty = np.empty(0)
+                return empty, empty, empty
+            mask = columns.tenant_codes[window] == tenant_code
+            values, timestamps, violations = values[mask], timestamps[mask], violations[mask]
+
+        return values, timestamps, violations
+
+    def summarize(self, metric_type: MetricType, since: datetime,
+                  tenant_id: Optional[str] = None) -> MetricWindowSummary:
+        """Aggregate the window with NumPy reductions."""
+        values, timestamps, violations = self._window(
+            metric_type, since, tenant_id)
+        if len(values) == 0:
+            return MetricWindowSummary()
+
+        return MetricWindowSummary(
+            count=len(values),
+            violations=int(np.count_nonzero(violations)),
+            total=float(values.sum()),
+            minimum=float(values.min()),
+            maximum=float(values.max()),
+            latest=float(values[-1]),
+            latest_timestamp=float(timestamps[-1]) / 1e9
+        )
+
+
+# ================================
+# 3. Sliding-Window SLA Evaluation
+# ================================
+
+class SlidingWindowSLAEvaluator:
+    """Running violation counts for one SLATarget over its sliding time window.
+
+    The window is split into `resolution_seconds` slots held in a ring. Recording
+    a sample expires the slots that fell out of the window and bumps the running
+    totals, so both updates and compliance queries are O(1) amortized.
+    """
+
+    def __init__(self, sla_target: SLATarget, resolution_seconds: int = 60):
+        self.sla_target = sla_target
+        self.resolution_seconds = resolution_seconds
+        self.slot_count = max(
+            1, math.ceil(sla_target.time_window_minutes * 60 / resolution_seconds))
+        self.slot_ids: List[int] = [-1] * self.slot_count
+        self.slot_totals: List[int] = [0] * self.slot_count
+        self.slot_violations: List[int] = [0] * self.slot_count
+        self.head_slot: Optional[int] = None
+        self.total = 0
+        self.violations = 0
+
+    def _advance(self, slot_id: int) -> None:
+        """Move the window forward to `slot_id`, expiring slots that left it."""
+        if self.head_slot is not None and slot_id <= self.head_slot:
+            return
+
+        first_slot = slot_id - self.slot_count + 1
+        if self.head_slot is not None:
+            first_slot = max(first_slot, self.head_slot + 1)
+
+        for expired_slot in range(first_slot, slot_id + 1):
+            index = expired_slot % self.slot_count
+            self.total -= self.slot_totals[index]
+            self.violations -= self.slot_violations[index]
+            self.slot_ids[index] = expired_slot
+            self.slot_totals[index] = 0
+            self.slot_violations[index] = 0
+
+        self.head_slot = slot_id
+
+    def record(self, is_violation: bool, timestamp: Optional[float] = None) -> None:
+        """Count one measurement against the window."""
+        slot_id = int((timestamp if timestamp is not None else time.time()
+                       ) // self.resolution_seconds)
+        self._advance(slot_id)
+
+        index = slot_id % self.slot_count
+        if self.slot_ids[index] != slot_id:
+            return  # Older than the window
+
+        self.slot_totals[index] += 1
+        self.total += 1
+        if is_violation:
+            self.slot_violations[index] += 1
+            self.violations += 1
+
+    def get_status(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """Current windowed compliance without rescanning any samples."""
+        self._advance(int((now if now is not None else time.time()
+                           ) // self.resolution_seconds))
+
+        compliance_rate = 100.0 - \
+            (self.violations / self.total * 100) if self.total else 100.0
+
+        return {
+            "time_window_minutes": self.sla_target.time_window_minutes,
+            "total_measurements": self.total,
+            "violations": self.violations,
+            "compliance_rate_percent": compliance_rate,
+            "meets_sla": compliance_rate >= self.sla_target.violation_threshold_percent
+        }
+
+
+# ================================
+# 4. Asynchronous Alert Dispatch
+# ================================
+
+class AlertSink(ABC):
+    """Destination for delivered alerts. Subclass and implement send_batch."""
+
+    name = "sink"
+
+    @abstractmethod
+    async def send_batch(self, alerts: List[ProductionAlert]) -> None:
+        """Deliver a batch of alerts."""
+
+
+class StdoutAlertSink(AlertSink):
+    """Prints alerts to the console."""
+
+    name = "stdout"
+
+    async def send_batch(self, alerts: List[ProductionAlert]) -> None:
+        for alert in alerts:
+            print(
+                f"🚨 [SLA VIOLATION {alert.severity.value.upper()}] {alert.title}")
+            print(f"   Agent: {alert.agent_name}, {alert.description}")
+
+
+class FileAlertSink(AlertSink):
+    """Appends alerts as JSON lines to a file, off the event loop."""
+
+    name = "file"
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def _write(self, lines: List[str]) -> None:
+        with open(self.path, "a", encoding="utf-8") as handle:
+            handle.writelines(lines)
+
+    async def send_batch(self, alerts: List[ProductionAlert]) -> None:
+        lines = [
+            json.dumps({
+                **asdict(alert),
+                "timestamp": alert.timestamp.isoformat(),
+                "resolution_time": alert.resolution_time.isoformat() if alert.resolution_time else None
+            }) + "\n"
+            for alert in alerts
+        ]
+        await asyncio.to_thread(self._write, lines)
+
+
+class WebhookAlertSink(AlertSink):
+    """Stand-in for a webhook (PagerDuty, Slack...) that simulates network latency."""
+
+    name = "webhook"
+
+    def __init__(self, url: str, latency_seconds: float = 0.05):
+        self.url = url
+        self.latency_seconds = latency_seconds
+        self.requests: List[Dict[str, Any]] = []
+
+    async def send_batch(self, alerts: List[ProductionAlert]) -> None:
+        # One POST per batch instead of one per alert
+        await asyncio.sleep(self.latency_seconds)
+        self.requests.append({
+            "url": self.url,
+            "alert_ids": [alert.alert_id for alert in alerts]
+        })
+
+
+class OverflowPolicy(str, Enum):
+    """What to do when the alert queue is full."""
+    DROP_NEWEST = "drop_newest"
+    DROP_OLDEST = "drop_oldest"
+    BACKPRESSURE = "backpressure"
+
+
+class AlertDispatcher:
+    """Bounded alert queue drained by a background consumer task.
+
+    `submit` never blocks, so it is safe to call from hooks on the request path.
+    The consumer batches alerts (up to `batch_size`, or whatever arrived within
+    `flush_interval` seconds) and delivers each batch to every sink, isolating
+    sink failures. With BACKPRESSURE, producers that can await should use
+    `publish`, which waits for queue space; `submit` still drops when full.
+    DROP_OLDEST evictions are counted as `evicted`, apart from rejected
+    alerts in `dropped`. Called outside a running event loop, `submit`
+    delivers everything queued synchronously, since no consumer could run.
+    """
+
+    def __init__(self, sinks: Optional[List[AlertSink]] = None, max_queue_size: int = 1000,
+                 batch_size: int = 50, flush_interval: float = 0.25,
+                 overflow_policy: OverflowPolicy = OverflowPolicy.DROP_NEWEST):
+        self.sinks = sinks if sinks is not None else [StdoutAlertSink()]
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow_policy = overflow_policy
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+        self.consumer_task: Optional[asyncio.Task] = None
+        self.stats: Dict[str, int] = {
+            "submitted": 0,
+            "delivered": 0,
+            "dropped": 0,
+            "evicted": 0,
+            "batches": 0,
+            "sink_errors": 0
+        }
+
+    def _ensure_consumer(self) -> bool:
+        """Start the consumer on the running loop; False if no loop is running."""
+        if self.consumer_task is not None and not self.consumer_task.done():
+            return True
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        self.consumer_task = loop.create_task(self._consume())
+        return True
+
+    def submit(self, alert: ProductionAlert) -> bool:
+        """Enqueue an alert without blocking; returns False if it was dropped."""
+        self.stats["submitted"] += 1
+        has_loop = self._ensure_consumer()
+
+        if self.queue.full():
+            if self.overflow_policy != OverflowPolicy.DROP_OLDEST:
+                self.stats["dropped"] += 1
+                return False
+            # Make room by discarding the oldest queued alert
+            self.queue.get_nowait()
+            self.queue.task_done()
+            self.stats["evicted"] += 1
+
+        self.queue.put_nowait(alert)
+        if not has_loop:
+            # Nothing would ever drain the queue, so deliver now
+            asyncio.run(self._flush_queued())
+        return True
+
+    async def publish(self, alert: ProductionAlert) -> bool:
+        """Enqueue an alert, waiting for space under the BACKPRESSURE policy."""
+        if self.overflow_policy != OverflowPolicy.BACKPRESSURE:
+            return self.submit(alert)
+
+        self.stats["submitted"] += 1
+        self._ensure_consumer()
+        await self.queue.put(alert)
+        return True
+
+    async def _next_batch(self) -> List[ProductionAlert]:
+        """Wait for one alert, then collect more until the batch fills or times out."""
+        batch = [await self.queue.get()]
+        deadline = asyncio.get_running_loop().time() + self.flush_interval
+
+        while len(batch) < self.batch_size:
+            if not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+                continue
+            remaining = deadline - asyncio.get_running_loop().time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _deliver(self, batch: List[ProductionAlert]) -> None:
+        """Send one batch to every sink, isolating sink failures."""
+        try:
+            for sink in self.sinks:
+                try:
+                    await sink.send_batch(batch)
+                except Exception as e:
+                    self.stats["sink_errors"] += 1
+                    print(f"Error in alert sink {sink.name}: {e}")
+            self.stats["delivered"] += len(batch)
+            self.stats["batches"] += 1
+        finally:
+            for _ in batch:
+                self.queue.task_done()
+
+    async def _consume(self) -> None:
+        """Deliver batches to every sink until the queue runs dry.
+
+        The task exits when idle and `submit` starts a new one on demand, so an
+        idle dispatcher never leaves a task parked on the event loop.
+        """
+        while not self.queue.empty():
+            await self._deliver(await self._next_batch())
+
+    async def _flush_queued(self) -> None:
+        """Deliver what is queued right now, in batches, without waiting for more.
+
+        Uses only non-blocking queue calls, so the queue is never bound to the
+        temporary loop `submit` runs this on.
+        """
+        while not self.queue.empty():
+            size = min(self.batch_size, self.queue.qsize())
+            await self._deliver([self.queue.get_nowait() for _ in range(size)])
+
+    async def drain(self) -> None:
+        """Wait until every queued alert has been delivered."""
+        if not self.queue.empty():
+            self._ensure_consumer()
+        await self.queue.join()
+
+    async def stop(self) -> None:
+        """Deliver what is queued, then stop the consumer task."""
+        await self.drain()
+        if self.consumer_task is not None:
+            self.consumer_task.cancel()
+            try:
+                await self.consumer_task
+            except asyncio.CancelledError:
+                pass
+            self.consumer_task = None
+
+    def get_stats(self) -> Dict[str, int]:
+        """Delivery counters plus the current queue depth."""
+        return {**self.stats, "queue_depth": self.queue.qsize()}
+
+
+# ================================
+# 5. Alert Deduplication and Suppression
+# ================================
+
+AlertGroupKey = Tuple[str, Optional[str], Optional[str], SeverityLevel]
+
+SEVERITY_ORDER = [SeverityLevel.LOW, SeverityLevel.MEDIUM,
+                  SeverityLevel.HIGH, SeverityLevel.CRITICAL]
+
+
+@dataclass
+class AlertIncident:
+    """Open incident grouping repeated alerts for one (SLA, agent, tenant, severity)."""
+    sla_name: str
+    agent_name: Optional[str]
+    tenant_id: Optional[str]
+    severity: SeverityLevel
+    opened_at: float
+    last_seen: float
+    last_notified: float
+    occurrences: int = 0
+    suppressed_since_notification: int = 0
+    escalation_level: int = 0
+    latest_alert: Optional[ProductionAlert] = None
+
+    @property
+    def key(self) -> AlertGroupKey:
+        return (self.sla_name, self.agent_name, self.tenant_id, self.severity)
+
+
+class AlertGrouper:
+    """Collapses alert storms into incidents with suppression and escalation.
+
+    The first alert of a group opens an incident and is delivered. Repeats are
+    counted but suppressed until `suppression_window_seconds` have passed, when a
+    single reminder carrying the suppressed count goes out. Crossing one of the
+    `escalation_thresholds` always notifies, flagged as escalated. Incidents
+    with no activity for `resolve_after_seconds` are closed.
+
+    Open incidents live in an OrderedDict ordered by last activity, giving O(1)
+    lookup by key and amortized O(1) expiry from the stale end.
+    """
+
+    def __init__(self, suppression_window_seconds: float = 300.0,
+                 escalation_thresholds: Tuple[int, ...] = (10, 50, 200),
+                 resolve_after_seconds: float = 900.0):
+        self.suppression_window_seconds = suppression_window_seconds
+        self.escalation_thresholds = escalation_thresholds
+        self.resolve_after_seconds = resolve_after_seconds
+        self.open_incidents: "OrderedDict[AlertGroupKey, AlertIncident]" = OrderedDict()
+        self.stats: Dict[str, int] = {
+            "observed": 0,
+            "notified": 0,
+            "suppressed": 0,
+            "escalations": 0,
+            "incidents_opened": 0,
+            "incidents_resolved": 0
+        }
+
+    def observe(self, key: AlertGroupKey, now: Optional[float] = None) -> Tuple[AlertIncident, Optional[str]]:
+        """Count an occurrence and decide whether it should be delivered.
+
+        Returns the incident and the notification reason ("opened", "escalated"
+        or "reminder"), or None when the occurrence is suppressed.
+        """
+        now = now if now is not None else time.time()
+        self.resolve_stale(now)
+        self.stats["observed"] += 1
+
+        reason = None
+        incident = self.open_incidents.get(key)
+        if incident is None:
+            sla_name, agent_name, tenant_id, severity = key
+            incident = AlertIncident(sla_name, agent_name, tenant_id, severity,
+                                     opened_at=now, last_seen=now, last_notified=now)
+            self.open_incidents[key] = incident
+            self.stats["incidents_opened"] += 1
+            reason = "opened"
+        else:
+            self.open_incidents.move_to_end(key)
+
+        incident.occurrences += 1
+        incident.last_seen = now
+
+        if (incident.escalation_level < len(self.escalation_thresholds)
+                and incident.occurrences >= self.escalation_thresholds[incident.escalation_level]):
+            incident.escalation_level += 1
+            self.stats["escalations"] += 1
+            reason = "escalated"
+        elif reason is None and now - incident.last_notified >= self.suppression_window_seconds:
+            reason = "reminder"
+
+        if reason is None:
+            incident.suppressed_since_notification += 1
+            self.stats["suppressed"] += 1
+        else:
+            incident.last_notified = now
+            self.stats["notified"] += 1
+
+        return incident, reason
+
+    def resolve_stale(self, now: Optional[float] = None) -> int:
+        """Close incidents that have been quiet for resolve_after_seconds."""
+        now = now if now is not None else time.time()
+        resolved = 0
+        while self.open_incidents:
+            oldest = next(iter(self.open_incidents.values()))
+            if now - oldest.last_seen < self.resolve_after_seconds:
+                break
+            self.open_incidents.popitem(last=False)
+            resolved += 1
+        self.stats["incidents_resolved"] += resolved
+        return resolved
+
+    def resolve(self, key: AlertGroupKey) -> Optional[AlertIncident]:
+        """Manually close an incident (e.g. acknowledged by on-call)."""
+        incident = self.open_incidents.pop(key, None)
+        if incident is not None:
+            self.stats["incidents_resolved"] += 1
+        return incident
+
+    def get_incident(self, sla_name: str, agent_name: Optional[str], tenant_id: Optional[str],
+                     severity: SeverityLevel) -> Optional[AlertIncident]:
+        """O(1) lookup of a currently open incident."""
+        return self.open_incidents.get((sla_name, agent_name, tenant_id, severity))
+
+    def get_stats(self) -> Dict[str, int]:
+        """Deduplication counters plus the number of open incidents."""
+        return {**self.stats, "open_incidents": len(self.open_incidents)}
+
+
+# ================================
+# 6. Production Monitoring System
+# ================================
+
+class ProductionMonitoringSystem:
+    """Centralized production monitoring and alerting system.
+
+    Metrics go to a RingBufferMetricStore unless a store is passed in;
+    `columnar_metrics=True` picks a ColumnarMetricStore instead (needs NumPy,
+    installed with the `columnar` extra).
+    """
+
+    def __init__(self, metric_store: Optional[MetricStore] = None,
+                 alert_dispatcher: Optional[AlertDispatcher] = None,
+                 alert_grouper: Optional[AlertGrouper] = None,
+                 max_alert_history: int = 1000,
+                 journal: Optional[LifecycleJournal] = None,
+                 columnar_metrics: bool = False):
+        if metric_store is None:
+            metric_store = ColumnarMetricStore() if columnar_metrics else RingBufferMetricStore()
+        self.metric_store = metric_store
+        self.journal = journal
+        self.alert_dispatcher = alert_dispatcher or AlertDispatcher()
+        self.quantile_sketches: Dict[Tuple[MetricType, Optional[str],
+                                           Optional[str]], QuantileSketch] = {}
+        self.sla_windows: Dict[Tuple[str, Optional[str]],
+                               SlidingWindowSLAEvaluator] = {}
+        self.trend_estimators: Dict[Tuple[MetricType, Optional[str],
+                                          Optional[str]], OnlineTrendEstimator] = {}
+        # Lifetime per-series aggregates, read by the OpenMetrics exporter
+        self.series_totals: Dict[Tuple[MetricType, Optional[str],
+                                       Optional[str]], MetricWindowSummary] = {}
+        self.latency_histograms: Dict[Tuple[Optional[str],
+                                            Optional[str]], FixedBucketHistogram] = {}
+        self.tool_duration_histograms: Dict[Tuple[str, Optional[str],
+                                                  Optional[str]], FixedBucketHistogram] = {}
+        self.handoff_counts: Dict[Tuple[str, str,
+                                        Optional[str]], int] = defaultdict(int)
+        self.alert_grouper = alert_grouper or AlertGrouper()
+        # Only delivered alerts are kept, and only the most recent ones
+        self.alerts: Deque[ProductionAlert] = deque(maxlen=max_alert_history)
         self.sla_targets: List[SLATarget] = []
         self.alert_counter = 0
         self.metric_counter = 0
@@ -173,7 +1019,13 @@ class ProductionMonitoringSystem:
             context=context or {}
         )
 
-        self.metrics.append(metric)
+        self._apply_metric(metric, sla_target)
+
+        if self.journal is not None:
+            self.journal.append(
+                metric_type.value, value, int(metric.timestamp.timestamp() * 1e9),
+                agent=agent_name, scope=tenant_id,
+                flags=FLAG_SLA_VIOLATION if is_violation else 0)
 
         # Create alert if SLA violation
         if is_violation and sla_target:
@@ -181,6 +1033,151 @@ class ProductionMonitoringSystem:
 
         return metric
 
+    def _apply_metric(self, metric: ProductionMetric, sla_target: Optional[SLATarget]) -> None:
+        """Fold a metric into every in-memory aggregate."""
+        if sla_target:
+            self._update_sla_windows(sla_target, metric.is_sla_violation,
+                                     metric.tenant_id, metric.timestamp.timestamp())
+        self.metric_store.add(metric)
+        self._update_quantile_sketch(metric)
+        self._update_trend_estimator(metric)
+        self._update_series_totals(metric)
+
+    def restore_from_journal(self, directory: str) -> int:
+        """Rebuild the in-memory aggregates from a metric journal.
+
+        Replayed metrics go through the same aggregation as live ones but never
+        raise alerts. Returns the number of metrics restored.
+        """
+        metric_types = {metric_type.value: metric_type for metric_type in MetricType}
+        restored = 0
+
+        for record in LifecycleJournal.replay(directory):
+            metric_type = metric_types.get(record.kind)
+            if metric_type is None:
+                continue
+
+            restored += 1
+            sla_target = self._find_sla_target(metric_type)
+            self._apply_metric(ProductionMetric(
+                metric_id=f"replayed_{restored}",
+                metric_type=metric_type,
+                value=record.value,
+                threshold=sla_target.target_value if sla_target else 0.0,
+                timestamp=datetime.fromtimestamp(record.timestamp_ns / 1e9),
+                tenant_id=record.scope,
+                agent_name=record.agent,
+                is_sla_violation=bool(record.flags & FLAG_SLA_VIOLATION)
+            ), sla_target)
+
+        return restored
+
+    def _update_sla_windows(self, sla_target: SLATarget, is_violation: bool,
+                            tenant_id: Optional[str], timestamp: Optional[float] = None) -> None:
+        """Update the fleet-wide and per-tenant sliding windows for an SLA."""
+        now = time.time() if timestamp is None else timestamp
+        keys = [(sla_target.name, None)]
+        if tenant_id is not None:
+            keys.append((sla_target.name, tenant_id))
+
+        for key in keys:
+            evaluator = self.sla_windows.get(key)
+            if evaluator is None or evaluator.sla_target is not sla_target:
+                evaluator = SlidingWindowSLAEvaluator(sla_target)
+                self.sla_windows[key] = evaluator
+            evaluator.record(is_violation, now)
+
+    def get_sla_window_status(self, tenant_id: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """Compliance of each SLA over its own sliding window, in O(#SLAs)."""
+        status = {}
+        for sla_target in self.sla_targets:
+            evaluator = self.sla_windows.get((sla_target.name, tenant_id))
+            if sla_target.enabled and evaluator is not None:
+                status[sla_target.name] = evaluator.get_status()
+        return status
+
+    def _update_quantile_sketch(self, metric: ProductionMetric) -> None:
+        """Fold a metric into its (metric type, agent, tenant) quantile sketch."""
+        key = (metric.metric_type, metric.agent_name, metric.tenant_id)
+        sketch = self.quantile_sketches.get(key)
+        if sketch is None:
+            sketch = self.quantile_sketches[key] = QuantileSketch()
+        sketch.add(metric.value)
+
+    def _update_series_totals(self, metric: ProductionMetric) -> None:
+        """Fold a metric into its lifetime totals and, for latency, its histogram."""
+        key = (metric.metric_type, metric.agent_name, metric.tenant_id)
+        totals = self.series_totals.get(key)
+        if totals is None:
+            totals = self.series_totals[key] = MetricWindowSummary()
+        totals.add(metric.value, metric.is_sla_violation,
+                   metric.timestamp.timestamp())
+
+        if metric.metric_type == MetricType.LATENCY:
+            histogram_key = (metric.agent_name, metric.tenant_id)
+            histogram = self.latency_histograms.get(histogram_key)
+            if histogram is None:
+                histogram = self.latency_histograms[histogram_key] = FixedBucketHistogram()
+            histogram.observe(metric.value)
+
+    def record_tool_duration(self, tool_name: str, duration_seconds: float,
+                             agent_name: Optional[str] = None,
+                             tenant_id: Optional[str] = None) -> None:
+        """Count one tool call in its duration histogram."""
+        key = (tool_name, agent_name, tenant_id)
+        histogram = self.tool_duration_histograms.get(key)
+        if histogram is None:
+            histogram = self.tool_duration_histograms[key] = FixedBucketHistogram()
+        histogram.observe(duration_seconds)
+
+    def record_handoff(self, from_agent: str, to_agent: str,
+                       tenant_id: Optional[str] = None) -> None:
+        """Count one handoff between two agents."""
+        self.handoff_counts[(from_agent, to_agent, tenant_id)] += 1
+
+    def _update_trend_estimator(self, metric: ProductionMetric) -> None:
+        """Fold a metric into its (metric type, agent, tenant) trend estimator."""
+        key = (metric.metric_type, metric.agent_name, metric.tenant_id)
+        estimator = self.trend_estimators.get(key)
+        if estimator is None:
+            estimator = self.trend_estimators[key] = OnlineTrendEstimator()
+        estimator.update(metric.value)
+
+    def get_quantiles(self, metric_type: MetricType = MetricType.LATENCY,
+                      agent_name: Optional[str] = None,
+                      tenant_id: Optional[str] = None) -> Dict[str, Optional[float]]:
+        """Get p50/p90/p95/p99 for a metric type, optionally per agent and tenant."""
+        sketches = [
+            sketch for (sketch_type, sketch_agent, sketch_tenant), sketch in self.quantile_sketches.items()
+            if sketch_type == metric_type
+            and (agent_name is None or sketch_agent == agent_name)
+            and (tenant_id is None or sketch_tenant == tenant_id)
+        ]
+        return QuantileSketch.merged(sketches).quantiles()
+
+    def export_quantile_sketches(self) -> List[Dict[str, Any]]:
+        """Export sketches in a JSON-serializable form for fleet-wide merging."""
+        return [
+            {
+                "metric_type": metric_type.value,
+                "agent_name": agent_name,
+                "tenant_id": tenant_id,
+                "sketch": sketch.to_dict()
+            }
+            for (metric_type, agent_name, tenant_id), sketch in self.quantile_sketches.items()
+        ]
+
+    def merge_quantile_sketches(self, exported: List[Dict[str, Any]]) -> None:
+        """Merge sketches exported by another worker into this system."""
+        for entry in exported:
+            key = (MetricType(entry["metric_type"]),
+                   entry["agent_name"], entry["tenant_id"])
+            incoming = QuantileSketch.from_dict(entry["sketch"])
+            if key in self.quantile_sketches:
+                self.quantile_sketches[key].merge(incoming)
+            else:
+                self.quantile_sketches[key] = incoming
+
     def _find_sla_target(self, metric_type: MetricType) -> Optional[SLATarget]:
         """Find applicable SLA target for metric type."""
         for target in self.sla_targets:
@@ -210,27 +1207,53 @@ class ProductionMonitoringSystem:
 
     def _create_sla_violation_alert(self, metric: ProductionMetric, sla_target: SLATarget):
         """Create alert for SLA violation."""
-        self.alert_counter += 1
-
         # Determine severity based on how much threshold is exceeded
         severity = self._calculate_alert_severity(metric, sla_target)
 
+        # Group repeats into one incident; suppressed repeats stop here
+        incident, reason = self.alert_grouper.observe(
+            (sla_target.name, metric.agent_name, metric.tenant_id, severity))
+        if reason is None:
+            return
+
+        self.alert_counter += 1
+        description = f"{metric.metric_type.value} value {metric.value} violates SLA target {sla_target.target_value}"
+        title = f"SLA Violation: {sla_target.name}"
+        escalated = reason == "escalated"
+
+        if escalated:
+            # Escalations go out one severity level higher
+            severity = SEVERITY_ORDER[min(SEVERITY_ORDER.index(
+                severity) + 1, len(SEVERITY_ORDER) - 1)]
+            title = f"ESCALATED ({incident.occurrences} occurrences) - {title}"
+        if reason != "opened" and incident.suppressed_since_notification:
+            description += f" ({incident.suppressed_since_notification} similar alerts suppressed)"
+        incident.suppressed_since_notification = 0
+
         alert = ProductionAlert(
             alert_id=f"alert_{int(time.time())}_{self.alert_counter}",
             severity=severity,
-            title=f"SLA Violation: {sla_target.name}",
-            description=f"{metric.metric_type.value} value {metric.value} violates SLA target {sla_target.target_value}",
+            title=title,
+            description=description,
             timestamp=datetime.now(),
             tenant_id=metric.tenant_id,
             agent_name=metric.agent_name,
-            metric_values={metric.metric_type.value: metric.value}
+            metric_values={metric.metric_type.value: metric.value,
+                           "sla_target": sla_target.target_value,
+                           "occurrences": incident.occurrences},
+            escalated=escalated
         )
 
+        incident.latest_alert = alert
         self.alerts.append(alert)
 
-        print(f"🚨 [SLA VIOLATION {severity.value.upper()}] {alert.title}")
-        print(
-            f"   Agent: {metric.agent_name}, Value: {metric.value}, Threshold: {sla_target.target_value}")
+        # Delivery (printing, files, webhooks) happens on the dispatcher's
+        # background task so SLA breaches never add latency to agent runs
+        self.alert_dispatcher.submit(alert)
+
+    async def flush_alerts(self) -> None:
+        """Wait for queued alerts to reach every sink."""
+        await self.alert_dispatcher.drain()
 
     def _calculate_alert_severity(self, metric: ProductionMetric, sla_target: SLATarget) -> SeverityLevel:
         """Calculate alert severity based on SLA violation magnitude."""
@@ -259,18 +1282,20 @@ class ProductionMonitoringSystem:
         """Generate SLA compliance report."""
         since = datetime.now() - timedelta(hours=time_window_hours)
 
-        # Filter metrics
-        filtered_metrics = [
-            m for m in self.metrics
-            if m.timestamp >= since and (tenant_id is None or m.tenant_id == tenant_id)
-        ]
+        # Aggregate each metric type from the store's pre-bucketed data
+        summaries = {
+            metric_type: self.metric_store.summarize(
+                metric_type, since, tenant_id)
+            for metric_type in MetricType
+        }
 
         compliance_report = {
             "report_generated_at": datetime.now().isoformat(),
             "time_window_hours": time_window_hours,
             "tenant_id": tenant_id,
-            "total_metrics": len(filtered_metrics),
+            "total_metrics": sum(summary.count for summary in summaries.values()),
             "sla_targets": {},
+            "sla_windows": self.get_sla_window_status(tenant_id),
             "overall_compliance": {}
         }
 
@@ -279,23 +1304,19 @@ class ProductionMonitoringSystem:
             if not sla_target.enabled:
                 continue
 
-            target_metrics = [
-                m for m in filtered_metrics
-                if m.metric_type == sla_target.metric_type
-            ]
+            summary = summaries[sla_target.metric_type]
 
-            if not target_metrics:
+            if not summary.count:
                 continue
 
-            violations = [m for m in target_metrics if m.is_sla_violation]
-            violation_rate = (len(violations) / len(target_metrics)) * 100
+            violation_rate = (summary.violations / summary.count) * 100
             compliance_rate = 100 - violation_rate
 
             compliance_report["sla_targets"][sla_target.name] = {
                 "metric_type": sla_target.metric_type.value,
                 "target_value": sla_target.target_value,
-                "total_measurements": len(target_metrics),
-                "violations": len(violations),
+                "total_measurements": summary.count,
+                "violations": summary.violations,
                 "violation_rate_percent": violation_rate,
                 "compliance_rate_percent": compliance_rate,
                 "meets_sla": compliance_rate >= sla_target.violation_threshold_percent
@@ -310,66 +1331,276 @@ class ProductionMonitoringSystem:
         compliance_report["overall_compliance"] = {
             "all_slas_met": all_sla_met,
             "total_alerts": len([a for a in self.alerts if a.timestamp >= since]),
-            "critical_alerts": len([a for a in self.alerts if a.timestamp >= since and a.severity == SeverityLevel.CRITICAL])
+            "critical_alerts": len([a for a in self.alerts if a.timestamp >= since and a.severity == SeverityLevel.CRITICAL]),
+            "open_incidents": len(self.alert_grouper.open_incidents),
+            "suppressed_alerts": self.alert_grouper.stats["suppressed"]
         }
 
         return compliance_report
 
     def get_performance_trends(self, time_window_hours: int = 24) -> Dict[str, Any]:
-        """Get performance trends over time window."""
+        """Get performance trends over time window.
+
+        Count, average, min, max and latest are limited to the window.
+        Quantiles come from the streaming sketches, which cover every recorded
+        sample including any merged in from other workers, so they are
+        reported apart under `lifetime_quantiles` rather than next to the
+        windowed figures. Trends come from one online estimator per agent and
+        tenant, which weights recent samples most heavily; they are not
+        limited to the window either, as `trend_scope` says in the report.
+        """
         since = datetime.now() - timedelta(hours=time_window_hours)
 
-        filtered_metrics = [m for m in self.metrics if m.timestamp >= since]
-
         trends = {}
 
         for metric_type in MetricType:
-            type_metrics = [
-                m for m in filtered_metrics if m.metric_type == metric_type]
+            summary = self.metric_store.summarize(metric_type, since)
 
-            if not type_metrics:
+            if not summary.count:
                 continue
 
-            values = [m.value for m in type_metrics]
-
             trends[metric_type.value] = {
-                "count": len(values),
-                "average": sum(values) / len(values),
-                "min": min(values),
-                "max": max(values),
-                "latest": values[-1] if values else 0,
-                "trend": self._calculate_trend(values)
+                "count": summary.count,
+                "average": summary.average,
+                "min": summary.minimum,
+                "max": summary.maximum,
+                "latest": summary.latest,
+                "series_trends": self._series_trends(metric_type)
             }
 
         return {
             "time_window_hours": time_window_hours,
             "trends": trends,
+            "trend_scope": "per agent and tenant, over all samples (recent ones weighted most), "
+                           "not limited to the time window",
+            "lifetime_quantiles": {metric_name: self.get_quantiles(MetricType(metric_name))
+                                   for metric_name in trends},
             "generated_at": datetime.now().isoformat()
         }
 
-    def _calculate_trend(self, values: List[float]) -> str:
-        """Calculate trend direction from values."""
-        if len(values) < 2:
-            return "insufficient_data"
+    def _series_trends(self, metric_type: MetricType) -> List[Dict[str, Any]]:
+        """Trend label plus EWMA, slope and change-point state for each agent and tenant."""
+        return [
+            {
+                "agent_name": agent_name,
+                "tenant_id": tenant_id,
+                "trend": estimator.trend(threshold=5.0),
+                **estimator.snapshot()
+            }
+            for (estimator_type, agent_name, tenant_id), estimator in self.trend_estimators.items()
+            if estimator_type == metric_type
+        ]
+
+
+# ================================
+# 7. OpenMetrics Exposition
+# ================================
 
-        # Simple trend calculation - compare first and second half
-        mid = len(values) // 2
-        first_half_avg = sum(values[:mid]) / mid if mid > 0 else 0
-        second_half_avg = sum(values[mid:]) / (len(values) - mid)
+def _escape_label_value(value: str) -> str:
+    """Escape a label value for the OpenMetrics text format."""
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
 
-        change_percent = ((second_half_avg - first_half_avg) /
-                          first_half_avg * 100) if first_half_avg > 0 else 0
 
-        if change_percent > 5:
-            return "increasing"
-        elif change_percent < -5:
-            return "decreasing"
-        else:
-            return "stable"
+def _format_labels(labels: Dict[str, Optional[str]]) -> str:
+    """Render a label set, dropping labels without a value."""
+    pairs = [f'{name}="{_escape_label_value(str(value))}"'
+             for name, value in labels.items() if value is not None]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    """Render a sample value, including the special float values."""
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class OpenMetricsExporter:
+    """Serves ProductionMonitoringSystem state in the OpenMetrics text format.
+
+    Every sample is read from pre-aggregated state (lifetime series totals,
+    histograms, sketches, SLA windows and counters), so a scrape costs
+    O(series) no matter how many metrics were recorded. The HTTP endpoint is
+    optional: call `render()` directly to push the text somewhere else.
+    """
+
+    CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+    PREFIX = "agent"
+
+    def __init__(self, monitoring_system: ProductionMonitoringSystem,
+                 host: str = "127.0.0.1", port: int = 9464, path: str = "/metrics",
+                 request_timeout: float = 5.0):
+        self.monitoring_system = monitoring_system
+        self.host = host
+        self.port = port
+        self.path = path
+        self.request_timeout = request_timeout
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.scrapes = 0
+
+    # Rendering ---------------------------------------------------------
+
+    def _family(self, lines: List[str], name: str, metric_type: str, help_text: str,
+                unit: Optional[str] = None) -> str:
+        """Write a metric family header and return its full name."""
+        family = f"{self.PREFIX}_{name}"
+        lines.append(f"# TYPE {family} {metric_type}")
+        if unit:
+            lines.append(f"# UNIT {family} {unit}")
+        lines.append(f"# HELP {family} {help_text}")
+        return family
+
+    def _histogram(self, lines: List[str], family: str, labels: Dict[str, Optional[str]],
+                   histogram: FixedBucketHistogram) -> None:
+        """Write the bucket, count and sum samples of one histogram."""
+        for bound, count in histogram.cumulative():
+            bucket_labels = _format_labels(
+                {**labels, "le": _format_value(float(bound))})
+            lines.append(f"{family}_bucket{bucket_labels} {count}")
+        lines.append(
+            f"{family}_count{_format_labels(labels)} {histogram.count}")
+        lines.append(
+            f"{family}_sum{_format_labels(labels)} {_format_value(histogram.total)}")
+
+    def render(self) -> str:
+        """Render every metric family, terminated by # EOF."""
+        system = self.monitoring_system
+        lines: List[str] = []
+
+        family = self._family(lines, "metric_samples", "counter",
+                              "Metrics recorded per type, agent and tenant.")
+        for (metric_type, agent_name, tenant_id), totals in system.series_totals.items():
+            labels = _format_labels(
+                {"metric": metric_type.value, "agent": agent_name, "tenant": tenant_id})
+            lines.append(f"{family}_total{labels} {totals.count}")
+
+        family = self._family(lines, "sla_violations", "counter",
+                              "Metrics that violated their SLA target.")
+        for (metric_type, agent_name, tenant_id), totals in system.series_totals.items():
+            labels = _format_labels(
+                {"metric": metric_type.value, "agent": agent_name, "tenant": tenant_id})
+            lines.append(f"{family}_total{labels} {totals.violations}")
+
+        family = self._family(lines, "metric_last", "gauge",
+                              "Most recent value per metric type, agent and tenant.")
+        for (metric_type, agent_name, tenant_id), totals in system.series_totals.items():
+            labels = _format_labels(
+                {"metric": metric_type.value, "agent": agent_name, "tenant": tenant_id})
+            lines.append(f"{family}{labels} {_format_value(totals.latest)}")
+
+        family = self._family(lines, "error_rate_percent", "gauge",
+                              "Mean tool error rate per agent and tenant.")
+        for (metric_type, agent_name, tenant_id), totals in system.series_totals.items():
+            if metric_type == MetricType.ERROR_RATE:
+                labels = _format_labels(
+                    {"agent": agent_name, "tenant": tenant_id})
+                lines.append(
+                    f"{family}{labels} {_format_value(totals.average)}")
+
+        family = self._family(lines, "latency_seconds", "histogram",
+                              "Agent run latency.", unit="seconds")
+        for (agent_name, tenant_id), histogram in system.latency_histograms.items():
+            self._histogram(
+                lines, family, {"agent": agent_name, "tenant": tenant_id}, histogram)
+
+        family = self._family(lines, "latency_quantile_seconds", "gauge",
+                              "Agent run latency quantiles from streaming sketches.", unit="seconds")
+        for (metric_type, agent_name, tenant_id), sketch in system.quantile_sketches.items():
+            if metric_type != MetricType.LATENCY:
+                continue
+            for quantile in QuantileSketch.DEFAULT_QUANTILES:
+                labels = _format_labels({"agent": agent_name, "tenant": tenant_id,
+                                         "quantile": str(quantile)})
+                lines.append(
+                    f"{family}{labels} {_format_value(sketch.quantile(quantile))}")
+
+        family = self._family(lines, "tool_duration_seconds", "histogram",
+                              "Tool call duration.", unit="seconds")
+        for (tool_name, agent_name, tenant_id), histogram in system.tool_duration_histograms.items():
+            self._histogram(lines, family, {"tool": tool_name, "agent": agent_name,
+                                            "tenant": tenant_id}, histogram)
+
+        family = self._family(lines, "handoffs", "counter",
+                              "Handoffs between agents.")
+        for (from_agent, to_agent, tenant_id), count in system.handoff_counts.items():
+            labels = _format_labels(
+                {"from_agent": from_agent, "to_agent": to_agent, "tenant": tenant_id})
+            lines.append(f"{family}_total{labels} {count}")
+
+        family = self._family(lines, "sla_compliance_ratio", "gauge",
+                              "Fraction of measurements meeting each SLA over its sliding window.")
+        for (sla_name, tenant_id), evaluator in system.sla_windows.items():
+            status = evaluator.get_status()
+            labels = _format_labels({"sla": sla_name, "tenant": tenant_id})
+            lines.append(
+                f"{family}{labels} {_format_value(status['compliance_rate_percent'] / 100)}")
+
+        family = self._family(lines, "alerts", "counter",
+                              "Alert pipeline counters by stage.")
+        dispatcher_stats = system.alert_dispatcher.stats
+        grouper_stats = system.alert_grouper.stats
+        for stage, count in (("submitted", dispatcher_stats["submitted"]),
+                             ("delivered", dispatcher_stats["delivered"]),
+                             ("dropped", dispatcher_stats["dropped"]),
+                             ("evicted", dispatcher_stats["evicted"]),
+                             ("suppressed", grouper_stats["suppressed"])):
+            lines.append(f"{family}_total{_format_labels({'stage': stage})} {count}")
+
+        family = self._family(lines, "open_incidents", "gauge",
+                              "Alert incidents currently open.")
+        lines.append(f"{family} {len(system.alert_grouper.open_incidents)}")
+
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    # HTTP endpoint -----------------------------------------------------
+
+    async def start(self) -> None:
+        """Start serving on host:port (port 0 picks a free port)."""
+        self.server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        """Stop accepting scrapes."""
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Answer one HTTP/1.1 request and close the connection."""
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), self.request_timeout)
+            # Skip the request headers
+            while True:
+                header = await asyncio.wait_for(reader.readline(), self.request_timeout)
+                if header in (b"\r\n", b"\n", b""):
+                    break
+
+            method, target, _ = request_line.decode("latin-1").split(" ", 2)
+            if method != "GET":
+                status, content_type, body = "405 Method Not Allowed", "text/plain", "Method not allowed\n"
+            elif target.split("?", 1)[0] != self.path:
+                status, content_type, body = "404 Not Found", "text/plain", "Not found\n"
+            else:
+                self.scrapes += 1
+                status, content_type, body = "200 OK", self.CONTENT_TYPE, self.render()
+
+            payload = body.encode("utf-8")
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+                f"Content-Length: {len(payload)}\r\nConnection: close\r\n\r\n".encode("latin-1") + payload)
+            await writer.drain()
+        except (asyncio.TimeoutError, ValueError, ConnectionError):
+            pass
+        finally:
+            writer.close()
 
 
 # ================================
-# 3. Production RunHooks
+# 8. Production RunHooks
 # ================================
 
 class ProductionRunHooks(RunHooks):
@@ -381,6 +1612,9 @@ class ProductionRunHooks(RunHooks):
         self.session_id = f"session_{int(time.time())}"
         self.session_start = datetime.now()
         self.agent_timings: Dict[str, float] = {}
+        # Start times of in-flight tool calls, FIFO per (run, agent, tool)
+        self.tool_starts: Dict[Tuple[int, str, str],
+                               Deque[float]] = defaultdict(deque)
         self.total_tools_used = 0
         self.total_handoffs = 0
 
@@ -433,6 +1667,8 @@ class ProductionRunHooks(RunHooks):
     async def on_handoff(self, context: Any, from_agent: Agent, to_agent: Agent) -> None:
         """Track handoff performance metrics."""
         self.total_handoffs += 1
+        self.monitoring_system.record_handoff(
+            from_agent.name, to_agent.name, self.tenant_id)
 
         # Record handoff as throughput metric
         self.monitoring_system.record_metric(
@@ -450,12 +1686,22 @@ class ProductionRunHooks(RunHooks):
     async def on_tool_start(self, context: Any, agent: Agent, tool) -> None:
         """Track tool usage metrics."""
         self.total_tools_used += 1
+        self.tool_starts[(id(context), agent.name, tool.name)].append(
+            time.perf_counter())
 
         print(
             f"📊 [PRODUCTION] Tool {tool.name} started by {agent.name} (total tools: {self.total_tools_used})")
 
     async def on_tool_end(self, context: Any, agent: Agent, tool, result: str) -> None:
         """Track tool completion metrics."""
+        key = (id(context), agent.name, tool.name)
+        starts = self.tool_starts.get(key)
+        if starts:
+            self.monitoring_system.record_tool_duration(
+                tool.name, time.perf_counter() - starts.popleft(), agent.name, self.tenant_id)
+            if not starts:
+                del self.tool_starts[key]
+
         # Assess tool success rate
         success_rate = 95.0 if "error" not in result.lower() else 5.0
 
@@ -525,7 +1771,7 @@ class ProductionRunHooks(RunHooks):
 
 
 # ================================
-# 4. Production AgentHooks
+# 9. Production AgentHooks
 # ================================
 
 class ProductionAgentHooks(AgentHooks):
@@ -539,6 +1785,9 @@ class ProductionAgentHooks(AgentHooks):
         self.tool_usage_count = 0
         self.average_latency = 0.0
         self.performance_scores: List[float] = []
+        self.performance_total = 0.0
+        # Effective window of ~10 scores, so recent runs dominate the trend
+        self.performance_trend = OnlineTrendEstimator(decay=0.9)
 
     async def on_start(self, context: Any, agent: Agent) -> None:
         """Track agent-specific start metrics."""
@@ -563,9 +1812,11 @@ class ProductionAgentHooks(AgentHooks):
         # Calculate agent-specific quality score
         quality_score = self._calculate_agent_quality(output)
         self.performance_scores.append(quality_score)
+        self.performance_total += quality_score
+        self.performance_trend.update(quality_score)
 
         # Update average performance
-        avg_performance = sum(self.performance_scores) / \
+        avg_performance = self.performance_total / \
             len(self.performance_scores)
 
         print(
@@ -615,37 +1866,25 @@ class ProductionAgentHooks(AgentHooks):
             "total_activations": self.activation_count,
             "total_tool_usage": self.tool_usage_count,
             "performance_scores": self.performance_scores,
-            "average_performance": sum(self.performance_scores) / len(self.performance_scores) if self.performance_scores else 0,
-            "performance_trend": self._calculate_performance_trend()
+            "average_performance": self.performance_total / len(self.performance_scores) if self.performance_scores else 0,
+            "performance_trend": self._calculate_performance_trend(),
+            "performance_trend_details": self.performance_trend.snapshot()
         }
 
     def _calculate_performance_trend(self) -> str:
         """Calculate agent performance trend."""
-        if len(self.performance_scores) < 3:
+        samples = self.performance_trend.samples
+        if samples < 3:
             return "insufficient_data"
-
-        recent_scores = self.performance_scores[-3:]
-        older_scores = self.performance_scores[:-
-                                               3] if len(self.performance_scores) > 3 else []
-
-        if not older_scores:
+        if samples == 3:
             return "new_agent"
 
-        recent_avg = sum(recent_scores) / len(recent_scores)
-        older_avg = sum(older_scores) / len(older_scores)
-
-        change = ((recent_avg - older_avg) / older_avg) * 100
-
-        if change > 10:
-            return "improving"
-        elif change < -10:
-            return "declining"
-        else:
-            return "stable"
+        trend = self.performance_trend.trend(threshold=10.0)
+        return {"increasing": "improving", "decreasing": "declining"}.get(trend, trend)
 
 
 # ================================
-# 5. Demo Tools and Agents
+# 10. Demo Tools and Agents
 # ================================
 
 @function_tool
@@ -697,7 +1936,7 @@ def create_customer_service_agent(monitoring_system: ProductionMonitoringSystem,
 
 
 # ================================
-# 6. Demo Functions
+# 11. Demo Functions
 # ================================
 
 async def demo_production_monitoring():
@@ -760,6 +1999,9 @@ async def demo_production_monitoring():
             # Brief pause between requests
             await asyncio.sleep(0.3)
 
+        # Let queued alerts reach their sinks before summarizing
+        await monitoring_system.flush_alerts()
+
         # Get session summary
         session_summary = production_hooks.get_session_summary()
         print(f"\n  📋 Session Summary for {tenant_id}:")
@@ -773,8 +2015,9 @@ async def demo_sla_compliance_reporting():
     """Demonstrate SLA compliance monitoring and reporting."""
     print("\n=== SLA Compliance Reporting Demo ===")
 
-    # Create monitoring system (already has data from previous demo)
-    monitoring_system = ProductionMonitoringSystem()
+    # Reports come from NumPy column reductions when NumPy is installed
+    monitoring_system = ProductionMonitoringSystem(columnar_metrics=np is not None)
+    print(f"Metric store: {type(monitoring_system.metric_store).__name__}")
 
     # Simulate some additional metrics to test SLA violations
     print("Simulating various performance scenarios...")
@@ -793,6 +2036,9 @@ async def demo_sla_compliance_reporting():
         monitoring_system.record_metric(
             MetricType.ERROR_RATE, 10.0, "SlowAgent", "tenant_b")  # Violates 1% SLA
 
+    # Alerts are delivered in the background; wait for them before reporting
+    await monitoring_system.flush_alerts()
+
     # Generate compliance reports
     for tenant_id in ["tenant_a", "tenant_b", "overall"]:
         print(f"\n--- SLA Compliance Report for {tenant_id} ---")
@@ -820,6 +2066,12 @@ async def demo_sla_compliance_reporting():
             print(
                 f"      Violations: {sla_data['violations']}/{sla_data['total_measurements']}")
 
+        print("  Sliding SLA Windows (live):")
+        for sla_name, window in report['sla_windows'].items():
+            status = "✅ PASS" if window['meets_sla'] else "❌ FAIL"
+            print(
+                f"    {sla_name} (last {window['time_window_minutes']}m): {status} - {window['compliance_rate_percent']:.1f}%")
+
 
 async def demo_performance_trends_analysis():
     """Demonstrate performance trends and capacity planning."""
@@ -849,6 +2101,8 @@ async def demo_performance_trends_analysis():
         monitoring_system.record_metric(
             MetricType.ERROR_RATE, error_rate, "StableAgent")
 
+    await monitoring_system.flush_alerts()
+
     # Generate trends report
     trends_report = monitoring_system.get_performance_trends(
         time_window_hours=1)
@@ -856,6 +2110,7 @@ async def demo_performance_trends_analysis():
     print(f"\n📈 Performance Trends Report:")
     print(f"  Time Window: {trends_report['time_window_hours']} hours")
     print(f"  Generated At: {trends_report['generated_at']}")
+    print(f"  Trend scope: {trends_report['trend_scope']}")
 
     for metric_name, trend_data in trends_report['trends'].items():
         print(f"\n  {metric_name.upper()}:")
@@ -863,22 +2118,271 @@ async def demo_performance_trends_analysis():
         print(f"    Average: {trend_data['average']:.2f}")
         print(f"    Range: {trend_data['min']:.2f} - {trend_data['max']:.2f}")
         print(f"    Latest: {trend_data['latest']:.2f}")
-        print(f"    Trend: {trend_data['trend'].upper()}")
+        quantiles = trends_report['lifetime_quantiles'][metric_name]
+        print(
+            f"    p50/p99 (all time): {quantiles['p50']:.2f} / {quantiles['p99']:.2f}")
 
-        # Provide recommendations based on trends
-        if trend_data['trend'] == 'increasing' and metric_name in ['latency', 'error_rate']:
-            print(
-                f"    🚨 RECOMMENDATION: {metric_name} is increasing - investigate and optimize")
-        elif trend_data['trend'] == 'decreasing' and metric_name in ['quality_score', 'availability']:
-            print(
-                f"    🚨 RECOMMENDATION: {metric_name} is decreasing - immediate attention required")
-        elif trend_data['trend'] == 'improving':
+        for series in trend_data['series_trends']:
+            trend = series['trend']
+            print(f"    Trend for {series['agent_name']}: {trend.upper()}")
             print(
-                f"    ✅ GOOD: {metric_name} is improving - continue current optimizations")
+                f"      EWMA: {series['ewma']:.2f}, Slope: {series['slope']:+.3f}/sample, Change points: {series['change_points']}")
+
+            # Provide recommendations based on trends
+            if trend == 'increasing' and metric_name in ['latency', 'error_rate']:
+                print(
+                    f"      🚨 RECOMMENDATION: {metric_name} is increasing - investigate and optimize")
+            elif trend == 'decreasing' and metric_name in ['quality_score', 'availability']:
+                print(
+                    f"      🚨 RECOMMENDATION: {metric_name} is decreasing - immediate attention required")
+            elif trend == 'improving':
+                print(
+                    f"      ✅ GOOD: {metric_name} is improving - continue current optimizations")
+
+
+async def demo_fleet_latency_quantiles():
+    """Demonstrate per-worker latency sketches merged into a fleet-wide view."""
+    print("\n=== Fleet Latency Quantiles Demo ===")
+
+    rng = random.Random(42)
+    workers = [ProductionMonitoringSystem() for _ in range(3)]
+
+    # Simulate latency samples on each worker process (SLA alerting disabled
+    # so the demo output stays readable)
+    for worker_index, worker in enumerate(workers):
+        worker.sla_targets = []
+        for _ in range(2000):
+            agent_name = rng.choice(["PaymentAgent", "CustomerServiceAgent"])
+            latency = rng.lognormvariate(-0.5 + worker_index * 0.2, 0.6)
+            worker.record_metric(MetricType.LATENCY,
+                                 latency, agent_name, "tenant_a")
+
+    # Ship sketches to a central aggregator and merge them
+    fleet = ProductionMonitoringSystem()
+    for worker in workers:
+        fleet.merge_quantile_sketches(
+            json.loads(json.dumps(worker.export_quantile_sketches())))
+
+    for index, worker in enumerate(workers, 1):
+        quantiles = worker.get_quantiles(MetricType.LATENCY)
+        print(f"  Worker {index}: " + ", ".join(
+            f"{name}={value:.3f}s" for name, value in quantiles.items()))
+
+    print("\n  🌐 Fleet-wide latency:")
+    for agent_name in ["PaymentAgent", "CustomerServiceAgent", None]:
+        quantiles = fleet.get_quantiles(
+            MetricType.LATENCY, agent_name=agent_name)
+        label = agent_name or "All agents"
+        print(f"    {label}: " + ", ".join(
+            f"{name}={value:.3f}s" for name, value in quantiles.items()))
+
+
+async def demo_async_alert_dispatch():
+    """Demonstrate alert delivery off the hook hot path."""
+    print("\n=== Async Alert Dispatch Demo ===")
+
+    alert_log_path = os.path.join(tempfile.gettempdir(), "production_alerts.jsonl")
+    webhook_sink = WebhookAlertSink(
+        "https://hooks.example.com/oncall", latency_seconds=0.2)
+    dispatcher = AlertDispatcher(
+        sinks=[FileAlertSink(alert_log_path), webhook_sink],
+        max_queue_size=100,
+        batch_size=25,
+        overflow_policy=OverflowPolicy.DROP_OLDEST
+    )
+    # Deduplication is switched off here to show raw dispatch behaviour
+    monitoring_system = ProductionMonitoringSystem(
+        alert_dispatcher=dispatcher,
+        alert_grouper=AlertGrouper(
+            suppression_window_seconds=0, escalation_thresholds=())
+    )
+
+    # Alert storm: every sample violates the latency SLA
+    start = time.perf_counter()
+    for i in range(500):
+        monitoring_system.record_metric(
+            MetricType.LATENCY, 4.0 + (i % 10) * 0.1, "SlowAgent", "tenant_b")
+    record_seconds = time.perf_counter() - start
+
+    print(
+        f"  Recorded 500 violating metrics in {record_seconds * 1000:.1f}ms (no sink latency on the hot path)")
+    print(f"  Queue right after the burst: {dispatcher.get_stats()}")
+
+    await dispatcher.stop()
+
+    stats = dispatcher.get_stats()
+    print(f"  After draining: {stats}")
+    print(f"  Webhook POSTs: {len(webhook_sink.requests)} (batched)")
+    print(f"  Alert log: {alert_log_path}")
+
+
+async def demo_alert_storm_deduplication():
+    """Demonstrate incident grouping, suppression and escalation."""
+    print("\n=== Alert Storm Deduplication Demo ===")
+
+    monitoring_system = ProductionMonitoringSystem(
+        alert_grouper=AlertGrouper(
+            suppression_window_seconds=60, escalation_thresholds=(10, 100, 1000))
+    )
+
+    # Latency incident: 1,500 slow runs across two agents
+    for i in range(1500):
+        agent_name = "PaymentAgent" if i % 3 else "CustomerServiceAgent"
+        monitoring_system.record_metric(
+            MetricType.LATENCY, 5.0, agent_name, "tenant_b")
+
+    await monitoring_system.flush_alerts()
+
+    print(f"\n  Deduplication: {monitoring_system.alert_grouper.get_stats()}")
+    print(f"  Alerts delivered: {len(monitoring_system.alerts)} (of 1500 violations)")
+
+    incident = monitoring_system.alert_grouper.get_incident(
+        "Response Time SLA", "PaymentAgent", "tenant_b", SeverityLevel.CRITICAL)
+    if incident:
+        print(
+            f"  Open incident for PaymentAgent: {incident.occurrences} occurrences, escalation level {incident.escalation_level}")
+
+
+async def demo_journal_replay():
+    """Demonstrate rebuilding monitoring state from the metric journal after a restart."""
+    print("\n=== Metric Journal Replay Demo ===")
+
+    journal_dir = tempfile.mkdtemp(prefix="production_journal_")
+    journal = LifecycleJournal(journal_dir)
+    monitoring_system = ProductionMonitoringSystem(
+        alert_dispatcher=AlertDispatcher(sinks=[]), journal=journal)
+
+    print("Recording 5,000 metrics with journaling enabled...")
+    rng = random.Random(42)
+    for i in range(5000):
+        tenant_id = "tenant_a" if i % 2 else "tenant_b"
+        monitoring_system.record_metric(
+            MetricType.LATENCY, rng.lognormvariate(0.3, 0.4), "PaymentAgent", tenant_id)
+        monitoring_system.record_metric(
+            MetricType.QUALITY_SCORE, rng.uniform(70, 100), "PaymentAgent", tenant_id)
+    await monitoring_system.flush_alerts()
+    journal.close()
+    print(f"  Journal: {journal.get_stats()}")
+
+    # Simulate a restart: a fresh system rebuilt only from the journal
+    start = time.perf_counter()
+    restored_system = ProductionMonitoringSystem(
+        alert_dispatcher=AlertDispatcher(sinks=[]))
+    restored = restored_system.restore_from_journal(journal_dir)
+    elapsed = time.perf_counter() - start
+    print(f"  Restored {restored} metrics in {elapsed * 1000:.1f} ms")
+
+    before = monitoring_system.get_sla_window_status()["Response Time SLA"]
+    after = restored_system.get_sla_window_status()["Response Time SLA"]
+    print(
+        f"  Response Time SLA before restart: {before['compliance_rate_percent']:.2f}%, after replay: {after['compliance_rate_percent']:.2f}%")
+    print(
+        f"  Latency p99 before: {monitoring_system.get_quantiles()['p99']:.3f}s, after: {restored_system.get_quantiles()['p99']:.3f}s")
+
+
+async def _scrape(host: str, port: int, path: str = "/metrics") -> Tuple[str, Dict[str, str], str]:
+    """Minimal HTTP GET used by the exposition demo (status line, headers, body)."""
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(
+        f"GET {path} HTTP/1.1\r\nHost: {host}\r\nAccept: application/openmetrics-text\r\n\r\n".encode())
+    await writer.drain()
+    response = (await reader.read()).decode("utf-8")
+    writer.close()
+    await writer.wait_closed()
+
+    head, _, body = response.partition("\r\n\r\n")
+    status_line, *header_lines = head.split("\r\n")
+    headers = dict(line.split(": ", 1) for line in header_lines)
+    return status_line, headers, body
+
+
+def _validate_openmetrics(text: str) -> List[str]:
+    """Check the structural rules a Prometheus/OpenMetrics scraper relies on."""
+    problems = []
+    families: Dict[str, str] = {}
+    buckets: Dict[Tuple[str, str], List[int]] = defaultdict(list)
+    counts: Dict[Tuple[str, str], int] = {}
+
+    lines = text.rstrip("\n").split("\n")
+    if lines[-1] != "# EOF":
+        problems.append("missing trailing # EOF")
+
+    for line in lines[:-1]:
+        if line.startswith("# TYPE "):
+            _, _, family, metric_type = line.split(" ")
+            families[family] = metric_type
+            continue
+        if line.startswith("#"):
+            continue
+
+        name_and_labels, value = line.rsplit(" ", 1)
+        name, _, labels = name_and_labels.partition("{")
+        family = next((f for f in families if name == f or name.startswith(f + "_")), None)
+        if family is None:
+            problems.append(f"sample without TYPE: {name}")
+            continue
+        if families[family] == "counter" and not name.endswith("_total"):
+            problems.append(f"counter sample without _total: {name}")
+        float(value)  # Raises on malformed values
+
+        # Histogram series keyed by family plus labels other than le
+        if families[family] == "histogram":
+            series_labels = labels.rstrip("}").split("le=")[0].rstrip(",")
+            if name.endswith("_bucket"):
+                buckets[(family, series_labels)].append(int(value))
+            elif name.endswith("_count"):
+                counts[(family, series_labels)] = int(value)
+
+    for series, series_buckets in buckets.items():
+        if series_buckets != sorted(series_buckets):
+            problems.append(f"non-cumulative buckets: {series}")
+        if counts.get(series) != series_buckets[-1]:
+            problems.append(f"+Inf bucket does not match _count: {series}")
+
+    return problems
+
+
+async def demo_openmetrics_endpoint():
+    """Demonstrate scraping pre-aggregated metrics over the OpenMetrics endpoint."""
+    print("\n=== OpenMetrics Exposition Demo ===")
+
+    monitoring_system = ProductionMonitoringSystem(
+        alert_dispatcher=AlertDispatcher(sinks=[]))
+    rng = random.Random(3)
+    for i in range(2000):
+        tenant_id = "tenant_a" if i % 2 else "tenant_b"
+        monitoring_system.record_metric(
+            MetricType.LATENCY, rng.lognormvariate(0.0, 0.6), "PaymentAgent", tenant_id)
+        monitoring_system.record_metric(
+            MetricType.ERROR_RATE, 5.0 if i % 10 else 95.0, "PaymentAgent", tenant_id)
+        monitoring_system.record_tool_duration(
+            "process_payment", rng.uniform(0.01, 0.4), "PaymentAgent", tenant_id)
+    monitoring_system.record_handoff("CustomerServiceAgent", "PaymentAgent", "tenant_a")
+    await monitoring_system.flush_alerts()
+
+    exporter = OpenMetricsExporter(monitoring_system, port=0)
+    await exporter.start()
+    try:
+        start = time.perf_counter()
+        status_line, headers, body = await _scrape(exporter.host, exporter.port)
+        elapsed = time.perf_counter() - start
+        missing_status, _, _ = await _scrape(exporter.host, exporter.port, "/nope")
+    finally:
+        await exporter.stop()
+
+    problems = _validate_openmetrics(body)
+    print(f"  Endpoint: http://{exporter.host}:{exporter.port}{exporter.path}")
+    print(f"  Response: {status_line}, {headers.get('Content-Type')}")
+    print(f"  Scrape: {len(body.splitlines())} lines in {elapsed * 1000:.1f} ms (4,000 metrics recorded)")
+    print(f"  Unknown path: {missing_status}")
+    print(f"  Format check: {'✅ valid' if not problems else problems}")
+    for line in body.splitlines():
+        if line.startswith("agent_latency_seconds_bucket") and 'tenant="tenant_a"' in line:
+            print(f"    {line}")
 
 
 # ================================
-# 7. Main Demo Function
+# 12. Main Demo Function
 # ================================
 
 async def main():
@@ -890,6 +2394,11 @@ async def main():
     await demo_production_monitoring()
     await demo_sla_compliance_reporting()
     await demo_performance_trends_analysis()
+    await demo_fleet_latency_quantiles()
+    await demo_async_alert_dispatch()
+    await demo_alert_storm_deduplication()
+    await demo_journal_replay()
+    await demo_openmetrics_endpoint()
 
     print("\n" + "=" * 60)
     print("✅ Production lifecycle patterns demonstration complete!")
@@ -900,6 +2409,11 @@ async def main():
     print("4. Enterprise-grade observability and reporting")
     print("5. Automated alert generation and escalation")
     print("6. Production-ready performance optimization")
+    print("7. Mergeable tail-latency quantiles across worker processes")
+    print("8. Non-blocking, batched alert delivery to pluggable sinks")
+    print("9. Alert deduplication, suppression windows and escalation")
+    print("10. Crash-safe metric journal with fast startup replay")
+    print("11. OpenMetrics endpoint served from pre-aggregated state")
 
 
 if __name__ == "__main__":
@@ -908,7 +2422,7 @@ if __name__ == "__main__":
 
 
 # ================================
-# 8. Production Implementation Notes
+# 13. Production Implementation Notes
 # ================================
 
 """
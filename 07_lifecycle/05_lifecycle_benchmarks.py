@@ -0,0 +1,921 @@
+"""
+05_lifecycle_benchmarks.py
+
+This script benchmarks the building blocks behind the lifecycle monitoring examples.
+Each benchmark prints one JSON object per line, so results are machine-readable
+and easy to compare between commits.
+
+Benchmarks:
+- columnar: list-of-dataclasses vs NumPy columnar metric storage and reports
+- journal: memory-mapped journal append and replay vs JSON-lines logs
+- events: indexed LifecycleEventBus queries vs full list scans
+- ring: cross-process event fan-out over shared-memory rings vs multiprocessing.Queue,
+  raw frame transport and end-to-end event delivery reported separately
+- codec: binary codec size and speed vs json.dumps(asdict(...))
+- rollups: report aggregates from minute/hour rollups vs raw events
+- hooks: runs/s and latency of agent runs with each hook class, against a fake model
+
+Usage:
+    python 07_lifecycle/05_lifecycle_benchmarks.py columnar --samples 10000000
+    python 07_lifecycle/05_lifecycle_benchmarks.py journal --records 5000000
+    python 07_lifecycle/05_lifecycle_benchmarks.py events --events 1000000
+    python 07_lifecycle/05_lifecycle_benchmarks.py ring --producers 1 4 16
+    python 07_lifecycle/05_lifecycle_benchmarks.py codec --records 100000
+    python 07_lifecycle/05_lifecycle_benchmarks.py rollups --days 3 --events-per-minute 200
+    python 07_lifecycle/05_lifecycle_benchmarks.py hooks --runs 500 --concurrency 1 8
+
+Note: the list-of-dataclasses baseline needs about 470 bytes per sample, so it
+runs at --baseline-samples (1M by default) rather than at --samples; raise it
+only on machines with the RAM for it (10M needs roughly 5 GB).
+
+Based on: https://openai.github.io/openai-agents-python/ref/lifecycle/
+"""
+
+import argparse
+import asyncio
+import contextlib
+import gc
+import importlib
+import json
+import multiprocessing
+import os
+import random
+import shutil
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from agents import Agent, RunConfig, Runner
+from agents.items import ModelResponse
+from agents.models.interface import Model
+from agents.usage import Usage
+from openai.types.responses import (ResponseFunctionToolCall, ResponseOutputMessage,
+                                    ResponseOutputText)
+
+from binary_codec import StreamDecoder, StreamEncoder
+from lifecycle_journal import LifecycleJournal
+from shm_ring import SharedMemoryRing
+
+# Lesson modules start with a digit, so they are loaded through importlib
+production = importlib.import_module("04_production_lifecycle_patterns")
+combined = importlib.import_module("03_combined_lifecycle_patterns")
+run_hooks = importlib.import_module("01_run_lifecycle_hooks")
+agent_hooks = importlib.import_module("02_agent_lifecycle_hooks")
+
+
+# ================================
+# 1. Helpers
+# ================================
+
+def emit(benchmark: str, **fields: Any) -> None:
+    """Print one machine-readable benchmark result."""
+    print(json.dumps({"benchmark": benchmark, **fields}), flush=True)
+
+
+def timed(func: Callable[[], Any]) -> float:
+    """Run `func` once and return elapsed seconds."""
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def bytes_per_item(build: Callable[[int], Any], count: int) -> float:
+    """Measure traced allocation per item for a builder of `count` items."""
+    gc.collect()
+    tracemalloc.start()
+    retained = build(count)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del retained
+    return current / count if count else 0.0
+
+
+# ================================
+# 2. Columnar Metric Storage
+# ================================
+
+TENANTS = ["tenant_a", "tenant_b", "tenant_c"]
+
+
+def _synthetic_latencies(samples: int, seed: int = 7):
+    """Deterministic latency samples spread evenly over the last 24 hours."""
+    rng = random.Random(seed)
+    end = time.time()
+    step = 24 * 3600 / samples
+    for index in range(samples):
+        yield (end - 24 * 3600 + index * step,
+               rng.lognormvariate(0.0, 0.5),
+               TENANTS[index % len(TENANTS)])
+
+
+def _build_list_store(samples: int):
+    """Fill a ListMetricStore the way record_metric creates metric objects."""
+    store = production.ListMetricStore()
+    for index, (timestamp, value, tenant_id) in enumerate(_synthetic_latencies(samples), 1):
+        store.add(production.ProductionMetric(
+            metric_id=f"metric_{int(timestamp)}_{index}",
+            metric_type=production.MetricType.LATENCY,
+            value=value,
+            threshold=2.0,
+            timestamp=datetime.fromtimestamp(timestamp),
+            tenant_id=tenant_id,
+            agent_name="BenchmarkAgent",
+            is_sla_violation=value > 2.0,
+            context={"session_id": "benchmark"}
+        ))
+    return store
+
+
+def _build_columnar_store(samples: int):
+    """Fill a ColumnarMetricStore through its bulk column API."""
+    np = production.np
+    store = production.ColumnarMetricStore(initial_capacity=samples)
+    rng = np.random.default_rng(7)
+    end_ns = time.time_ns()
+    timestamps = np.linspace(end_ns - 24 * 3600 * 10**9,
+                             end_ns, samples, dtype=np.int64)
+    values = rng.lognormal(0.0, 0.5, samples)
+
+    # Interleave tenants in chunks, as batches would arrive from workers
+    chunk = 100_000
+    for start in range(0, samples, chunk):
+        stop = min(start + chunk, samples)
+        store.extend(production.MetricType.LATENCY, values[start:stop], timestamps[start:stop],
+                     values[start:stop] > 2.0,
+                     tenant_id=TENANTS[(start // chunk) % len(TENANTS)],
+                     agent_name="BenchmarkAgent")
+    return store
+
+
+def _report_timings(store) -> Dict[str, float]:
+    """Time the monitoring reports against a populated store."""
+    system = production.ProductionMonitoringSystem(metric_store=store)
+    return {
+        "compliance_24h_seconds": timed(lambda: system.get_sla_compliance_report(24)),
+        "compliance_1h_tenant_seconds": timed(
+            lambda: system.get_sla_compliance_report(1, tenant_id="tenant_b")),
+        "trends_24h_seconds": timed(lambda: system.get_performance_trends(24)),
+    }
+
+
+def bench_columnar(args: argparse.Namespace) -> None:
+    """Compare list-of-dataclasses and columnar storage."""
+    if production.np is None:
+        raise SystemExit("The columnar benchmark requires numpy")
+
+    probe = min(args.samples, 200_000)
+    stores = {"list": _build_list_store, "columnar": _build_columnar_store}
+
+    sizes = {"list": args.baseline_samples, "columnar": args.samples}
+
+    for name, build in stores.items():
+        if name == "list" and args.skip_baseline:
+            continue
+        samples = sizes[name]
+        per_sample = bytes_per_item(build, min(samples, probe))
+
+        start = time.perf_counter()
+        store = build(samples)
+        build_seconds = time.perf_counter() - start
+
+        emit("columnar", store=name, samples=samples,
+             build_seconds=round(build_seconds, 3),
+             bytes_per_sample=round(per_sample, 1),
+             **{key: round(value, 4) for key, value in _report_timings(store).items()})
+
+        del store
+        gc.collect()
+
+
+# ================================
+# 3. Metric Journal
+# ================================
+
+def _journal_rate(records: int, seconds: float) -> int:
+    return int(records / seconds) if seconds else 0
+
+
+def bench_journal(args: argparse.Namespace) -> None:
+    """Append and replay throughput of the mmap journal vs JSON lines."""
+    directory = tempfile.mkdtemp(prefix="journal_bench_")
+    records = args.records
+    start_ns = time.time_ns()
+    rng = random.Random(7)
+    values = [rng.lognormvariate(0.0, 0.5) for _ in range(records)]
+    timestamps = list(range(start_ns, start_ns + records))
+
+    try:
+        # One record per call, the way record_metric writes
+        journal = LifecycleJournal(os.path.join(directory, "single"))
+        kind = journal.intern("latency")
+        agent = journal.intern("BenchmarkAgent")
+        tenant = journal.intern("tenant_a")
+
+        def append_single():
+            append = journal.append_encoded
+            for value, timestamp_ns in zip(values, timestamps):
+                append(kind, value, timestamp_ns, agent, tenant)
+            journal.close()
+
+        single_seconds = timed(append_single)
+
+        # Batched appends, as a worker flushing a buffer would write
+        batched = LifecycleJournal(os.path.join(directory, "batched"))
+
+        def append_batched():
+            for offset in range(0, records, args.batch_size):
+                batched.append_many(kind, values[offset:offset + args.batch_size],
+                                    timestamps[offset:offset + args.batch_size], agent, tenant)
+            batched.close()
+
+        batched_seconds = timed(append_batched)
+
+        replayed = 0
+
+        def replay_journal():
+            nonlocal replayed
+            for _ in LifecycleJournal.replay(os.path.join(directory, "single")):
+                replayed += 1
+
+        replay_seconds = timed(replay_journal)
+
+        # JSON-lines baseline with the same fields
+        json_path = os.path.join(directory, "metrics.jsonl")
+
+        def write_json():
+            with open(json_path, "w", encoding="utf-8") as handle:
+                for value, timestamp_ns in zip(values, timestamps):
+                    handle.write(json.dumps({
+                        "kind": "latency", "value": value, "timestamp_ns": timestamp_ns,
+                        "agent": "BenchmarkAgent", "scope": "tenant_a", "flags": 0
+                    }) + "\n")
+
+        def replay_json():
+            with open(json_path, encoding="utf-8") as handle:
+                for line in handle:
+                    json.loads(line)
+
+        json_write_seconds = timed(write_json)
+        json_replay_seconds = timed(replay_json)
+
+        emit("journal", records=records,
+             append_records_per_second=_journal_rate(records, single_seconds),
+             append_many_records_per_second=_journal_rate(
+                 records, batched_seconds),
+             replay_records_per_second=_journal_rate(replayed, replay_seconds),
+             json_write_records_per_second=_journal_rate(
+                 records, json_write_seconds),
+             json_replay_records_per_second=_journal_rate(
+                 records, json_replay_seconds),
+             replay_speedup_vs_json=round(json_replay_seconds / replay_seconds, 2))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+# ================================
+# 4. Indexed Event Store
+# ================================
+
+def _scan_events(events: List[Any], event_type: Optional[Any] = None,
+                 agent_name: Optional[str] = None, since: Optional[datetime] = None,
+                 limit: Optional[int] = None) -> List[Any]:
+    """The original get_events: one list comprehension per filter."""
+    filtered_events = events
+    if event_type:
+        filtered_events = [
+            e for e in filtered_events if e.event_type == event_type]
+    if agent_name:
+        filtered_events = [
+            e for e in filtered_events if e.agent_name == agent_name]
+    if since:
+        filtered_events = [e for e in filtered_events if e.timestamp >= since]
+    if limit:
+        filtered_events = filtered_events[-limit:]
+    return filtered_events
+
+
+def bench_events(args: argparse.Namespace) -> None:
+    """Filtered event queries on an indexed store vs scanning a list."""
+    rng = random.Random(7)
+    event_types = list(combined.EventType)
+    agents = [f"Agent{index}" for index in range(args.agents)]
+    end = datetime.now()
+    step = timedelta(hours=24) / args.events
+
+    bus = combined.LifecycleEventBus(max_events=None)
+    start = time.perf_counter()
+    for index in range(args.events):
+        bus.store.add(combined.LifecycleEvent(
+            event_id=f"evt_{index}",
+            event_type=rng.choice(event_types),
+            timestamp=end - timedelta(hours=24) + index * step,
+            agent_name=rng.choice(agents),
+            context_id=f"ctx_{index // 10}"
+        ))
+    build_seconds = time.perf_counter() - start
+    events = bus.events
+
+    queries = {
+        "by_type": {"event_type": combined.EventType.TOOL_END},
+        "by_agent": {"agent_name": agents[0]},
+        "type_and_agent": {"event_type": combined.EventType.TOOL_END, "agent_name": agents[0]},
+        "last_15_minutes": {"since": end - timedelta(minutes=15)},
+        "agent_last_hour": {"agent_name": agents[0], "since": end - timedelta(hours=1)},
+        "latest_100_of_type": {"event_type": combined.EventType.HANDOFF, "limit": 100},
+    }
+
+    for name, filters in queries.items():
+        indexed_seconds = timed(lambda: [bus.get_events(**filters)
+                                         for _ in range(args.repeat)]) / args.repeat
+        scan_seconds = timed(lambda: [_scan_events(events, **filters)
+                                      for _ in range(args.repeat)]) / args.repeat
+        matches = len(bus.get_events(**filters))
+        if matches != len(_scan_events(events, **filters)):
+            raise SystemExit(f"Indexed and scanned results differ for {name}")
+
+        emit("events", query=name, events=args.events, matches=matches,
+             build_seconds=round(build_seconds, 3),
+             indexed_seconds=round(indexed_seconds, 6),
+             scan_seconds=round(scan_seconds, 6),
+             speedup=round(scan_seconds / indexed_seconds, 1) if indexed_seconds else None)
+
+
+# ================================
+# 5. Cross-Process Event Fan-Out
+# ================================
+
+def _worker_events(worker_name: str, count: int) -> List[Any]:
+    """Events a worker process would publish, built before the clock starts."""
+    now = datetime.now()
+    return [combined.LifecycleEvent(
+        event_id=f"{worker_name}_{index}",
+        event_type=combined.EventType.TOOL_END,
+        timestamp=now,
+        agent_name=worker_name,
+        context_id=f"{worker_name}_ctx_{index // 10}",
+        data={"tool_name": "search"},
+        metrics={"duration": 0.05, "sequence": float(index)}
+    ) for index in range(count)]
+
+
+def _idle_backoff(sleep: float, limit: float = 0.0005) -> float:
+    """Next sleep for a consumer that found nothing: 0, then doubling up to `limit`."""
+    return min(limit, max(sleep * 2, limit / 64))
+
+
+def _frame_producer(ring_name: str, worker_name: str, count: int, go) -> None:
+    ring = SharedMemoryRing.attach(ring_name)
+    payload = combined.encode_event(_worker_events(worker_name, 1)[0])
+    go.wait()
+    for _ in range(count):
+        while not ring.try_write(payload):
+            time.sleep(0)
+    ring.close()
+
+
+def _frame_queue_producer(queue, worker_name: str, count: int, go) -> None:
+    payload = combined.encode_event(_worker_events(worker_name, 1)[0])
+    go.wait()
+    for _ in range(count):
+        queue.put(payload)
+
+
+def _run_ring_frames(producers: int, per_producer: int, capacity: int) -> float:
+    """Seconds to move already-encoded frames through rings, without decoding."""
+    rings = [SharedMemoryRing.create(capacity) for _ in range(producers)]
+    go = multiprocessing.Event()
+    processes = [multiprocessing.Process(target=_frame_producer,
+                                         args=(ring.name, f"worker_{index}", per_producer, go))
+                 for index, ring in enumerate(rings)]
+    total = producers * per_producer
+
+    try:
+        for process in processes:
+            process.start()
+        start = time.perf_counter()
+        go.set()
+        received = 0
+        sleep = 0.0
+        while received < total:
+            polled = sum(len(ring.read_batch()) for ring in rings)
+            received += polled
+            sleep = 0.0 if polled else _idle_backoff(sleep)
+            if sleep:
+                time.sleep(sleep)
+        seconds = time.perf_counter() - start
+        for process in processes:
+            process.join()
+    finally:
+        for ring in rings:
+            ring.close()
+    return seconds
+
+
+def _run_queue_frames(producers: int, per_producer: int) -> float:
+    """The same encoded frames through a multiprocessing.Queue."""
+    queue = multiprocessing.Queue(maxsize=10_000)
+    go = multiprocessing.Event()
+    processes = [multiprocessing.Process(target=_frame_queue_producer,
+                                         args=(queue, f"worker_{index}", per_producer, go))
+                 for index in range(producers)]
+    total = producers * per_producer
+
+    for process in processes:
+        process.start()
+    start = time.perf_counter()
+    go.set()
+    for _ in range(total):
+        queue.get()
+    seconds = time.perf_counter() - start
+    for process in processes:
+        process.join()
+    return seconds
+
+
+def _ring_producer(ring_name: str, worker_name: str, count: int, go) -> None:
+    ring = SharedMemoryRing.attach(ring_name)
+    events = _worker_events(worker_name, count)
+    publisher = combined.SharedMemoryEventPublisher(ring, block=True)
+    go.wait()
+    for event in events:
+        publisher.publish(event)
+    ring.close()
+
+
+def _queue_producer(queue, worker_name: str, count: int, go) -> None:
+    events = _worker_events(worker_name, count)
+    go.wait()
+    for event in events:
+        queue.put(event)
+
+
+def _run_ring(producers: int, per_producer: int, capacity: int) -> float:
+    """Seconds for one aggregator to consume every producer's events via rings."""
+    rings = [SharedMemoryRing.create(capacity) for _ in range(producers)]
+    go = multiprocessing.Event()
+    processes = [multiprocessing.Process(target=_ring_producer,
+                                         args=(ring.name, f"worker_{index}", per_producer, go))
+                 for index, ring in enumerate(rings)]
+    aggregator = combined.SharedMemoryEventAggregator(
+        rings, combined.LifecycleEventBus())
+    total = producers * per_producer
+
+    try:
+        for process in processes:
+            process.start()
+        start = time.perf_counter()
+        go.set()
+        received = 0
+        sleep = 0.0
+        while received < total:
+            polled = aggregator.poll()
+            received += polled
+            sleep = 0.0 if polled else _idle_backoff(sleep)
+            if sleep:
+                time.sleep(sleep)
+        seconds = time.perf_counter() - start
+        for process in processes:
+            process.join()
+    finally:
+        for ring in rings:
+            ring.close()
+    return seconds
+
+
+def _run_queue(producers: int, per_producer: int) -> float:
+    """Same workload through a pickling multiprocessing.Queue."""
+    queue = multiprocessing.Queue(maxsize=10_000)
+    go = multiprocessing.Event()
+    processes = [multiprocessing.Process(target=_queue_producer,
+                                         args=(queue, f"worker_{index}", per_producer, go))
+                 for index in range(producers)]
+    event_bus = combined.LifecycleEventBus()
+    total = producers * per_producer
+
+    for process in processes:
+        process.start()
+    start = time.perf_counter()
+    go.set()
+    for _ in range(total):
+        event_bus.publish_event(queue.get())
+    seconds = time.perf_counter() - start
+    for process in processes:
+        process.join()
+    return seconds
+
+
+def bench_ring(args: argparse.Namespace) -> None:
+    """Fan-in throughput for 1..N producer processes, measured two ways.
+
+    "frames" moves pre-encoded payloads and only counts them on arrival, so
+    it measures the transport alone. "end_to_end" publishes LifecycleEvents
+    through SharedMemoryEventPublisher and republishes them on the
+    aggregator's bus, so encoding, decoding and bus indexing are included;
+    its baseline pickles the same events through the queue.
+    """
+    runs = {
+        "frames": (lambda producers, per_producer: _run_ring_frames(producers, per_producer, args.capacity),
+                   _run_queue_frames),
+        "end_to_end": (lambda producers, per_producer: _run_ring(producers, per_producer, args.capacity),
+                       _run_queue),
+    }
+    for producers in args.producers:
+        per_producer = max(1, args.events // producers)
+        total = producers * per_producer
+        for kind, (run_ring, run_queue) in runs.items():
+            ring_seconds = run_ring(producers, per_producer)
+            queue_seconds = None if args.skip_baseline else run_queue(
+                producers, per_producer)
+
+            emit("ring", kind=kind, producers=producers, events=total,
+                 ring_events_per_second=int(total / ring_seconds),
+                 queue_events_per_second=int(
+                     total / queue_seconds) if queue_seconds else None,
+                 speedup_vs_queue=round(queue_seconds / ring_seconds, 2) if queue_seconds else None)
+
+
+# ================================
+# 6. Binary Codec
+# ================================
+
+def _codec_samples(count: int) -> Dict[str, List[Any]]:
+    """Records shaped like the ones the hooks produce."""
+    rng = random.Random(7)
+    start = datetime.now()
+    agents = [f"Agent{index}" for index in range(20)]
+    tenants = ["tenant_a", "tenant_b", "tenant_c"]
+
+    def at(index: int) -> datetime:
+        return start + timedelta(milliseconds=index * rng.randint(1, 50))
+
+    return {
+        "LifecycleEvent": [combined.LifecycleEvent(
+            event_id=f"evt_{1_700_000_000 + index // 1000}_{index}",
+            event_type=rng.choice(list(combined.EventType)),
+            timestamp=at(index),
+            agent_name=rng.choice(agents),
+            context_id=f"ctx_{index // 20}",
+            session_id="session_1700000000",
+            data={"tool_name": rng.choice(["search", "analyze", "notify"]),
+                  "tool_count": index % 7, "global_event": True},
+            metrics={"duration": rng.random() * 2, "sequence": float(index)},
+            tags={"tool_execution", "tool_search"}
+        ) for index in range(count)],
+        "SystemAlert": [combined.SystemAlert(
+            alert_id=f"alert_{index}",
+            level=rng.choice(list(combined.AlertLevel)),
+            title="Slow Tool Execution",
+            description=f"Tool search took {rng.random() * 10:.2f}s",
+            timestamp=at(index),
+            agent_name=rng.choice(agents),
+            event_ids=[f"evt_{index}", f"evt_{index + 1}"],
+            context={"tool_name": "search", "duration": rng.random() * 10}
+        ) for index in range(count)],
+        "ProductionMetric": [production.ProductionMetric(
+            metric_id=f"metric_{1_700_000_000 + index // 1000}_{index}",
+            metric_type=rng.choice(list(production.MetricType)),
+            value=rng.lognormvariate(0.0, 0.5),
+            threshold=2.0,
+            timestamp=at(index),
+            tenant_id=rng.choice(tenants),
+            agent_name=rng.choice(agents),
+            is_sla_violation=rng.random() < 0.05,
+            context={"session_id": "session_1700000000"}
+        ) for index in range(count)],
+        "ProductionAlert": [production.ProductionAlert(
+            alert_id=f"alert_{index}",
+            severity=rng.choice(list(production.SeverityLevel)),
+            title="SLA Violation: Response Time SLA",
+            description=f"Metric latency value {rng.random() * 5:.2f} violates SLA",
+            timestamp=at(index),
+            tenant_id=rng.choice(tenants),
+            agent_name=rng.choice(agents),
+            metric_values={"latency": rng.random() * 5, "threshold": 2.0}
+        ) for index in range(count)],
+    }
+
+
+def bench_codec(args: argparse.Namespace) -> None:
+    """Size and speed of the binary codec against json.dumps(asdict(...))."""
+    codecs = {"LifecycleEvent": combined.EVENT_CODEC, "SystemAlert": combined.EVENT_CODEC,
+              "ProductionMetric": production.PRODUCTION_CODEC,
+              "ProductionAlert": production.PRODUCTION_CODEC}
+
+    for name, records in _codec_samples(args.records).items():
+        codec = codecs[name]
+        count = len(records)
+        results: Dict[str, Any] = {}
+
+        json_payloads: List[str] = []
+        results["json_encode_seconds"] = timed(lambda: json_payloads.extend(
+            json.dumps(asdict(record), default=str) for record in records))
+        results["json_loads_seconds"] = timed(
+            lambda: [json.loads(payload) for payload in json_payloads])
+        json_bytes = sum(len(payload.encode("utf-8"))
+                         for payload in json_payloads)
+
+        binary_payloads: List[bytes] = []
+        results["binary_encode_seconds"] = timed(lambda: binary_payloads.extend(
+            codec.encode(record) for record in records))
+        results["binary_decode_seconds"] = timed(
+            lambda: [codec.decode(payload) for payload in binary_payloads])
+        binary_bytes = sum(len(payload) for payload in binary_payloads)
+
+        stream: List[bytes] = []
+        results["stream_encode_seconds"] = timed(
+            lambda: stream.append(StreamEncoder(codec).encode_many(records)))
+        decoded: List[Any] = []
+        results["stream_decode_seconds"] = timed(
+            lambda: decoded.extend(StreamDecoder(codec).feed(stream[0])))
+        if decoded != records or codec.decode(binary_payloads[0]) != records[0]:
+            raise SystemExit(f"Binary round trip changed {name} records")
+
+        emit("codec", record_type=name, records=count,
+             json_bytes_per_record=round(json_bytes / count, 1),
+             binary_bytes_per_record=round(binary_bytes / count, 1),
+             stream_bytes_per_record=round(len(stream[0]) / count, 1),
+             **{key.replace("_seconds", "_per_second"): int(count / value)
+                for key, value in results.items()})
+
+
+# ================================
+# 7. Event Rollups
+# ================================
+
+def bench_rollups(args: argparse.Namespace) -> None:
+    """Session-report aggregation from rollup tiers vs folding raw events."""
+    rng = random.Random(7)
+    event_types = list(combined.EventType)
+    agents = [f"Agent{index}" for index in range(args.agents)]
+    end = datetime.now()
+    total = int(args.days * 24 * 60 * args.events_per_minute)
+    step = timedelta(days=args.days) / total
+
+    # Raw retention is unlimited here so both paths read the same history
+    bus = combined.LifecycleEventBus(max_events=None)
+    start = time.perf_counter()
+    for index in range(total):
+        bus.publish_event(combined.LifecycleEvent(
+            event_id=f"evt_{index}",
+            event_type=rng.choice(event_types),
+            timestamp=end - timedelta(days=args.days) + index * step,
+            agent_name=rng.choice(agents),
+            context_id=f"ctx_{index // 10}",
+            metrics={"quality_score": rng.random() * 100}
+        ))
+    build_seconds = time.perf_counter() - start
+
+    for label, window in (("1h", timedelta(hours=1)), ("24h", timedelta(hours=24)),
+                          ("all", timedelta(days=args.days))):
+        since = end - window
+        raw_seconds = timed(lambda: combined.EventRollup.group(
+            bus.get_events(since=since)))
+        rollup_seconds = timed(lambda: bus.summarize(since))
+        raw_count = len(bus.get_events(since=since))
+        rollup_count = sum(rollup.count for rollup in bus.summarize(since).values())
+
+        emit("rollups", window=label, events=total, events_in_window=raw_count,
+             rollup_events_in_window=rollup_count,
+             publish_events_per_second=int(total / build_seconds),
+             raw_seconds=round(raw_seconds, 4), rollup_seconds=round(rollup_seconds, 4),
+             speedup=round(raw_seconds / rollup_seconds, 1) if rollup_seconds else None,
+             **bus.rollups.get_stats())
+
+
+# ================================
+# 8. Hook Overhead
+# ================================
+
+class ScriptedModel(Model):
+    """Deterministic in-process model, so a run costs only SDK and hook work.
+
+    The first turn calls every tool of the agent once with placeholder
+    arguments; once the tool outputs are in the input it answers with text.
+    """
+
+    PLACEHOLDERS = {"string": "bench", "number": 1.0, "integer": 1, "boolean": True}
+
+    def __init__(self):
+        self.responses = 0
+
+    async def get_response(self, system_instructions, input, model_settings, tools,
+                           output_schema, handoffs, tracing, *, previous_response_id=None):
+        self.responses += 1
+        last_item = input[-1] if isinstance(input, list) and input else None
+        if not tools or (isinstance(last_item, dict) and last_item.get("type") == "function_call_output"):
+            output = [ResponseOutputMessage(
+                id=f"msg_{self.responses}", type="message", role="assistant", status="completed",
+                content=[ResponseOutputText(type="output_text", text="Request handled.", annotations=[])]
+            )]
+        else:
+            output = [
+                ResponseFunctionToolCall(
+                    type="function_call", id=f"fc_{self.responses}_{index}",
+                    call_id=f"call_{self.responses}_{index}", name=tool.name,
+                    arguments=json.dumps(self._arguments(tool.params_json_schema)))
+                for index, tool in enumerate(tools)
+            ]
+        return ModelResponse(output=output, usage=Usage(requests=1), response_id=None)
+
+    def stream_response(self, *args, **kwargs):
+        raise NotImplementedError("The hook benchmark only uses non-streamed runs")
+
+    @classmethod
+    def _arguments(cls, schema: Dict[str, Any]) -> Dict[str, Any]:
+        properties = schema.get("properties", {})
+        return {name: cls.PLACEHOLDERS.get(properties[name].get("type"), "bench")
+                for name in schema.get("required", [])}
+
+
+def _bench_agents() -> List[Agent]:
+    """Agents from the lessons, one per hook style they were written for."""
+    monitoring_system = production.ProductionMonitoringSystem()
+    return [
+        production.create_payment_agent(monitoring_system, "bench"),
+        production.create_customer_service_agent(monitoring_system, "bench"),
+        run_hooks.create_billing_agent(),
+        agent_hooks.create_smart_customer_agent(),
+        combined.create_analytics_agent(combined.LifecycleEventBus())
+    ]
+
+
+def _hook_configs() -> Dict[str, Callable[[], Dict[str, Any]]]:
+    """Name -> factory for fresh (run hooks, per-agent hooks factory) per configuration."""
+    def run_only(factory: Callable[[], Any]) -> Callable[[], Dict[str, Any]]:
+        return lambda: {"kind": "run", "run_hooks": factory(), "agent_hooks": None}
+
+    def agent_only(factory: Callable[[str], Any]) -> Callable[[], Dict[str, Any]]:
+        return lambda: {"kind": "agent", "run_hooks": None, "agent_hooks": factory}
+
+    def all_hooks() -> Dict[str, Any]:
+        monitoring_system = production.ProductionMonitoringSystem()
+        composite = run_hooks.CompositeRunHooks([
+            run_hooks.BasicRunHooks(),
+            run_hooks.PerformanceMonitoringHooks(),
+            run_hooks.SecurityAuditHooks(),
+            combined.ComprehensiveRunHooks(combined.LifecycleEventBus()),
+            production.ProductionRunHooks(monitoring_system, "bench")
+        ], timeout=None)
+        return {"kind": "combined", "run_hooks": composite,
+                "agent_hooks": lambda name: production.ProductionAgentHooks(name, monitoring_system, "bench")}
+
+    return {
+        "none": lambda: {"kind": "none", "run_hooks": None, "agent_hooks": None},
+        "BasicRunHooks": run_only(run_hooks.BasicRunHooks),
+        "PerformanceMonitoringHooks": run_only(run_hooks.PerformanceMonitoringHooks),
+        # Counters alone, then the default of one snapshot per 100 invocations;
+        # snapshotting every call costs far more than a whole run
+        "MemoryProfilingHooks": run_only(
+            lambda: run_hooks.MemoryProfilingHooks(top_sites=0)),
+        "MemoryProfilingHooks/sites": run_only(run_hooks.MemoryProfilingHooks),
+        "SecurityAuditHooks": run_only(run_hooks.SecurityAuditHooks),
+        "ComprehensiveRunHooks": run_only(
+            lambda: combined.ComprehensiveRunHooks(combined.LifecycleEventBus())),
+        "ProductionRunHooks": run_only(
+            lambda: production.ProductionRunHooks(production.ProductionMonitoringSystem(), "bench")),
+        "BasicAgentHooks": agent_only(agent_hooks.BasicAgentHooks),
+        "PerformanceTrackingHooks": agent_only(agent_hooks.PerformanceTrackingHooks),
+        "LearningAgentHooks": agent_only(agent_hooks.LearningAgentHooks),
+        "IntegratedAgentHooks": agent_only(
+            lambda name: combined.IntegratedAgentHooks(name, combined.LifecycleEventBus())),
+        "ProductionAgentHooks": agent_only(
+            lambda name: production.ProductionAgentHooks(name, production.ProductionMonitoringSystem(), "bench")),
+        "all": all_hooks
+    }
+
+
+async def _run_hook_config(config: Dict[str, Any], runs: int, warmup: int,
+                           concurrency: int) -> Dict[str, Any]:
+    """Run the agents round-robin and return throughput and latency figures."""
+    agents = [agent.clone(hooks=config["agent_hooks"](agent.name) if config["agent_hooks"] else None)
+              for agent in _bench_agents()]
+    run_config = RunConfig(model=ScriptedModel(), tracing_disabled=True)
+    latencies: List[float] = []
+
+    async def one_run(index: int, record: bool) -> None:
+        start = time.perf_counter()
+        await Runner.run(agents[index % len(agents)], input=f"Benchmark request {index}",
+                         hooks=config["run_hooks"], run_config=run_config)
+        if record:
+            latencies.append(time.perf_counter() - start)
+
+    async def worker(indices: range, record: bool) -> None:
+        for index in indices:
+            await one_run(index, record)
+
+    for index in range(warmup):
+        await one_run(index, False)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(range(offset, runs, concurrency), True)
+                           for offset in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "runs_per_second": round(runs / elapsed, 1),
+        "p50_ms": round(latencies[len(latencies) // 2] * 1000, 3),
+        "p99_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000, 3)
+    }
+
+
+def bench_hooks(args: argparse.Namespace) -> None:
+    """Cost of each hook class on full agent runs against a scripted model."""
+    configs = _hook_configs()
+    selected = args.hooks or list(configs)
+    if "none" not in selected:
+        selected = ["none", *selected]
+
+    for concurrency in args.concurrency:
+        baseline = None
+        for name in selected:
+            config = configs[name]()
+            # Hooks print on every callback; keep that cost but not the output
+            with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):
+                result = asyncio.run(_run_hook_config(
+                    config, args.runs, args.warmup, concurrency))
+            if isinstance(config["run_hooks"], run_hooks.MemoryProfilingHooks):
+                config["run_hooks"].stop()
+
+            if baseline is None:
+                baseline = result
+            emit("hooks", hooks=name, kind=config["kind"], runs=args.runs,
+                 concurrency=concurrency, **result,
+                 overhead_ms_per_run=round(1000 / result["runs_per_second"] -
+                                           1000 / baseline["runs_per_second"], 3),
+                 relative_throughput=round(result["runs_per_second"] / baseline["runs_per_second"], 3))
+
+
+# ================================
+# 9. Command Line
+# ================================
+
+def main() -> None:
+    """Parse arguments and run the selected benchmark."""
+    parser = argparse.ArgumentParser(
+        description="Lifecycle monitoring benchmarks")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    columnar = subparsers.add_parser(
+        "columnar", help="List-of-dataclasses vs NumPy columnar metric storage")
+    columnar.add_argument("--samples", type=int, default=10_000_000)
+    columnar.add_argument("--baseline-samples", type=int, default=1_000_000,
+                          help="Samples for the list-of-dataclasses baseline")
+    columnar.add_argument("--skip-baseline", action="store_true",
+                          help="Only run the columnar store")
+    columnar.set_defaults(func=bench_columnar)
+
+    journal = subparsers.add_parser(
+        "journal", help="Memory-mapped journal append/replay vs JSON lines")
+    journal.add_argument("--records", type=int, default=5_000_000)
+    journal.add_argument("--batch-size", type=int, default=10_000)
+    journal.set_defaults(func=bench_journal)
+
+    events = subparsers.add_parser(
+        "events", help="Indexed LifecycleEventBus queries vs list scans")
+    events.add_argument("--events", type=int, default=1_000_000)
+    events.add_argument("--agents", type=int, default=50)
+    events.add_argument("--repeat", type=int, default=5)
+    events.set_defaults(func=bench_events)
+
+    ring = subparsers.add_parser(
+        "ring", help="Shared-memory ring event fan-out vs multiprocessing.Queue")
+    ring.add_argument("--producers", type=int, nargs="+", default=[1, 4, 16])
+    ring.add_argument("--events", type=int, default=200_000,
+                      help="Total events per run, split across producers")
+    ring.add_argument("--capacity", type=int, default=1 << 22,
+                      help="Ring size in bytes per producer")
+    ring.add_argument("--skip-baseline", action="store_true",
+                      help="Only run the shared-memory transport")
+    ring.set_defaults(func=bench_ring)
+
+    codec = subparsers.add_parser(
+        "codec", help="Binary codec vs json.dumps(asdict(...))")
+    codec.add_argument("--records", type=int, default=100_000)
+    codec.set_defaults(func=bench_codec)
+
+    rollups = subparsers.add_parser(
+        "rollups", help="Report aggregates from rollup tiers vs raw events")
+    rollups.add_argument("--days", type=float, default=3)
+    rollups.add_argument("--events-per-minute", type=int, default=200)
+    rollups.add_argument("--agents", type=int, default=20)
+    rollups.set_defaults(func=bench_rollups)
+
+    hooks = subparsers.add_parser(
+        "hooks", help="Agent runs/s and latency with each hook class vs no hooks")
+    hooks.add_argument("--runs", type=int, default=500)
+    hooks.add_argument("--warmup", type=int, default=20)
+    hooks.add_argument("--concurrency", type=int, nargs="+", default=[1, 8])
+    hooks.add_argument("--hooks", nargs="+",
+                       help="Configurations to run (default: all); 'none' always runs first")
+    hooks.set_defaults(func=bench_hooks)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,509 @@
+"""
+binary_codec.py
+
+Schema-driven compact binary codec for the lifecycle dataclasses. A schema is a
+list of (attribute, field type) pairs registered once per dataclass; records
+are then written without field names, JSON punctuation or datetime strings:
+- BinaryCodec: registry of dataclass schemas with one-shot encode/decode
+- StreamEncoder / StreamDecoder: framed record streams that carry state
+  (interned strings, timestamp deltas) from one record to the next
+- optional(): marks a field type as nullable
+
+Key Concepts:
+- Enum members written as small integer codes instead of their string values
+- Timestamps as zigzag varints of microseconds, delta-encoded within a stream
+- Low-cardinality strings and map keys interned per stream
+- Free-form dicts written as tagged, length-prefixed values
+"""
+
+import struct
+from dataclasses import fields as dataclass_fields
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Type
+
+
+# ================================
+# 1. Primitives
+# ================================
+
+EPOCH = datetime(1970, 1, 1)
+FLOAT = struct.Struct("<d")
+
+# Value tags for free-form ("any") fields
+TAG_NONE, TAG_FALSE, TAG_TRUE, TAG_INT, TAG_FLOAT, TAG_STR, TAG_LIST, TAG_DICT = range(8)
+
+
+def write_varint(out: bytearray, value: int) -> None:
+    """Unsigned LEB128."""
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data: bytes, position: int) -> Tuple[int, int]:
+    """Return (value, next position)."""
+    byte = data[position]
+    if byte < 0x80:
+        return byte, position + 1
+
+    value = byte & 0x7F
+    shift = 7
+    while True:
+        position += 1
+        byte = data[position]
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, position + 1
+        shift += 7
+
+
+def zigzag(value: int) -> int:
+    """Map signed to unsigned so small negative numbers stay short."""
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def unzigzag(value: int) -> int:
+    return value >> 1 if not value & 1 else -(value >> 1) - 1
+
+
+def datetime_to_micros(value: datetime) -> int:
+    """Microseconds since 1970-01-01 without local-time conversion.
+
+    Naive datetimes round-trip exactly; aware ones are normalized to UTC and
+    decoded as naive UTC.
+    """
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    delta = value - EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def micros_to_datetime(micros: int) -> datetime:
+    return EPOCH + timedelta(microseconds=micros)
+
+
+class _CodecState:
+    """Per-stream state shared by encoder and decoder.
+
+    Both sides intern strings in the same order, so an encoder and a decoder
+    that have seen the same records always agree on the table.
+    """
+
+    def __init__(self, max_symbols: int):
+        self.max_symbols = max_symbols
+        self.symbol_codes: Dict[str, int] = {}
+        self.symbols: List[str] = []
+        self.last_timestamp = 0
+
+
+# ================================
+# 2. Field Types
+# ================================
+
+class _Optional:
+    def __init__(self, field_type: Any):
+        self.field_type = field_type
+
+
+def optional(field_type: Any) -> _Optional:
+    """Field type that may also be None (one presence byte)."""
+    return _Optional(field_type)
+
+
+def _write_str(state: _CodecState, out: bytearray, value: str) -> None:
+    raw = value.encode("utf-8")
+    write_varint(out, len(raw))
+    out += raw
+
+
+def _read_str(state: _CodecState, data: bytes, position: int) -> Tuple[str, int]:
+    length = data[position]
+    if length < 0x80:
+        position += 1
+    else:
+        length, position = read_varint(data, position)
+    end = position + length
+    return data[position:end].decode("utf-8"), end
+
+
+def _write_symbol(state: _CodecState, out: bytearray, value: str) -> None:
+    """0 + literal for a new string (interned if there is room), else code + 1."""
+    code = state.symbol_codes.get(value)
+    if code is not None:
+        write_varint(out, code + 1)
+        return
+
+    out.append(0)
+    _write_str(state, out, value)
+    if len(state.symbols) < state.max_symbols:
+        state.symbol_codes[value] = len(state.symbols)
+        state.symbols.append(value)
+
+
+def _read_symbol(state: _CodecState, data: bytes, position: int) -> Tuple[str, int]:
+    code = data[position]
+    if code:
+        if code >= 0x80:
+            code, position = read_varint(data, position)
+            return state.symbols[code - 1], position
+        return state.symbols[code - 1], position + 1
+
+    value, position = _read_str(state, data, position + 1)
+    symbols = state.symbols
+    if len(symbols) < state.max_symbols:
+        # Only the encoder looks strings up by value
+        symbols.append(value)
+    return value, position
+
+
+def _write_float(state: _CodecState, out: bytearray, value: float) -> None:
+    out += FLOAT.pack(value)
+
+
+def _read_float(state: _CodecState, data: bytes, position: int) -> Tuple[float, int]:
+    return FLOAT.unpack_from(data, position)[0], position + 8
+
+
+def _write_bool(state: _CodecState, out: bytearray, value: bool) -> None:
+    out.append(1 if value else 0)
+
+
+def _read_bool(state: _CodecState, data: bytes, position: int) -> Tuple[bool, int]:
+    return data[position] == 1, position + 1
+
+
+def _write_datetime(state: _CodecState, out: bytearray, value: datetime) -> None:
+    micros = datetime_to_micros(value)
+    write_varint(out, zigzag(micros - state.last_timestamp))
+    state.last_timestamp = micros
+
+
+def _read_datetime(state: _CodecState, data: bytes, position: int) -> Tuple[datetime, int]:
+    delta, position = read_varint(data, position)
+    state.last_timestamp += unzigzag(delta)
+    return micros_to_datetime(state.last_timestamp), position
+
+
+def _write_float_map(state: _CodecState, out: bytearray, value: Dict[str, float]) -> None:
+    write_varint(out, len(value))
+    for key, item in value.items():
+        _write_symbol(state, out, key)
+        out += FLOAT.pack(item)
+
+
+def _read_float_map(state: _CodecState, data: bytes, position: int) -> Tuple[Dict[str, float], int]:
+    count, position = read_varint(data, position)
+    value = {}
+    for _ in range(count):
+        key, position = _read_symbol(state, data, position)
+        value[key] = FLOAT.unpack_from(data, position)[0]
+        position += 8
+    return value, position
+
+
+def _write_symbol_list(state: _CodecState, out: bytearray, value: Iterable[str]) -> None:
+    items = sorted(value) if isinstance(value, (set, frozenset)) else value
+    write_varint(out, len(items))
+    for item in items:
+        _write_symbol(state, out, item)
+
+
+def _read_symbol_items(state: _CodecState, data: bytes, position: int) -> Tuple[List[str], int]:
+    count, position = read_varint(data, position)
+    items = []
+    for _ in range(count):
+        item, position = _read_symbol(state, data, position)
+        items.append(item)
+    return items, position
+
+
+def _read_symbol_set(state: _CodecState, data: bytes, position: int) -> Tuple[set, int]:
+    items, position = _read_symbol_items(state, data, position)
+    return set(items), position
+
+
+def _write_any(state: _CodecState, out: bytearray, value: Any) -> None:
+    """Tagged value; types without a tag are written as str(), like json's default=str."""
+    if value is None:
+        out.append(TAG_NONE)
+    elif value is True:
+        out.append(TAG_TRUE)
+    elif value is False:
+        out.append(TAG_FALSE)
+    elif isinstance(value, int):
+        out.append(TAG_INT)
+        write_varint(out, zigzag(value))
+    elif isinstance(value, float):
+        out.append(TAG_FLOAT)
+        out += FLOAT.pack(value)
+    elif isinstance(value, str):
+        out.append(TAG_STR)
+        _write_str(state, out, value)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        out.append(TAG_LIST)
+        write_varint(out, len(value))
+        for item in value:
+            _write_any(state, out, item)
+    elif isinstance(value, dict):
+        out.append(TAG_DICT)
+        _write_any_map(state, out, value)
+    else:
+        out.append(TAG_STR)
+        _write_str(state, out, str(value))
+
+
+def _read_any(state: _CodecState, data: bytes, position: int) -> Tuple[Any, int]:
+    tag = data[position]
+    position += 1
+    if tag == TAG_STR:
+        return _read_str(state, data, position)
+    if tag == TAG_FLOAT:
+        return FLOAT.unpack_from(data, position)[0], position + 8
+    if tag == TAG_INT:
+        value, position = read_varint(data, position)
+        return unzigzag(value), position
+    if tag == TAG_DICT:
+        return _read_any_map(state, data, position)
+    if tag == TAG_LIST:
+        count, position = read_varint(data, position)
+        items = []
+        for _ in range(count):
+            item, position = _read_any(state, data, position)
+            items.append(item)
+        return items, position
+    if tag == TAG_TRUE:
+        return True, position
+    if tag == TAG_FALSE:
+        return False, position
+    if tag == TAG_NONE:
+        return None, position
+    raise ValueError(f"Unknown value tag {tag}")
+
+
+def _write_any_map(state: _CodecState, out: bytearray, value: Dict[Any, Any]) -> None:
+    write_varint(out, len(value))
+    for key, item in value.items():
+        _write_symbol(state, out, key if isinstance(key, str) else str(key))
+        _write_any(state, out, item)
+
+
+def _read_any_map(state: _CodecState, data: bytes, position: int) -> Tuple[Dict[str, Any], int]:
+    count, position = read_varint(data, position)
+    value = {}
+    for _ in range(count):
+        key, position = _read_symbol(state, data, position)
+        value[key], position = _read_any(state, data, position)
+    return value, position
+
+
+FIELD_TYPES: Dict[str, Tuple[Callable, Callable]] = {
+    "str": (_write_str, _read_str),
+    "symbol": (_write_symbol, _read_symbol),
+    "float": (_write_float, _read_float),
+    "bool": (_write_bool, _read_bool),
+    "datetime": (_write_datetime, _read_datetime),
+    "float_map": (_write_float_map, _read_float_map),
+    "symbol_list": (_write_symbol_list, _read_symbol_items),
+    "symbol_set": (_write_symbol_list, _read_symbol_set),
+    "any": (_write_any, _read_any),
+    "any_map": (_write_any_map, _read_any_map),
+}
+
+
+def _enum_field(enum_type: Type[Enum]) -> Tuple[Callable, Callable]:
+    """Members are written as their declaration index."""
+    members = list(enum_type)
+    codes = {member: code for code, member in enumerate(members)}
+
+    def write(state: _CodecState, out: bytearray, value: Enum) -> None:
+        write_varint(out, codes[value])
+
+    def read(state: _CodecState, data: bytes, position: int) -> Tuple[Enum, int]:
+        code, position = read_varint(data, position)
+        return members[code], position
+
+    return write, read
+
+
+def _optional_field(inner: Tuple[Callable, Callable]) -> Tuple[Callable, Callable]:
+    write_inner, read_inner = inner
+
+    def write(state: _CodecState, out: bytearray, value: Any) -> None:
+        if value is None:
+            out.append(0)
+        else:
+            out.append(1)
+            write_inner(state, out, value)
+
+    def read(state: _CodecState, data: bytes, position: int) -> Tuple[Any, int]:
+        if data[position] == 0:
+            return None, position + 1
+        return read_inner(state, data, position + 1)
+
+    return write, read
+
+
+def _resolve_field_type(field_type: Any) -> Tuple[Callable, Callable]:
+    if isinstance(field_type, _Optional):
+        return _optional_field(_resolve_field_type(field_type.field_type))
+    if isinstance(field_type, type) and issubclass(field_type, Enum):
+        return _enum_field(field_type)
+    if field_type in FIELD_TYPES:
+        return FIELD_TYPES[field_type]
+    raise ValueError(f"Unknown field type: {field_type!r}")
+
+
+# ================================
+# 3. Codec and Streams
+# ================================
+
+class _RecordSchema:
+    """Compiled schema of one registered dataclass."""
+
+    def __init__(self, tag: int, record_type: type, schema: Sequence[Tuple[str, Any]]):
+        self.tag = tag
+        self.record_type = record_type
+        self.attributes = [attribute for attribute, _ in schema]
+        self.writers = [_resolve_field_type(field_type)[0]
+                        for _, field_type in schema]
+        self.readers = [_resolve_field_type(field_type)[1]
+                        for _, field_type in schema]
+
+    def write(self, state: _CodecState, out: bytearray, record: Any) -> None:
+        for attribute, writer in zip(self.attributes, self.writers):
+            writer(state, out, getattr(record, attribute))
+
+    def read(self, state: _CodecState, data: bytes, position: int) -> Tuple[Any, int]:
+        values = []
+        for reader in self.readers:
+            value, position = reader(state, data, position)
+            values.append(value)
+        return self.record_type(*values), position
+
+
+class BinaryCodec:
+    """Registry of dataclass schemas.
+
+    Every registered type gets a one-byte-or-more varint tag, so records of
+    different types can share a stream. `encode`/`decode` handle one
+    self-contained record; StreamEncoder/StreamDecoder carry interned strings
+    and timestamp deltas across records and are much more compact for runs of
+    similar records.
+    """
+
+    def __init__(self, max_symbols: int = 4096):
+        self.max_symbols = max_symbols
+        self._by_type: Dict[type, _RecordSchema] = {}
+        self._by_tag: Dict[int, _RecordSchema] = {}
+
+    def register(self, record_type: type, schema: Sequence[Tuple[str, Any]],
+                 tag: Optional[int] = None) -> None:
+        """Register a dataclass; the schema lists every init field in order."""
+        tag = len(self._by_tag) if tag is None else tag
+        if tag in self._by_tag:
+            raise ValueError(f"Tag {tag} is already registered")
+
+        # Records are rebuilt positionally, so the schema must follow field order
+        init_fields = [f.name for f in dataclass_fields(record_type) if f.init]
+        if [attribute for attribute, _ in schema] != init_fields:
+            raise ValueError(
+                f"Schema for {record_type.__name__} must list {init_fields} in order")
+
+        compiled = _RecordSchema(tag, record_type, schema)
+        self._by_type[record_type] = compiled
+        self._by_tag[tag] = compiled
+
+    def new_state(self) -> _CodecState:
+        return _CodecState(self.max_symbols)
+
+    def write_record(self, state: _CodecState, out: bytearray, record: Any) -> None:
+        """Append the tag and fields of one record."""
+        schema = self._by_type.get(type(record))
+        if schema is None:
+            raise TypeError(f"{type(record).__name__} is not registered")
+        write_varint(out, schema.tag)
+        schema.write(state, out, record)
+
+    def read_record(self, state: _CodecState, data: bytes, position: int = 0) -> Tuple[Any, int]:
+        tag, position = read_varint(data, position)
+        schema = self._by_tag.get(tag)
+        if schema is None:
+            raise ValueError(f"Unknown record tag {tag}")
+        return schema.read(state, data, position)
+
+    def encode(self, record: Any) -> bytes:
+        """Self-contained encoding of one record."""
+        out = bytearray()
+        self.write_record(self.new_state(), out, record)
+        return bytes(out)
+
+    def decode(self, data: bytes) -> Any:
+        record, _ = self.read_record(self.new_state(), data)
+        return record
+
+
+class StreamEncoder:
+    """Encodes records into length-prefixed frames of one continuous stream.
+
+    Frames must be decoded in order by a single StreamDecoder, since later
+    frames refer back to strings and timestamps of earlier ones.
+    """
+
+    def __init__(self, codec: BinaryCodec):
+        self.codec = codec
+        self.state = codec.new_state()
+
+    def encode(self, record: Any) -> bytes:
+        body = bytearray()
+        self.codec.write_record(self.state, body, record)
+        frame = bytearray()
+        write_varint(frame, len(body))
+        frame += body
+        return bytes(frame)
+
+    def encode_many(self, records: Iterable[Any]) -> bytes:
+        return b"".join(self.encode(record) for record in records)
+
+
+class StreamDecoder:
+    """Incremental decoder for StreamEncoder output.
+
+    `feed` accepts arbitrary chunks (for example socket reads) and returns the
+    records completed so far; an incomplete trailing frame is buffered.
+    """
+
+    def __init__(self, codec: BinaryCodec):
+        self.codec = codec
+        self.state = codec.new_state()
+        self._buffer = bytearray()
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        self._buffer += chunk
+        data = bytes(self._buffer)
+        records = []
+        position = 0
+
+        while position < len(data):
+            try:
+                length, body_start = read_varint(data, position)
+            except IndexError:
+                break  # Length prefix itself is incomplete
+            end = body_start + length
+            if end > len(data):
+                break
+
+            record, body_end = self.codec.read_record(
+                self.state, data, body_start)
+            if body_end != end:
+                raise ValueError("Frame length does not match its record")
+            records.append(record)
+            position = end
+
+        del self._buffer[:position]
+        return records
+
+    @property
+    def buffered_bytes(self) -> int:
+        return len(self._buffer)
@@ -0,0 +1,290 @@
+"""
+hook_sampling.py
+
+Head- and tail-based sampling for lifecycle hooks, so expensive hooks only do
+full work (printing, dict updates, quality scoring) for a fraction of runs:
+- SampledRunHooks: wraps any RunHooks
+- SampledAgentHooks: wraps any AgentHooks
+
+Key Concepts:
+- Head sampling: a deterministic hash of the run id decides up front, with a
+  sample rate per tenant or per entry agent
+- Tail sampling: unsampled runs buffer their events and replay them to the
+  wrapped hooks only if the run ended slow or errored
+- Cheap counters and a latency histogram still cover every run
+"""
+
+import hashlib
+import time
+from collections import Counter, OrderedDict
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from agents.lifecycle import AgentHooks, RunHooks
+from agents.tracing import get_current_trace
+
+from streaming_stats import FixedBucketHistogram
+
+
+TOOL_ERROR_PREFIX = "An error occurred while running the tool"
+
+# Set by run_scope(); the first hook event of the run records its context key here
+_run_scope: ContextVar[Optional[List[int]]] = ContextVar("hook_sampling_run_scope", default=None)
+
+
+def _user_context_value(context: Any, name: str) -> Any:
+    """`name` from the run's user context, as an attribute or a dict key."""
+    user_context = getattr(context, "context", None)
+    if isinstance(user_context, dict):
+        return user_context.get(name)
+    return getattr(user_context, name, None)
+
+
+def default_run_id(context: Any) -> str:
+    """Trace id when tracing is on, else the user context's `request_id`.
+
+    Both give the same decision for a run in every process. Runs with neither
+    fall back to the run context's identity, a memory address, so their head
+    decisions differ between processes.
+    """
+    current_trace = get_current_trace()
+    trace_id = getattr(current_trace, "trace_id", None)
+    if trace_id and trace_id != "no-op":
+        return trace_id
+    request_id = _user_context_value(context, "request_id")
+    if request_id is not None:
+        return str(request_id)
+    return str(id(context))
+
+
+def default_tenant(context: Any) -> Optional[str]:
+    """`tenant_id` from the user context, as an attribute or a dict key."""
+    return _user_context_value(context, "tenant_id")
+
+
+def default_is_error_result(result: Any) -> bool:
+    """Matches the message the SDK returns when a function tool raises."""
+    return isinstance(result, str) and result.startswith(TOOL_ERROR_PREFIX)
+
+
+# ================================
+# 1. Sampling Core
+# ================================
+
+class _SampledRun:
+    __slots__ = ("started", "sampled", "events", "errored", "overflowed")
+
+    def __init__(self, sampled: bool):
+        self.started = time.perf_counter()
+        self.sampled = sampled
+        self.events: List[Tuple[str, Tuple[Any, ...]]] = []
+        self.errored = False
+        self.overflowed = False
+
+
+class HookSampler:
+    """Per-run sampling decisions and counters shared by the hook wrappers.
+
+    A run is keyed by its run context and starts with its first event. The
+    head decision compares a hash of the run id against the rate for the run's
+    tenant (from `tenant_rates`), else its entry agent (`agent_rates`), else
+    `sample_rate`. Sampled runs go straight through to the wrapped hooks.
+    Other runs buffer up to `max_buffered_events` events; when the run ends
+    they are replayed if it took at least `slow_after` seconds or errored, and
+    dropped otherwise. Replayed events reach the wrapped hooks after the fact,
+    so hooks that time runs with their own clock see compressed durations.
+
+    A run that raises never reaches its end hook. Wrap Runner.run in
+    `run_scope()` so such runs are marked errored and finished, and so runs
+    whose end hook the wrapped hooks never see (AgentHooks of a handoff
+    source) are finished too. Without it they are evicted after
+    `max_open_runs` newer runs.
+    """
+
+    def __init__(self, inner: Any, sample_rate: float = 0.1,
+                 tenant_rates: Optional[Dict[str, float]] = None,
+                 agent_rates: Optional[Dict[str, float]] = None,
+                 slow_after: Optional[float] = 5.0,
+                 run_id_of: Callable[[Any], str] = default_run_id,
+                 tenant_of: Callable[[Any], Optional[str]] = default_tenant,
+                 is_error_result: Callable[[Any], bool] = default_is_error_result,
+                 max_buffered_events: int = 256, max_open_runs: int = 1000):
+        self.inner = inner
+        self.sample_rate = sample_rate
+        self.tenant_rates = tenant_rates or {}
+        self.agent_rates = agent_rates or {}
+        self.slow_after = slow_after
+        self.run_id_of = run_id_of
+        self.tenant_of = tenant_of
+        self.is_error_result = is_error_result
+        self.max_buffered_events = max_buffered_events
+        self.max_open_runs = max_open_runs
+
+        self.runs: "OrderedDict[int, _SampledRun]" = OrderedDict()
+        self.counters: Counter = Counter()
+        self.runs_by_agent: Counter = Counter()
+        self.run_latency = FixedBucketHistogram()
+
+    def rate_for(self, tenant: Optional[str], agent_name: str) -> float:
+        if tenant is not None and tenant in self.tenant_rates:
+            return self.tenant_rates[tenant]
+        return self.agent_rates.get(agent_name, self.sample_rate)
+
+    @staticmethod
+    def head_sampled(run_id: str, rate: float) -> bool:
+        """Deterministic: the same run id and rate always give the same answer."""
+        if rate >= 1.0:
+            return True
+        if rate <= 0.0:
+            return False
+        digest = hashlib.blake2b(run_id.encode(), digest_size=8).digest()
+        return int.from_bytes(digest, "big") < rate * (1 << 64)
+
+    def _begin(self, key: int, context: Any, agent: Any) -> _SampledRun:
+        rate = self.rate_for(self.tenant_of(context), agent.name)
+        run = self.runs[key] = _SampledRun(
+            self.head_sampled(self.run_id_of(context), rate))
+        self.counters["runs"] += 1
+        self.runs_by_agent[agent.name] += 1
+        if run.sampled:
+            self.counters["head_sampled"] += 1
+
+        scope = _run_scope.get()
+        if scope is not None:
+            scope.append(key)
+
+        while len(self.runs) > self.max_open_runs:
+            _, evicted = self.runs.popitem(last=False)
+            self.counters["evicted"] += 1
+            if not evicted.sampled:
+                self.counters["dropped"] += 1
+        return run
+
+    async def _event(self, callback: str, context: Any, *args: Any,
+                     ends_run: bool = False, error: bool = False) -> None:
+        key = id(context)
+        run = self.runs.get(key)
+        if run is None:
+            run = self._begin(key, context, args[0])
+        self.counters["events"] += 1
+        if error:
+            run.errored = True
+
+        if run.sampled:
+            self.counters["events_forwarded"] += 1
+            await getattr(self.inner, callback)(context, *args)
+        elif len(run.events) < self.max_buffered_events:
+            run.events.append((callback, (context, *args)))
+        else:
+            run.overflowed = True
+
+        if ends_run:
+            await self._finish(key)
+
+    async def _finish(self, key: int) -> None:
+        run = self.runs.pop(key, None)
+        if run is None:
+            return
+        duration = time.perf_counter() - run.started
+        self.run_latency.observe(duration)
+        if run.errored:
+            self.counters["errored"] += 1
+        if run.sampled:
+            return
+
+        slow = self.slow_after is not None and duration >= self.slow_after
+        if not (slow or run.errored):
+            self.counters["dropped"] += 1
+            return
+
+        self.counters["tail_kept_error" if run.errored else "tail_kept_slow"] += 1
+        if run.overflowed:
+            self.counters["tail_truncated"] += 1
+        for callback, args in run.events:
+            self.counters["events_forwarded"] += 1
+            await getattr(self.inner, callback)(*args)
+
+    @asynccontextmanager
+    async def run_scope(self) -> AsyncIterator[None]:
+        """Finish the enclosed run on exit, marking it errored if it raised."""
+        keys: List[int] = []
+        token = _run_scope.set(keys)
+        try:
+            yield
+        except BaseException:
+            for key in keys:
+                if key in self.runs:
+                    self.runs[key].errored = True
+            raise
+        finally:
+            _run_scope.reset(token)
+            for key in keys:
+                await self._finish(key)
+
+    def get_stats(self) -> Dict[str, Any]:
+        runs = self.counters["runs"]
+        return {
+            "runs": runs,
+            "open_runs": len(self.runs),
+            "head_sampled": self.counters["head_sampled"],
+            "tail_kept_slow": self.counters["tail_kept_slow"],
+            "tail_kept_error": self.counters["tail_kept_error"],
+            "tail_truncated": self.counters["tail_truncated"],
+            "dropped": self.counters["dropped"],
+            "evicted": self.counters["evicted"],
+            "errored": self.counters["errored"],
+            "events": self.counters["events"],
+            "events_forwarded": self.counters["events_forwarded"],
+            "runs_by_agent": dict(self.runs_by_agent),
+            "run_latency": {
+                "count": self.run_latency.count,
+                "p50": self.run_latency.quantile(0.5),
+                "p95": self.run_latency.quantile(0.95),
+                "p99": self.run_latency.quantile(0.99)
+            }
+        }
+
+
+# ================================
+# 2. Hook Wrappers
+# ================================
+
+class SampledRunHooks(HookSampler, RunHooks):
+    """Samples the callbacks of a wrapped RunHooks; a run ends at on_agent_end."""
+
+    async def on_agent_start(self, context: Any, agent: Any) -> None:
+        await self._event("on_agent_start", context, agent)
+
+    async def on_agent_end(self, context: Any, agent: Any, output: Any) -> None:
+        await self._event("on_agent_end", context, agent, output, ends_run=True)
+
+    async def on_handoff(self, context: Any, from_agent: Any, to_agent: Any) -> None:
+        await self._event("on_handoff", context, from_agent, to_agent)
+
+    async def on_tool_start(self, context: Any, agent: Any, tool: Any) -> None:
+        await self._event("on_tool_start", context, agent, tool)
+
+    async def on_tool_end(self, context: Any, agent: Any, tool: Any, result: str) -> None:
+        await self._event("on_tool_end", context, agent, tool, result,
+                          error=self.is_error_result(result))
+
+
+class SampledAgentHooks(HookSampler, AgentHooks):
+    """Samples the callbacks of a wrapped AgentHooks; a run ends at on_end."""
+
+    async def on_start(self, context: Any, agent: Any) -> None:
+        await self._event("on_start", context, agent)
+
+    async def on_end(self, context: Any, agent: Any, output: Any) -> None:
+        await self._event("on_end", context, agent, output, ends_run=True)
+
+    async def on_handoff(self, context: Any, agent: Any, source: Any) -> None:
+        await self._event("on_handoff", context, agent, source)
+
+    async def on_tool_start(self, context: Any, agent: Any, tool: Any) -> None:
+        await self._event("on_tool_start", context, agent, tool)
+
+    async def on_tool_end(self, context: Any, agent: Any, tool: Any, result: str) -> None:
+        await self._event("on_tool_end", context, agent, tool, result,
+                          error=self.is_error_result(result))
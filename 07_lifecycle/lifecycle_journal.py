@@ -0,0 +1,355 @@
+"""
+lifecycle_journal.py
+
+Append-only binary journal shared by the lifecycle monitoring examples. Metrics
+and lifecycle events are written as fixed-size records through a memory-mapped
+segment file, so restarts can rebuild in-memory aggregates by replaying them:
+- LifecycleJournal: mmap writer with periodic fsync and segment rotation
+- JournalRecord: one decoded record yielded by LifecycleJournal.replay()
+
+Key Concepts:
+- Fixed-size records packed into page-sized, CRC-sealed blocks
+- Strings interned once in a side table instead of repeated per record
+- Replay that skips JSON parsing entirely
+"""
+
+import json
+import mmap
+import os
+import struct
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+
+# ================================
+# 1. Record Format
+# ================================
+
+# Segments are split into page-sized blocks. The first block holds the segment
+# header; every other block holds a (record count, crc32) header and records.
+BLOCK_SIZE = 4096
+SEGMENT_HEADER = struct.Struct("<4sIII")  # magic, version, block size, record size
+SEGMENT_MAGIC = b"LCJ2"
+FORMAT_VERSION = 2
+
+BLOCK_HEADER = struct.Struct("<II8x")  # committed record count, crc32 of them
+
+# Record: flags, timestamp_ns, value and four symbol codes
+# (kind, name, agent, scope). 40 bytes, no per-record strings.
+RECORD = struct.Struct("<Iqdiiii")
+RECORD_SIZE = RECORD.size
+RECORDS_PER_BLOCK = (BLOCK_SIZE - BLOCK_HEADER.size) // RECORD_SIZE
+
+NO_SYMBOL = -1
+
+# Flag bits understood by the lifecycle examples
+FLAG_SLA_VIOLATION = 0x1
+FLAG_CONTINUATION = 0x2  # Record belongs to the same event as the previous one
+
+
+class JournalRecord(NamedTuple):
+    """One replayed journal record with its symbols resolved."""
+    flags: int
+    timestamp_ns: int
+    value: float
+    kind: str
+    name: Optional[str]
+    agent: Optional[str]
+    scope: Optional[str]
+
+
+# ================================
+# 2. Journal Writer and Replay
+# ================================
+
+class LifecycleJournal:
+    """Append-only journal of fixed-size records in memory-mapped segments.
+
+    Each segment is preallocated to `segment_blocks` blocks and mapped into
+    memory, so an append is a single struct pack into the mapping. A block is
+    sealed (record count and CRC written to its header) when it fills up and on
+    every sync; dirty pages are flushed at most every `fsync_interval` seconds
+    and on rotation or close. Strings are interned into `symbols.jsonl`, which
+    is fsynced as soon as a new symbol appears so that no durable record can
+    reference a missing symbol.
+
+    A reopened journal always starts a fresh segment and cuts a torn final
+    symbol line off before appending, so a torn tail left by a crash is never
+    appended to. Replay trusts only sealed records, so at most the records
+    appended since the last seal are lost.
+    """
+
+    SYMBOL_FILE = "symbols.jsonl"
+    SEGMENT_PATTERN = "segment-{:08d}.log"
+
+    def __init__(self, directory: Union[str, Path], segment_blocks: int = 8192,
+                 fsync_interval: float = 1.0, sync_check_every: int = 4096):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_blocks = segment_blocks
+        self.fsync_interval = fsync_interval
+        self.sync_check_every = sync_check_every
+
+        self.symbols: Dict[str, int] = {}
+        symbols, intact_bytes = self._read_symbols(self.directory)
+        for code, symbol in enumerate(symbols):
+            self.symbols[symbol] = code
+        symbol_path = self.directory / self.SYMBOL_FILE
+        if symbol_path.exists() and symbol_path.stat().st_size > intact_bytes:
+            # Drop a line torn by a crash, or new symbols would follow the fragment
+            os.truncate(symbol_path, intact_bytes)
+        self._symbol_file = open(symbol_path, "a", encoding="utf-8")
+
+        existing = self.segment_paths(self.directory)
+        self.segment_index = self._segment_number(
+            existing[-1]) + 1 if existing else 0
+        self._file = None
+        self._map: Optional[mmap.mmap] = None
+        self._block_start = 0
+        self._position = 0
+        self._block_end = 0
+        self._appends_since_check = 0
+        self._last_sync = time.monotonic()
+        self.stats = {"records": 0, "blocks": 0, "segments": 0, "syncs": 0}
+
+        self._open_segment()
+
+    # Symbols -----------------------------------------------------------
+
+    @classmethod
+    def _read_symbols(cls, directory: Path) -> Tuple[List[str], int]:
+        """Read the interned symbol table up to its first torn line.
+
+        Returns the symbols and the byte length of the intact lines.
+        """
+        path = directory / cls.SYMBOL_FILE
+        if not path.exists():
+            return [], 0
+
+        symbols = []
+        intact_bytes = 0
+        with open(path, "rb") as handle:
+            for line in handle:
+                if not line.endswith(b"\n"):
+                    break  # Cut off mid-write
+                try:
+                    symbols.append(json.loads(line))
+                except (UnicodeDecodeError, json.JSONDecodeError):
+                    break
+                intact_bytes += len(line)
+        return symbols, intact_bytes
+
+    @classmethod
+    def _load_symbols(cls, directory: Path) -> List[str]:
+        """Read the interned symbol table, ignoring a torn final line."""
+        return cls._read_symbols(directory)[0]
+
+    def intern(self, symbol: Optional[str]) -> int:
+        """Return the code for a symbol, persisting it the first time it is seen."""
+        if symbol is None:
+            return NO_SYMBOL
+        code = self.symbols.get(symbol)
+        if code is None:
+            code = self.symbols[symbol] = len(self.symbols)
+            self._symbol_file.write(json.dumps(symbol) + "\n")
+            self._symbol_file.flush()
+            os.fsync(self._symbol_file.fileno())
+        return code
+
+    # Segments and blocks -----------------------------------------------
+
+    @classmethod
+    def segment_paths(cls, directory: Union[str, Path]) -> List[Path]:
+        """Segment files in write order."""
+        return sorted(Path(directory).glob("segment-*.log"))
+
+    @staticmethod
+    def _segment_number(path: Path) -> int:
+        return int(path.stem.split("-")[1])
+
+    def _open_segment(self) -> None:
+        """Create, preallocate and map the next segment."""
+        path = self.directory / self.SEGMENT_PATTERN.format(self.segment_index)
+        size = BLOCK_SIZE * (self.segment_blocks + 1)
+
+        self._file = open(path, "w+b")
+        self._file.truncate(size)
+        self._map = mmap.mmap(self._file.fileno(), size)
+        SEGMENT_HEADER.pack_into(self._map, 0, SEGMENT_MAGIC, FORMAT_VERSION,
+                                 BLOCK_SIZE, RECORD_SIZE)
+        self.stats["segments"] += 1
+        self._start_block(BLOCK_SIZE)
+
+    def _start_block(self, block_start: int) -> None:
+        self._block_start = block_start
+        self._position = block_start + BLOCK_HEADER.size
+        self._block_end = self._position + RECORDS_PER_BLOCK * RECORD_SIZE
+
+    def _seal_block(self) -> None:
+        """Commit the records written so far in the current block."""
+        records_start = self._block_start + BLOCK_HEADER.size
+        count = (self._position - records_start) // RECORD_SIZE
+        if count:
+            BLOCK_HEADER.pack_into(self._map, self._block_start, count,
+                                   zlib.crc32(self._map[records_start:self._position]))
+
+    def _next_block(self) -> None:
+        """Seal the full block and move on, rotating segments when needed."""
+        self._seal_block()
+        self.stats["blocks"] += 1
+        next_start = self._block_start + BLOCK_SIZE
+        if next_start >= len(self._map):
+            self._rotate()
+        else:
+            self._start_block(next_start)
+
+    def _close_segment(self) -> None:
+        """Seal, flush and unmap the current segment."""
+        if self._map is None:
+            return
+        self._seal_block()
+        self._map.flush()
+        self._map.close()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        self._map = None
+        self._file = None
+
+    def _rotate(self) -> None:
+        """Close the full segment and start the next one."""
+        self._close_segment()
+        self.segment_index += 1
+        self._open_segment()
+
+    # Writing -----------------------------------------------------------
+
+    def append(self, kind: str, value: float, timestamp_ns: Optional[int] = None,
+               agent: Optional[str] = None, scope: Optional[str] = None,
+               name: Optional[str] = None, flags: int = 0) -> None:
+        """Append one record, interning its strings."""
+        self.append_encoded(self.intern(kind), value,
+                            time.time_ns() if timestamp_ns is None else timestamp_ns,
+                            self.intern(agent), self.intern(scope),
+                            self.intern(name), flags)
+
+    def append_encoded(self, kind_code: int, value: float, timestamp_ns: int,
+                       agent_code: int = NO_SYMBOL, scope_code: int = NO_SYMBOL,
+                       name_code: int = NO_SYMBOL, flags: int = 0) -> None:
+        """Append a record whose symbols were already interned (hot path)."""
+        if self._position == self._block_end:
+            self._next_block()
+
+        RECORD.pack_into(self._map, self._position, flags, timestamp_ns, value,
+                         kind_code, name_code, agent_code, scope_code)
+        self._position += RECORD_SIZE
+        self.stats["records"] += 1
+
+        # Only look at the clock every few thousand appends
+        self._appends_since_check += 1
+        if self._appends_since_check >= self.sync_check_every:
+            self._maybe_sync()
+
+    def append_many(self, kind_code: int, values: Iterable[float],
+                    timestamps_ns: Iterable[int], agent_code: int = NO_SYMBOL,
+                    scope_code: int = NO_SYMBOL, name_code: int = NO_SYMBOL,
+                    flags: int = 0) -> int:
+        """Append a batch of samples of one series, a block at a time.
+
+        Returns the number of records written.
+        """
+        pack = RECORD.pack
+        pending = [pack(flags, timestamp_ns, value, kind_code, name_code, agent_code, scope_code)
+                   for value, timestamp_ns in zip(values, timestamps_ns)]
+
+        written = 0
+        while written < len(pending):
+            if self._position == self._block_end:
+                self._next_block()
+            room = (self._block_end - self._position) // RECORD_SIZE
+            chunk = b"".join(pending[written:written + room])
+            self._map[self._position:self._position + len(chunk)] = chunk
+            self._position += len(chunk)
+            written += len(chunk) // RECORD_SIZE
+
+        self.stats["records"] += written
+        self._appends_since_check += written
+        if self._appends_since_check >= self.sync_check_every:
+            self._maybe_sync()
+        return written
+
+    def _maybe_sync(self) -> None:
+        self._appends_since_check = 0
+        if time.monotonic() - self._last_sync >= self.fsync_interval:
+            self.sync()
+
+    def sync(self) -> None:
+        """Seal the current block and flush dirty pages to disk."""
+        if self._map is not None:
+            self._seal_block()
+            self._map.flush()
+        self._last_sync = time.monotonic()
+        self.stats["syncs"] += 1
+
+    def close(self) -> None:
+        """Flush everything and release the files."""
+        self._close_segment()
+        self._symbol_file.close()
+
+    def __enter__(self) -> "LifecycleJournal":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Write counters plus the current segment."""
+        return {**self.stats, "current_segment": self.segment_index,
+                "symbols": len(self.symbols)}
+
+    # Replay ------------------------------------------------------------
+
+    @classmethod
+    def replay(cls, directory: Union[str, Path]) -> Iterator[JournalRecord]:
+        """Yield every committed record in write order.
+
+        A segment ends at its first block that is empty, partially sealed or
+        fails its CRC check, i.e. unwritten space or a write torn by a crash.
+        Records that reference a symbol missing from the table are skipped.
+        """
+        directory = Path(directory)
+        # Code -1 (NO_SYMBOL) indexes the trailing None
+        symbols: List[Optional[str]] = [*cls._load_symbols(directory), None]
+        known = len(symbols) - 1
+
+        for path in cls.segment_paths(directory):
+            with open(path, "rb") as handle:
+                data = handle.read()
+
+            if len(data) < BLOCK_SIZE:
+                continue
+            magic, version, block_size, record_size = SEGMENT_HEADER.unpack_from(
+                data, 0)
+            if (magic, version, block_size, record_size) != (SEGMENT_MAGIC, FORMAT_VERSION,
+                                                             BLOCK_SIZE, RECORD_SIZE):
+                raise ValueError(f"Unsupported journal segment: {path}")
+
+            view = memoryview(data)
+            for block_start in range(BLOCK_SIZE, len(data), BLOCK_SIZE):
+                count, crc = BLOCK_HEADER.unpack_from(view, block_start)
+                records_start = block_start + BLOCK_HEADER.size
+                records = view[records_start:records_start +
+                               count * RECORD_SIZE]
+                if not 0 < count <= RECORDS_PER_BLOCK or zlib.crc32(records) != crc:
+                    break
+
+                for flags, timestamp_ns, value, kind, name, agent, scope in RECORD.iter_unpack(records):
+                    if not (-1 <= kind < known and -1 <= name < known and
+                            -1 <= agent < known and -1 <= scope < known):
+                        continue  # Its symbol was lost; never index past the table
+                    yield JournalRecord(flags, timestamp_ns, value, symbols[kind],
+                                        symbols[name], symbols[agent], symbols[scope])
+
+                if count < RECORDS_PER_BLOCK:
+                    break  # Only the last block of a segment can be partial
@@ -0,0 +1,161 @@
+"""
+shm_ring.py
+
+Lock-free byte ring in `multiprocessing.shared_memory`, used by the lifecycle
+examples to move serialized events between processes without sockets or pickle:
+- SharedMemoryRing: single-producer / single-consumer ring of length-prefixed frames
+
+Key Concepts:
+- One ring per producer, so neither side ever takes a lock
+- Monotonic head/tail byte counters on separate cache lines
+- Frames carry their stream position and a CRC, so a consumer never accepts a
+  frame that is stale or only partly visible yet
+"""
+
+import struct
+import zlib
+from multiprocessing import shared_memory
+from typing import List, Optional
+
+
+# ================================
+# 1. Shared-Memory Ring Buffer
+# ================================
+
+class SharedMemoryRing:
+    """Single-producer / single-consumer ring of byte frames in shared memory.
+
+    Layout: a 128-byte control block (head counter and capacity on the first
+    cache line, tail counter on the second) followed by `capacity` data bytes.
+    Head and tail only grow; offsets are taken modulo the capacity. A frame that
+    does not fit before the end of the buffer is preceded by a wrap marker and
+    written at offset 0.
+    """
+
+    CONTROL_SIZE = 128
+    HEAD_OFFSET = 0
+    CAPACITY_OFFSET = 8
+    TAIL_OFFSET = 64
+    COUNTER = struct.Struct("<Q")
+    FRAME = struct.Struct("<IIQ")  # payload length, crc32, stream position
+    WRAP = 0xFFFFFFFF
+    ALIGN = 16  # Frame header size, so a wrap marker always fits before the end
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self.shm = shm
+        self.owner = owner
+        self.buffer = shm.buf
+        self.capacity = self.COUNTER.unpack_from(
+            self.buffer, self.CAPACITY_OFFSET)[0]
+        # Each side caches the other side's counter and re-reads it only when needed
+        self._head = self.COUNTER.unpack_from(self.buffer, self.HEAD_OFFSET)[0]
+        self._tail = self.COUNTER.unpack_from(self.buffer, self.TAIL_OFFSET)[0]
+        self.frames_written = 0
+        self.frames_read = 0
+        self.full_events = 0
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @classmethod
+    def create(cls, capacity: int = 1 << 22, name: Optional[str] = None) -> "SharedMemoryRing":
+        """Allocate a new ring; the creator unlinks it on close."""
+        if capacity % cls.ALIGN:
+            raise ValueError(f"capacity must be a multiple of {cls.ALIGN}")
+        shm = shared_memory.SharedMemory(
+            name=name, create=True, size=cls.CONTROL_SIZE + capacity)
+        shm.buf[:cls.CONTROL_SIZE] = bytes(cls.CONTROL_SIZE)
+        cls.COUNTER.pack_into(shm.buf, cls.CAPACITY_OFFSET, capacity)
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedMemoryRing":
+        """Open a ring created by another process."""
+        # The creating process owns cleanup, so keep the resource tracker out of it
+        return cls(shared_memory.SharedMemory(name=name, track=False), owner=False)
+
+    # Producer side -----------------------------------------------------
+
+    def try_write(self, payload: bytes) -> bool:
+        """Append one frame; return False (and write nothing) if the ring is full."""
+        frame_size = (self.FRAME.size + len(payload) +
+                      self.ALIGN - 1) & ~(self.ALIGN - 1)
+        if frame_size > self.capacity:
+            raise ValueError("Frame larger than the ring capacity")
+
+        head = self._head
+        offset = head % self.capacity
+        contiguous = self.capacity - offset
+        needed = frame_size if frame_size <= contiguous else contiguous + frame_size
+
+        if head + needed - self._tail > self.capacity:
+            self._tail = self.COUNTER.unpack_from(
+                self.buffer, self.TAIL_OFFSET)[0]
+            if head + needed - self._tail > self.capacity:
+                self.full_events += 1
+                return False
+
+        start = self.CONTROL_SIZE + offset
+        if frame_size > contiguous:
+            self.FRAME.pack_into(self.buffer, start, self.WRAP, 0, head)
+            head += contiguous
+            start = self.CONTROL_SIZE
+
+        self.FRAME.pack_into(self.buffer, start, len(payload),
+                             zlib.crc32(payload), head)
+        payload_start = start + self.FRAME.size
+        self.buffer[payload_start:payload_start + len(payload)] = payload
+
+        # Publishing the new head makes the frame visible to the consumer
+        self._head = head + frame_size
+        self.COUNTER.pack_into(self.buffer, self.HEAD_OFFSET, self._head)
+        self.frames_written += 1
+        return True
+
+    # Consumer side -----------------------------------------------------
+
+    def read_batch(self, max_frames: int = 1024) -> List[bytes]:
+        """Pop up to `max_frames` complete frames, oldest first."""
+        head = self.COUNTER.unpack_from(self.buffer, self.HEAD_OFFSET)[0]
+        tail = self._tail
+        frames = []
+
+        while tail < head and len(frames) < max_frames:
+            offset = tail % self.capacity
+            start = self.CONTROL_SIZE + offset
+            length, crc, position = self.FRAME.unpack_from(self.buffer, start)
+            if position != tail:
+                break  # Frame header not visible yet; retry on the next poll
+
+            if length == self.WRAP:
+                tail += self.capacity - offset
+                continue
+
+            payload_start = start + self.FRAME.size
+            payload = bytes(self.buffer[payload_start:payload_start + length])
+            if zlib.crc32(payload) != crc:
+                break  # Payload not fully visible yet
+
+            frames.append(payload)
+            tail += (self.FRAME.size + length +
+                     self.ALIGN - 1) & ~(self.ALIGN - 1)
+
+        if tail != self._tail:
+            self._tail = tail
+            self.COUNTER.pack_into(self.buffer, self.TAIL_OFFSET, tail)
+            self.frames_read += len(frames)
+        return frames
+
+    def pending_bytes(self) -> int:
+        """Bytes written but not yet consumed."""
+        head = self.COUNTER.unpack_from(self.buffer, self.HEAD_OFFSET)[0]
+        tail = self.COUNTER.unpack_from(self.buffer, self.TAIL_OFFSET)[0]
+        return head - tail
+
+    def close(self) -> None:
+        """Detach; the creating process also frees the segment."""
+        self.buffer = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
@@ -0,0 +1,407 @@
+"""
+streaming_stats.py
+
+Streaming statistics shared by the lifecycle examples. Everything here updates in
+O(1) per sample and keeps bounded memory, so it can sit on the hook hot path:
+- QuantileSketch: mergeable DDSketch-style quantile sketch (p50/p90/p95/p99)
+- OnlineTrendEstimator: EWMA, streaming least-squares slope and change points
+- FixedBucketHistogram: cumulative-bucket histogram for metrics exposition
+
+Key Concepts:
+- Relative-error quantiles without storing raw samples
+- Sketches from several worker processes merge into one fleet-wide view
+- Trend detection without re-slicing value histories
+"""
+
+import bisect
+import math
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+# ================================
+# 1. Quantile Sketch
+# ================================
+
+class QuantileSketch:
+    """DDSketch-style quantile sketch with a relative-accuracy guarantee.
+
+    Values are mapped to logarithmic bins of width `gamma`, so any reported
+    quantile is within `relative_accuracy` of the true value. The number of bins
+    is capped at `max_bins`; when the cap is hit the lowest bins are collapsed,
+    which only costs accuracy on the smallest values.
+    """
+
+    DEFAULT_QUANTILES = (0.5, 0.9, 0.95, 0.99)
+    MIN_INDEXABLE_VALUE = 1e-9
+
+    def __init__(self, relative_accuracy: float = 0.01, max_bins: int = 2048):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+
+        self.positive_bins: Dict[int, int] = {}
+        self.negative_bins: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    def _key(self, value: float) -> int:
+        """Logarithmic bin index for a positive value."""
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def _bin_value(self, key: int) -> float:
+        """Representative value of a bin (midpoint in relative terms)."""
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def add(self, value: float, weight: int = 1) -> None:
+        """Add a value to the sketch."""
+        if value > self.MIN_INDEXABLE_VALUE:
+            key = self._key(value)
+            self.positive_bins[key] = self.positive_bins.get(key, 0) + weight
+            if len(self.positive_bins) > self.max_bins:
+                self._collapse(self.positive_bins, lowest=True)
+        elif value < -self.MIN_INDEXABLE_VALUE:
+            key = self._key(-value)
+            self.negative_bins[key] = self.negative_bins.get(key, 0) + weight
+            if len(self.negative_bins) > self.max_bins:
+                self._collapse(self.negative_bins, lowest=False)
+        else:
+            self.zero_count += weight
+
+        self.count += weight
+        self.total += value * weight
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+
+    def add_many(self, values: Iterable[float]) -> None:
+        """Add a batch of values; the bin cap is enforced once at the end."""
+        log_gamma = self._log_gamma
+        positive_bins = self.positive_bins
+        added = []
+        for value in values:
+            if value > self.MIN_INDEXABLE_VALUE:
+                key = math.ceil(math.log(value) / log_gamma)
+                positive_bins[key] = positive_bins.get(key, 0) + 1
+                added.append(value)
+            else:
+                self.add(value)
+
+        if not added:
+            return
+        if len(positive_bins) > self.max_bins:
+            self._collapse(positive_bins, lowest=True)
+        self.count += len(added)
+        self.total += sum(added)
+        self.minimum = min(self.minimum, min(added))
+        self.maximum = max(self.maximum, max(added))
+
+    def _collapse(self, bins: Dict[int, int], lowest: bool) -> None:
+        """Fold the extreme bins together until the bin cap is respected."""
+        keys = sorted(bins, reverse=not lowest)
+        excess = len(bins) - self.max_bins
+        target = keys[excess]
+        for key in keys[:excess]:
+            bins[target] += bins.pop(key)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Return the approximate value at quantile `q` (0 <= q <= 1)."""
+        if self.count == 0:
+            return None
+        if q <= 0:
+            return self.minimum
+        if q >= 1:
+            return self.maximum
+
+        rank = q * (self.count - 1)
+        seen = 0
+
+        # Negative values: largest magnitude first
+        for key in sorted(self.negative_bins, reverse=True):
+            seen += self.negative_bins[key]
+            if seen > rank:
+                return max(self.minimum, -self._bin_value(key))
+
+        seen += self.zero_count
+        if seen > rank:
+            return 0.0
+
+        for key in sorted(self.positive_bins):
+            seen += self.positive_bins[key]
+            if seen > rank:
+                return min(self.maximum, self._bin_value(key))
+
+        return self.maximum
+
+    def quantiles(self, qs: Iterable[float] = DEFAULT_QUANTILES) -> Dict[str, Optional[float]]:
+        """Return several quantiles keyed as p50, p90, p95, p99, ..."""
+        return {f"p{q * 100:g}": self.quantile(q) for q in qs}
+
+    @property
+    def average(self) -> float:
+        """Exact mean of every value added."""
+        return self.total / self.count if self.count else 0.0
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """Fold another sketch (e.g. from another worker) into this one."""
+        if not math.isclose(self.gamma, other.gamma):
+            raise ValueError(
+                "Cannot merge sketches with different relative accuracy")
+
+        for key, weight in other.positive_bins.items():
+            self.positive_bins[key] = self.positive_bins.get(key, 0) + weight
+        for key, weight in other.negative_bins.items():
+            self.negative_bins[key] = self.negative_bins.get(key, 0) + weight
+
+        if len(self.positive_bins) > self.max_bins:
+            self._collapse(self.positive_bins, lowest=True)
+        if len(self.negative_bins) > self.max_bins:
+            self._collapse(self.negative_bins, lowest=False)
+
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.total += other.total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable form for shipping sketches between processes."""
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "max_bins": self.max_bins,
+            "positive_bins": [[key, weight] for key, weight in self.positive_bins.items()],
+            "negative_bins": [[key, weight] for key, weight in self.negative_bins.items()],
+            "zero_count": self.zero_count,
+            "count": self.count,
+            "total": self.total,
+            "minimum": self.minimum if self.count else None,
+            "maximum": self.maximum if self.count else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "QuantileSketch":
+        """Rebuild a sketch produced by `to_dict`."""
+        sketch = cls(data["relative_accuracy"], data["max_bins"])
+        sketch.positive_bins = {int(k): int(w) for k, w in data["positive_bins"]}
+        sketch.negative_bins = {int(k): int(w) for k, w in data["negative_bins"]}
+        sketch.zero_count = data["zero_count"]
+        sketch.count = data["count"]
+        sketch.total = data["total"]
+        if data["count"]:
+            sketch.minimum = data["minimum"]
+            sketch.maximum = data["maximum"]
+        return sketch
+
+    @classmethod
+    def merged(cls, sketches: List["QuantileSketch"]) -> "QuantileSketch":
+        """Return a new sketch combining all of `sketches`."""
+        if not sketches:
+            return cls()
+        result = cls(sketches[0].relative_accuracy, sketches[0].max_bins)
+        for sketch in sketches:
+            result.merge(sketch)
+        return result
+
+
+# ================================
+# 2. Online Trend Estimation
+# ================================
+
+class OnlineTrendEstimator:
+    """EWMA, least-squares slope and change-point signal, updated in O(1).
+
+    The slope is a least-squares fit of value against sample index with
+    exponential forgetting (`decay`), so it tracks the recent trend over an
+    effective window of about 1 / (1 - decay) samples. Change points come from
+    a two-sided CUSUM on detrended residuals, in units of their running
+    standard deviation. The residual is taken against the EWMA plus the slope
+    scaled by 1 / alpha, which is where the EWMA predicts the next sample on a
+    steady linear trend (it lags such a trend by slope * (1 - alpha) / alpha),
+    so a constant trend is not reported as a change.
+    """
+
+    def __init__(self, alpha: float = 0.2, decay: float = 0.98,
+                 change_threshold: float = 5.0, change_drift: float = 0.5,
+                 warmup_samples: int = 5):
+        self.alpha = alpha
+        self.decay = decay
+        self.change_threshold = change_threshold
+        self.change_drift = change_drift
+        self.warmup_samples = warmup_samples
+
+        self.samples = 0
+        self.ewma = 0.0
+        self.ewm_variance = 0.0
+
+        # Exponentially weighted regression state (value vs sample index)
+        self.weight = 0.0
+        self.mean_index = 0.0
+        self.mean_value = 0.0
+        self.covariance = 0.0
+        self.index_variance = 0.0
+
+        # Two-sided CUSUM state
+        self.cusum_high = 0.0
+        self.cusum_low = 0.0
+        self.change_points = 0
+        self.last_change_sample: Optional[int] = None
+
+    def update(self, value: float) -> None:
+        """Fold one sample into every statistic."""
+        self.samples += 1
+        index = float(self.samples)
+
+        if self.samples == 1:
+            self.ewma = value
+        else:
+            deviation = value - self.ewma
+            residual = value - (self.ewma + self.slope / self.alpha)
+            std = math.sqrt(self.ewm_variance)
+
+            # Change-point detection on the standardized, detrended residual
+            if self.samples > self.warmup_samples and std > 0:
+                z = residual / std
+                self.cusum_high = max(
+                    0.0, self.cusum_high + z - self.change_drift)
+                self.cusum_low = max(
+                    0.0, self.cusum_low - z - self.change_drift)
+                if self.cusum_high > self.change_threshold or self.cusum_low > self.change_threshold:
+                    self.change_points += 1
+                    self.last_change_sample = self.samples
+                    self.cusum_high = self.cusum_low = 0.0
+
+            self.ewma += self.alpha * deviation
+            self.ewm_variance = (1 - self.alpha) * \
+                (self.ewm_variance + self.alpha * residual * residual)
+
+        # Weighted incremental covariance with forgetting factor
+        self.weight = self.decay * self.weight + 1.0
+        index_delta = index - self.mean_index
+        self.mean_index += index_delta / self.weight
+        value_delta = value - self.mean_value
+        self.mean_value += value_delta / self.weight
+        self.covariance = self.decay * self.covariance + \
+            index_delta * (value - self.mean_value)
+        self.index_variance = self.decay * self.index_variance + \
+            index_delta * (index - self.mean_index)
+
+    @property
+    def slope(self) -> float:
+        """Least-squares change in value per sample over the effective window."""
+        if self.index_variance <= 0:
+            return 0.0
+        return self.covariance / self.index_variance
+
+    def change(self) -> float:
+        """Fitted difference between the later and earlier half of the window."""
+        return self.slope * self.weight / 2
+
+    def change_percent(self) -> float:
+        """`change()` relative to the window mean, in percent."""
+        if abs(self.mean_value) < 1e-12:
+            return 0.0
+        return self.change() / abs(self.mean_value) * 100
+
+    def trend(self, threshold: float = 5.0, relative: bool = True, min_samples: int = 2) -> str:
+        """Classify as increasing, decreasing or stable.
+
+        `threshold` is a percentage of the mean when `relative`, otherwise an
+        absolute change in value.
+        """
+        if self.samples < min_samples:
+            return "insufficient_data"
+
+        change = self.change_percent() if relative else self.change()
+        if change > threshold:
+            return "increasing"
+        elif change < -threshold:
+            return "decreasing"
+        else:
+            return "stable"
+
+    @property
+    def change_detected(self) -> bool:
+        """Whether a change point fired within the current effective window."""
+        return (self.last_change_sample is not None
+                and self.samples - self.last_change_sample < self.weight)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current estimator state for reports."""
+        return {
+            "samples": self.samples,
+            "ewma": self.ewma,
+            "slope": self.slope,
+            "change_percent": self.change_percent(),
+            "change_points": self.change_points,
+            "change_detected": self.change_detected
+        }
+
+
+# ================================
+# 3. Fixed-Bucket Histogram
+# ================================
+
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25,
+                           0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class FixedBucketHistogram:
+    """Histogram over fixed upper bounds, as exposed by Prometheus/OpenMetrics.
+
+    Observations cost one binary search; reading the cumulative buckets costs
+    O(buckets) regardless of how many values were observed.
+    """
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        self.bounds = tuple(sorted(bounds))
+        # One extra slot for values above the last bound (+Inf)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        """Count a value in the first bucket whose bound is >= value."""
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def merge(self, other: "FixedBucketHistogram") -> None:
+        """Fold in a histogram with the same bounds."""
+        if self.bounds != other.bounds:
+            raise ValueError("Cannot merge histograms with different bounds")
+        for index, count in enumerate(other.counts):
+            self.counts[index] += count
+        self.count += other.count
+        self.total += other.total
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a quantile by linear interpolation inside its bucket,
+        like PromQL's histogram_quantile. Values above the last bound report
+        the last bound."""
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        running = 0
+        for index, count in enumerate(self.counts):
+            if count and running + count >= rank:
+                if index == len(self.bounds):
+                    return self.bounds[-1]
+                lower = self.bounds[index - 1] if index else 0.0
+                upper = self.bounds[index]
+                return lower + (upper - lower) * (rank - running) / count
+            running += count
+        return self.bounds[-1]
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        """(upper bound, observations <= bound) pairs, ending with +Inf."""
+        result = []
+        running = 0
+        for bound, count in zip((*self.bounds, math.inf), self.counts):
+            running += count
+            result.append((bound, running))
+        return result
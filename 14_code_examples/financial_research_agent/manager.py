@@ -2,11 +2,12 @@ from __future__ import annotations
 
 import asyncio
 import time
-from collections.abc import Sequence
+from collections.abc import Awaitable, Callable, Hashable, Sequence
+from typing import Protocol, TypeVar
 
 from rich.console import Console
 
-from agents import Runner, RunResult, custom_span, gen_trace_id, trace
+from agents import RunConfig, Runner, RunResult, custom_span, gen_trace_id, trace
 
 from .agents.financials_agent import financials_agent
 from .agents.planner_agent import FinancialSearchItem, FinancialSearchPlan, planner_agent
@@ -16,6 +17,36 @@ from .agents.verifier_agent import VerificationResult, verifier_agent
 from .agents.writer_agent import FinancialReportData, writer_agent
 from .printer import Printer
 
+T = TypeVar("T")
+
+
+# The research_bot example's AdaptiveSearchScheduler, SearchResultCache and
+# HedgedRequests satisfy these; the caller passes them in, so this example
+# stays self-contained.
+class SearchScheduler(Protocol):
+    def new_job(self) -> Hashable: ...
+
+    async def run(self, job: Hashable, call: Callable[[], Awaitable[T]]) -> T: ...
+
+    def try_acquire(self) -> bool: ...
+
+    def release(self) -> None: ...
+
+
+class SearchCache(Protocol):
+    async def get_or_compute(
+        self, namespace: str, query: str, compute: Callable[[], Awaitable[str]]
+    ) -> str: ...
+
+
+class SearchHedger(Protocol):
+    async def run(
+        self,
+        call: Callable[[], Awaitable[T]],
+        acquire_hedge: Callable[[], bool] | None = None,
+        release_hedge: Callable[[], None] | None = None,
+    ) -> T: ...
+
 
 async def _summary_extractor(run_result: RunResult) -> str:
     """Custom output extractor for sub‑agents that return an AnalysisSummary."""
@@ -29,9 +60,23 @@ class FinancialResearchManager:
     Orchestrates the full flow: planning, searching, sub‑analysis, writing, and verification.
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        scheduler: SearchScheduler | None = None,
+        cache: SearchCache | None = None,
+        hedger: SearchHedger | None = None,
+        search_run_config: RunConfig | None = None,
+    ) -> None:
         self.console = Console()
         self.printer = Printer(self.console)
+        # Optional; pass the research bot's shared instances so both bots respect the
+        # same rate limits and reuse each other's search results. Without them,
+        # searches run directly.
+        self.scheduler = scheduler
+        self.cache = cache
+        # Bounds each search and hedges slow ones; search_run_config can swap in a fake model
+        self.hedger = hedger
+        self.search_run_config = search_run_config
 
     async def run(self, query: str) -> None:
         trace_id = gen_trace_id()
@@ -74,7 +119,8 @@ class FinancialResearchManager:
     async def _perform_searches(self, search_plan: FinancialSearchPlan) -> Sequence[str]:
         with custom_span("Search the web"):
             self.printer.update_item("searching", "Searching...")
-            tasks = [asyncio.create_task(self._search(item)) for item in search_plan.searches]
+            job = self.scheduler.new_job() if self.scheduler is not None else None
+            tasks = [asyncio.create_task(self._search(item, job)) for item in search_plan.searches]
             results: list[str] = []
             num_completed = 0
             for task in asyncio.as_completed(tasks):
@@ -88,14 +134,37 @@ class FinancialResearchManager:
             self.printer.mark_item_done("searching")
             return results
 
-    async def _search(self, item: FinancialSearchItem) -> str | None:
+    async def _search(self, item: FinancialSearchItem, job: Hashable | None) -> str | None:
         input_data = f"Search term: {item.query}\nReason: {item.reason}"
         try:
-            result = await Runner.run(search_agent, input_data)
-            return str(result.final_output)
+            if self.cache is None:
+                return await self._run_search(input_data, job)
+            return await self.cache.get_or_compute(
+                search_agent.name, item.query, lambda: self._run_search(input_data, job)
+            )
         except Exception:
             return None
 
+    async def _run_search(self, input_data: str, job: Hashable | None) -> str:
+        scheduler, hedger = self.scheduler, self.hedger
+
+        def search() -> Awaitable[RunResult]:
+            return Runner.run(search_agent, input_data, run_config=self.search_run_config)
+
+        def hedged_search() -> Awaitable[RunResult]:
+            # Hedge inside the admitted call, so queueing time never counts toward the
+            # hedge delay or the deadline; a hedge fires only if it gets a slot of its own
+            assert hedger is not None
+            if scheduler is None:
+                return hedger.run(search)
+            return hedger.run(
+                search, acquire_hedge=scheduler.try_acquire, release_hedge=scheduler.release
+            )
+
+        call = search if hedger is None else hedged_search
+        result = await (scheduler.run(job, call) if scheduler is not None else call())
+        return str(result.final_output)
+
     async def _write_report(self, query: str, search_results: Sequence[str]) -> FinancialReportData:
         # Expose the specialist analysts as tools so the writer can invoke them inline
         # and still produce the final FinancialReportData output.
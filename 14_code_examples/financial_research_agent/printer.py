@@ -1,4 +1,8 @@
-from typing import Any
+import asyncio
+import json
+import sys
+import time
+from typing import Any, TextIO
 
 from rich.console import Console, Group
 from rich.live import Live
@@ -9,16 +13,41 @@ class Printer:
     """
     Simple wrapper to stream status updates. Used by the financial bot
     manager as it orchestrates planning, search and writing.
+
+    Updates only mark state dirty; a timer on the event loop renders at most
+    `max_fps` frames per second. Without a terminal, progress is written as
+    JSON lines to `stream` (stderr by default) instead of a live display.
     """
 
-    def __init__(self, console: Console) -> None:
-        self.live = Live(console=console)
+    def __init__(
+        self,
+        console: Console,
+        max_fps: float = 10,
+        headless: bool | None = None,
+        stream: TextIO | None = None,
+    ) -> None:
+        self.headless = not console.is_terminal if headless is None else headless
+        self.stream = stream or sys.stderr
+        self.frame_interval = 1 / max_fps
         self.items: dict[str, tuple[str, bool]] = {}
         self.hide_done_ids: set[str] = set()
-        self.live.start()
+        self.changed_ids: set[str] = set()
+        self.frames = 0
+        self._last_frame = float("-inf")
+        self._timer: asyncio.TimerHandle | None = None
+        self.live: Live | None = None
+        if not self.headless:
+            self.live = Live(console=console, refresh_per_second=max_fps)
+            self.live.start()
 
     def end(self) -> None:
-        self.live.stop()
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self.changed_ids:
+            self.flush()
+        if self.live is not None:
+            self.live.stop()
 
     def hide_done_checkmark(self, item_id: str) -> None:
         self.hide_done_ids.add(item_id)
@@ -29,13 +58,44 @@ class Printer:
         self.items[item_id] = (content, is_done)
         if hide_checkmark:
             self.hide_done_ids.add(item_id)
-        self.flush()
+        self._mark_dirty(item_id)
 
     def mark_item_done(self, item_id: str) -> None:
         self.items[item_id] = (self.items[item_id][0], True)
-        self.flush()
+        self._mark_dirty(item_id)
+
+    def _mark_dirty(self, item_id: str) -> None:
+        self.changed_ids.add(item_id)
+        if self._timer is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop to tick on, so render right away
+            self.flush()
+            return
+        delay = max(0.0, self._last_frame + self.frame_interval - time.monotonic())
+        self._timer = loop.call_later(delay, self._tick)
+
+    def _tick(self) -> None:
+        self._timer = None
+        if self.changed_ids:
+            self.flush()
 
     def flush(self) -> None:
+        self.frames += 1
+        self._last_frame = time.monotonic()
+        changed, self.changed_ids = self.changed_ids, set()
+
+        if self.live is None:
+            for item_id in self.items:
+                if item_id in changed:
+                    content, is_done = self.items[item_id]
+                    record = {"ts": time.time(), "item": item_id, "content": content, "done": is_done}
+                    self.stream.write(json.dumps(record) + "\n")
+            self.stream.flush()
+            return
+
         renderables: list[Any] = []
         for item_id, (content, is_done) in self.items.items():
             if is_done:
@@ -0,0 +1,16 @@
+# Agent used to fold search summaries into running notes while other searches are still going.
+from agents import Agent
+
+PROMPT = (
+    "You are a research assistant keeping working notes for a report writer. You will be given "
+    "the original query, the current notes (which may be empty) and a few new search summaries.\n"
+    "Merge the new summaries into the notes and return the updated notes. Keep every distinct "
+    "fact, figure and source, drop repetition, and group the notes under short headings that "
+    "could become sections of the final report. Keep the notes under 800 words."
+)
+
+synthesis_agent = Agent(
+    name="SynthesisAgent",
+    instructions=PROMPT,
+    model="gpt-4o-mini",
+)
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+from collections import Counter
+from collections.abc import Callable
+
+from openai.types.responses import ResponseOutputMessage, ResponseOutputText
+
+from agents.items import ModelResponse
+from agents.models.interface import Model
+from agents.usage import Usage
+
+
+class FakeSearchModel(Model):
+    """Deterministic in-process stand-in for the search agent's model, with injected latency.
+
+    The summary depends only on the input, so a hedged duplicate returns exactly what
+    the request it duplicates would have. `latency(input, attempt)` gives the delay of the
+    attempt-th call with that input (0 for the first), so a test can make just the
+    primary request slow. Use it via `RunConfig(model=FakeSearchModel(...))`.
+    """
+
+    def __init__(self, latency: Callable[[str, int], float] | None = None) -> None:
+        self.latency = latency or (lambda input, attempt: 0.0)
+        self.attempts: Counter[str] = Counter()
+
+    async def get_response(
+        self,
+        system_instructions,
+        input,
+        model_settings,
+        tools,
+        output_schema,
+        handoffs,
+        tracing,
+        *,
+        previous_response_id=None,
+    ) -> ModelResponse:
+        text = input if isinstance(input, str) else str(input[-1].get("content", ""))
+        attempt = self.attempts[text]
+        self.attempts[text] += 1
+        await asyncio.sleep(self.latency(text, attempt))
+
+        digest = hashlib.sha256(text.encode()).hexdigest()[:12]
+        summary = f"Summary {digest}: {text.splitlines()[0]}"
+        return ModelResponse(
+            output=[
+                ResponseOutputMessage(
+                    id=f"msg_{digest}",
+                    type="message",
+                    role="assistant",
+                    status="completed",
+                    content=[ResponseOutputText(type="output_text", text=summary, annotations=[])],
+                )
+            ],
+            usage=Usage(requests=1),
+            response_id=None,
+        )
+
+    def stream_response(self, *args, **kwargs):
+        raise NotImplementedError("FakeSearchModel only serves non-streamed runs")
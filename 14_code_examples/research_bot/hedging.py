@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import asyncio
+from collections import Counter, deque
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+class HedgedRequests:
+    """Deadline-bounded calls that fire one duplicate when the first runs slow.
+
+    The hedge fires once a call has run longer than the p90 of recent
+    successful calls (`initial_hedge_after` until `min_samples` are seen).
+    A call that finishes or fails before then is returned as is. Once hedged,
+    the first copy to succeed wins and the other is cancelled; a copy that
+    fails leaves the other one running. Past `deadline` seconds, counted from
+    the first copy, every copy is cancelled and TimeoutError is raised.
+    Copies must be idempotent, since both may do the work.
+
+    The clock starts when `run` is called, so call it once a call has been
+    admitted (e.g. inside `AdaptiveSearchScheduler.run`): wrapping the queue
+    would hedge and time out calls that were only waiting for a slot. The
+    hedge is an extra provider call, so it needs its own admission: pass
+    `acquire_hedge` (non-blocking, e.g. `scheduler.try_acquire`) and
+    `release_hedge`, and the hedge is skipped when no slot is free.
+    """
+
+    def __init__(
+        self,
+        deadline: float | None = 60.0,
+        initial_hedge_after: float = 15.0,
+        quantile: float = 0.9,
+        window: int = 200,
+        min_samples: int = 10,
+    ) -> None:
+        self.deadline = deadline
+        self.initial_hedge_after = initial_hedge_after
+        self.quantile = quantile
+        self.min_samples = min_samples
+        self.latencies: deque[float] = deque(maxlen=window)
+        self.metrics: Counter[str] = Counter()
+
+    def hedge_after(self) -> float:
+        """Current hedge delay: the configured quantile of the latency window."""
+        if len(self.latencies) < self.min_samples:
+            return self.initial_hedge_after
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(self.quantile * len(ordered)))]
+
+    async def run(
+        self,
+        call: Callable[[], Awaitable[T]],
+        acquire_hedge: Callable[[], bool] | None = None,
+        release_hedge: Callable[[], None] | None = None,
+    ) -> T:
+        self.metrics["calls"] += 1
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        hedge_after = self.hedge_after()
+        primary = asyncio.ensure_future(call())
+        starts = {primary: started}
+        hedge: asyncio.Future[T] | None = None
+        try:
+            first_wait = hedge_after if self.deadline is None else min(hedge_after, self.deadline)
+            done, _ = await asyncio.wait({primary}, timeout=first_wait)
+            if done:
+                # Finished (or failed) before it was slow: nothing to hedge
+                result = primary.result()
+                self.latencies.append(loop.time() - started)
+                return result
+            if self.deadline is not None and hedge_after >= self.deadline:
+                self._deadline_exceeded()
+
+            pending: set[asyncio.Future[T]] = {primary}
+            if acquire_hedge is None or acquire_hedge():
+                self.metrics["hedged"] += 1
+                hedge = asyncio.ensure_future(call())
+                if release_hedge is not None:
+                    # Hand the slot back once the copy has really stopped
+                    hedge.add_done_callback(lambda _: release_hedge())
+                starts[hedge] = loop.time()
+                pending.add(hedge)
+            else:
+                self.metrics["hedge_skipped"] += 1
+
+            error: BaseException | None = None
+            while pending:
+                timeout = (
+                    None
+                    if self.deadline is None
+                    else max(0.0, started + self.deadline - loop.time())
+                )
+                done, pending = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    self._deadline_exceeded()
+                for task in done:
+                    if task.exception() is None:
+                        self.latencies.append(loop.time() - starts[task])
+                        if hedge is not None:
+                            self.metrics["hedge_wins" if task is hedge else "primary_wins"] += 1
+                        return task.result()
+                    error = task.exception()
+            assert error is not None
+            raise error
+        finally:
+            for task in starts:
+                if not task.done():
+                    task.cancel()
+
+    def _deadline_exceeded(self) -> None:
+        self.metrics["deadline_exceeded"] += 1
+        raise TimeoutError(f"No result within {self.deadline:.1f}s")
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            **self.metrics,
+            "hedge_after": round(self.hedge_after(), 3),
+            "samples": len(self.latencies),
+        }
+
+
+# Shared so the latency window reflects every research job in the process
+default_hedger = HedgedRequests()
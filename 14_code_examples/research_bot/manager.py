@@ -1,22 +1,50 @@
 from __future__ import annotations
 
 import asyncio
+import math
 import time
 
 from rich.console import Console
 
-from agents import Runner, custom_span, gen_trace_id, trace
+from agents import RunConfig, Runner, custom_span, gen_trace_id, trace
 
 from .agents.planner_agent import WebSearchItem, WebSearchPlan, planner_agent
 from .agents.search_agent import search_agent
 from .agents.writer_agent import ReportData, writer_agent
 from .printer import Printer
+from .hedging import HedgedRequests, default_hedger
+from .search_cache import SearchResultCache, default_cache
+from .search_scheduler import AdaptiveSearchScheduler, default_scheduler
+from .synthesis import RunningSynthesis
 
 
 class ResearchManager:
-    def __init__(self):
+    def __init__(
+        self,
+        scheduler: AdaptiveSearchScheduler | None = None,
+        cache: SearchResultCache | None = None,
+        hedger: HedgedRequests | None = None,
+        search_run_config: RunConfig | None = None,
+        pipelined: bool = False,
+        quorum: float = 0.8,
+        straggler_cutoff: float = 20.0,
+        synthesis_batch_size: int = 3,
+    ):
         self.console = Console()
         self.printer = Printer(self.console)
+        # Shared by default, so concurrent research jobs respect the same rate limits
+        # and reuse each other's search results
+        self.scheduler = scheduler or default_scheduler
+        self.cache = cache or default_cache
+        # Bounds each search and hedges slow ones; search_run_config can swap in a fake model
+        self.hedger = hedger or default_hedger
+        self.search_run_config = search_run_config
+        # Pipelined mode folds summaries into running notes as they arrive, and writes once
+        # `quorum` of the searches are done plus at most `straggler_cutoff` seconds
+        self.pipelined = pipelined
+        self.quorum = quorum
+        self.straggler_cutoff = straggler_cutoff
+        self.synthesis_batch_size = synthesis_batch_size
 
     async def run(self, query: str) -> None:
         trace_id = gen_trace_id()
@@ -35,7 +63,10 @@ class ResearchManager:
                 hide_checkmark=True,
             )
             search_plan = await self._plan_searches(query)
-            search_results = await self._perform_searches(search_plan)
+            if self.pipelined:
+                search_results = await self._perform_searches_pipelined(query, search_plan)
+            else:
+                search_results = await self._perform_searches(search_plan)
             report = await self._write_report(query, search_results)
 
             final_report = f"Report summary\n\n{report.short_summary}"
@@ -66,7 +97,8 @@ class ResearchManager:
         with custom_span("Search the web"):
             self.printer.update_item("searching", "Searching...")
             num_completed = 0
-            tasks = [asyncio.create_task(self._search(item)) for item in search_plan.searches]
+            job = self.scheduler.new_job()
+            tasks = [asyncio.create_task(self._search(item, job)) for item in search_plan.searches]
             results = []
             for task in asyncio.as_completed(tasks):
                 result = await task
@@ -79,17 +111,76 @@ class ResearchManager:
             self.printer.mark_item_done("searching")
             return results
 
-    async def _search(self, item: WebSearchItem) -> str | None:
+    async def _perform_searches_pipelined(self, query: str, search_plan: WebSearchPlan) -> list[str]:
+        with custom_span("Search the web"):
+            self.printer.update_item("searching", "Searching...")
+            job = self.scheduler.new_job()
+            pending = {
+                asyncio.create_task(self._search(item, job)) for item in search_plan.searches
+            }
+            total = len(pending)
+            quorum = math.ceil(total * self.quorum)
+            synthesis = RunningSynthesis(query, self.synthesis_batch_size)
+            loop = asyncio.get_running_loop()
+            deadline: float | None = None
+            num_completed = 0
+
+            while pending:
+                if deadline is None and num_completed >= quorum:
+                    deadline = loop.time() + self.straggler_cutoff
+                timeout = None if deadline is None else max(0.0, deadline - loop.time())
+                done, pending = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    break
+                for task in done:
+                    result = task.result()
+                    if result is not None:
+                        synthesis.add(result)
+                    num_completed += 1
+                self.printer.update_item(
+                    "searching",
+                    f"Searching... {num_completed}/{total} completed, "
+                    f"{synthesis.folds} folded into notes",
+                )
+
+            for task in pending:
+                task.cancel()
+            if pending:
+                self.printer.update_item(
+                    "searching",
+                    f"Searched {num_completed}/{total}, dropped {len(pending)} stragglers",
+                )
+            self.printer.mark_item_done("searching")
+            return await synthesis.finish()
+
+    async def _search(self, item: WebSearchItem, job: int) -> str | None:
         input = f"Search term: {item.query}\nReason for searching: {item.reason}"
         try:
-            result = await Runner.run(
-                search_agent,
-                input,
+            return await self.cache.get_or_compute(
+                search_agent.name, item.query, lambda: self._run_search(input, job)
             )
-            return str(result.final_output)
         except Exception:
             return None
 
+    async def _run_search(self, input: str, job: int) -> str:
+        # Hedge inside the admitted call, so queueing time never counts toward the
+        # hedge delay or the deadline; a hedge fires only if it gets a slot of its own
+        result = await self.scheduler.run(
+            job,
+            lambda: self.hedger.run(
+                lambda: Runner.run(
+                    search_agent,
+                    input,
+                    run_config=self.search_run_config,
+                ),
+                acquire_hedge=self.scheduler.try_acquire,
+                release_hedge=self.scheduler.release,
+            ),
+        )
+        return str(result.final_output)
+
     async def _write_report(self, query: str, search_results: list[str]) -> ReportData:
         self.printer.update_item("writing", "Thinking about report...")
         input = f"Original query: {query}\nSummarized search results: {search_results}"
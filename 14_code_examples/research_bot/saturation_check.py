@@ -0,0 +1,120 @@
+"""Regression checks for hedged searches under a saturated scheduler.
+
+1. Queueing: ten 0.2s searches go through a scheduler that admits two at a
+   time, so most of them wait well past the 0.3s hedge point and the 1s
+   deadline before they run. None is slow once admitted, so none may be
+   hedged or time out.
+2. Admission: twelve searches share a provider limit of four, and three
+   primaries are slow enough to be hedged. The first two reach the hedge
+   point while every slot is taken, the last once slots are free again.
+   Hedges must take a slot of their own, so the model never sees more than
+   four concurrent calls, and only the last one may be hedged.
+
+Run with `python -m research_bot.saturation_check` from `14_code_examples`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Callable
+
+from agents import RunConfig
+
+from .fake_model import FakeSearchModel
+from .hedging import HedgedRequests
+from .manager import ResearchManager
+from .search_cache import SearchResultCache
+from .search_scheduler import AdaptiveSearchScheduler, ProviderLimit
+
+
+class ConcurrencyTrackingModel(FakeSearchModel):
+    """FakeSearchModel that records the peak number of calls in flight."""
+
+    def __init__(self, latency: Callable[[str, int], float]) -> None:
+        super().__init__(latency)
+        self.in_flight = 0
+        self.peak = 0
+
+    async def get_response(self, *args, **kwargs):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            return await super().get_response(*args, **kwargs)
+        finally:
+            self.in_flight -= 1
+
+
+def make_manager(
+    limit: int, hedger: HedgedRequests, model: FakeSearchModel
+) -> tuple[ResearchManager, AdaptiveSearchScheduler]:
+    scheduler = AdaptiveSearchScheduler(
+        providers={"openai": ProviderLimit(initial=limit, maximum=limit)}
+    )
+    manager = ResearchManager(
+        scheduler=scheduler,
+        cache=SearchResultCache(path=None),
+        hedger=hedger,
+        search_run_config=RunConfig(model=model, tracing_disabled=True),
+    )
+    return manager, scheduler
+
+
+async def run_searches(manager: ResearchManager, job: int, count: int) -> list[str]:
+    try:
+        return await asyncio.gather(
+            *(
+                manager._run_search(f"Search term: topic {i}\nReason: check", job)
+                for i in range(count)
+            )
+        )
+    finally:
+        manager.printer.end()
+
+
+async def check_queueing_is_not_hedged() -> None:
+    hedger = HedgedRequests(deadline=1.0, initial_hedge_after=0.3)
+    manager, scheduler = make_manager(2, hedger, FakeSearchModel(lambda input, attempt: 0.2))
+
+    start = time.perf_counter()
+    results = await run_searches(manager, scheduler.new_job(), 10)
+    elapsed = time.perf_counter() - start
+
+    stats = hedger.get_stats()
+    print(f"queueing: {len(results)} searches in {elapsed:.2f}s, hedger: {stats}")
+    assert len(results) == 10
+    assert stats.get("hedged", 0) == 0, "queued searches were hedged"
+    assert stats.get("deadline_exceeded", 0) == 0, "queued searches hit the deadline"
+    assert max(hedger.latencies) < 0.3, "latency window includes queueing time"
+
+
+async def check_hedges_respect_provider_limit() -> None:
+    def latency(input: str, attempt: int) -> float:
+        # A few primaries are slow; their hedges are fast
+        slow = int(input.split("topic ")[1].split()[0]) in (0, 3, 11)
+        return 1.0 if slow and attempt == 0 else 0.1
+
+    limit = 4
+    model = ConcurrencyTrackingModel(latency)
+    hedger = HedgedRequests(deadline=5.0, initial_hedge_after=0.3)
+    manager, scheduler = make_manager(limit, hedger, model)
+
+    results = await run_searches(manager, scheduler.new_job(), 12)
+
+    stats = hedger.get_stats()
+    print(f"admission: peak {model.peak} concurrent model calls (limit {limit}), hedger: {stats}")
+    assert len(results) == 12
+    assert stats.get("hedge_skipped", 0) > 0, "no hedge met a full provider"
+    assert stats.get("hedged", 0) > 0, "no hedge fired on spare capacity"
+    assert model.peak <= limit, "hedges bypassed the provider limit"
+    assert scheduler.in_flight == 0, "a hedge slot was never released"
+
+
+async def main() -> None:
+    await check_queueing_is_not_hedged()
+    await check_hedges_respect_provider_limit()
+    print("OK: hedging counts service time only and stays within the provider limit")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import re
+import sqlite3
+import time
+import unicodedata
+from collections import Counter, OrderedDict
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any
+
+DEFAULT_PATH = Path(
+    os.environ.get("RESEARCH_SEARCH_CACHE", Path.home() / ".cache" / "research_bot" / "searches.db")
+)
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """Fold case, Unicode forms, punctuation and spacing, so near-identical terms match."""
+    text = unicodedata.normalize("NFKC", query).casefold()
+    text = _PUNCTUATION.sub(" ", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def cache_key(namespace: str, query: str) -> str:
+    """Content address of a search: the agent that ran it plus the normalized term."""
+    return hashlib.sha256(f"{namespace}\0{normalize_query(query)}".encode()).hexdigest()
+
+
+class SearchResultCache:
+    """Two-tier cache of search summaries: an in-memory LRU over a SQLite file.
+
+    Every entry carries its own expiry time. Memory misses fall through to
+    SQLite, and disk hits are promoted into memory. Concurrent lookups of the
+    same key share one computation, so overlapping research runs issue a
+    search once. Disk lookups are single-row primary-key reads, so they run
+    inline on the event loop.
+    """
+
+    def __init__(
+        self,
+        path: str | Path | None = DEFAULT_PATH,
+        max_entries: int = 1024,
+        ttl: float = 24 * 3600,
+    ) -> None:
+        self.path = Path(path) if path is not None else None
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.memory: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self.metrics: Counter[str] = Counter()
+        self._in_flight: dict[str, asyncio.Future[str]] = {}
+        self._db: sqlite3.Connection | None = None
+
+    def _connection(self) -> sqlite3.Connection | None:
+        """Open the disk tier on first use; `path=None` keeps the cache in memory only."""
+        if self._db is None and self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(self.path)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS search_results ("
+                "key TEXT PRIMARY KEY, namespace TEXT, query TEXT, "
+                "result TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._db.execute("DELETE FROM search_results WHERE expires_at <= ?", (time.time(),))
+            self._db.commit()
+        return self._db
+
+    def get(self, namespace: str, query: str) -> str | None:
+        key = cache_key(namespace, query)
+        now = time.time()
+
+        entry = self.memory.get(key)
+        if entry is not None:
+            if entry[1] > now:
+                self.memory.move_to_end(key)
+                self.metrics["memory_hits"] += 1
+                return entry[0]
+            del self.memory[key]
+            self.metrics["expired"] += 1
+
+        db = self._connection()
+        if db is not None:
+            row = db.execute(
+                "SELECT result, expires_at FROM search_results WHERE key = ? AND expires_at > ?",
+                (key, now),
+            ).fetchone()
+            if row is not None:
+                self._remember(key, row[0], row[1])
+                self.metrics["disk_hits"] += 1
+                return row[0]
+
+        self.metrics["misses"] += 1
+        return None
+
+    def set(self, namespace: str, query: str, result: str, ttl: float | None = None) -> None:
+        key = cache_key(namespace, query)
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        self._remember(key, result, expires_at)
+        db = self._connection()
+        if db is not None:
+            db.execute(
+                "INSERT OR REPLACE INTO search_results VALUES (?, ?, ?, ?, ?)",
+                (key, namespace, normalize_query(query), result, expires_at),
+            )
+            db.commit()
+        self.metrics["writes"] += 1
+
+    def _remember(self, key: str, result: str, expires_at: float) -> None:
+        self.memory[key] = (result, expires_at)
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_entries:
+            self.memory.popitem(last=False)
+            self.metrics["evictions"] += 1
+
+    async def get_or_compute(
+        self,
+        namespace: str,
+        query: str,
+        compute: Callable[[], Awaitable[str]],
+        ttl: float | None = None,
+    ) -> str:
+        """Cached result for the search, running `compute` once on a miss.
+
+        Failures are not cached; every caller waiting on the key sees the error.
+        """
+        cached = self.get(namespace, query)
+        if cached is not None:
+            return cached
+
+        key = cache_key(namespace, query)
+        pending = self._in_flight.get(key)
+        if pending is not None:
+            self.metrics["coalesced"] += 1
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # The caller computing it was cancelled; take over
+                return await self.get_or_compute(namespace, query, compute, ttl)
+
+        future: asyncio.Future[str] = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            result = await compute()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as error:
+            future.set_exception(error)
+            # Mark retrieved in case nobody else was waiting
+            future.exception()
+            raise
+        else:
+            self.set(namespace, query, result, ttl)
+            future.set_result(result)
+            return result
+        finally:
+            del self._in_flight[key]
+
+    def get_stats(self) -> dict[str, Any]:
+        lookups = self.metrics["memory_hits"] + self.metrics["disk_hits"] + self.metrics["misses"]
+        hits = self.metrics["memory_hits"] + self.metrics["disk_hits"]
+        return {
+            **self.metrics,
+            "lookups": lookups,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            # Coalesced lookups waited on another caller's search instead of running one
+            "searches_saved": hits + self.metrics["coalesced"],
+            "memory_entries": len(self.memory),
+        }
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+# One cache per process, shared by both research bots
+default_cache = SearchResultCache()
@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import time
+from collections import OrderedDict, deque
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+from openai import RateLimitError
+
+T = TypeVar("T")
+
+
+def is_rate_limited(error: BaseException) -> bool:
+    """True for a 429 from the model provider."""
+    return isinstance(error, RateLimitError) or getattr(error, "status_code", None) == 429
+
+
+@dataclass
+class ProviderLimit:
+    """AIMD concurrency limit for one model provider.
+
+    Each success under `target_latency` adds `increase / limit`, i.e. about
+    `increase` per round of calls. A 429 multiplies the limit by
+    `rate_limit_backoff` and a slow success by `latency_backoff`, at most once
+    per `cooldown` seconds so one burst of failures counts as one signal.
+    """
+
+    initial: float = 4
+    minimum: float = 1
+    maximum: float = 16
+    target_latency: float = 20.0
+    increase: float = 1.0
+    rate_limit_backoff: float = 0.5
+    latency_backoff: float = 0.9
+    cooldown: float = 2.0
+
+    limit: float = field(init=False)
+    in_flight: int = field(default=0, init=False)
+    last_decrease: float = field(default=float("-inf"), init=False)
+    successes: int = field(default=0, init=False)
+    rate_limited: int = field(default=0, init=False)
+    latency_ewma: float | None = field(default=None, init=False)
+
+    def __post_init__(self) -> None:
+        self.limit = self.initial
+
+    def has_capacity(self) -> bool:
+        return self.in_flight < int(self.limit)
+
+    def on_success(self, latency: float) -> None:
+        self.successes += 1
+        self.latency_ewma = (
+            latency if self.latency_ewma is None else 0.8 * self.latency_ewma + 0.2 * latency
+        )
+        if latency > self.target_latency:
+            self._decrease(self.latency_backoff)
+        else:
+            self.limit = min(self.maximum, self.limit + self.increase / self.limit)
+
+    def on_rate_limited(self) -> None:
+        self.rate_limited += 1
+        self._decrease(self.rate_limit_backoff)
+
+    def _decrease(self, factor: float) -> None:
+        now = time.monotonic()
+        if now - self.last_decrease >= self.cooldown:
+            self.limit = max(self.minimum, self.limit * factor)
+            self.last_decrease = now
+
+
+class AdaptiveSearchScheduler:
+    """Shared admission control for search calls from concurrent research jobs.
+
+    A call runs once both the global cap and its provider's AIMD limit have
+    room. Waiting calls are queued per job and granted round-robin across
+    jobs, so a job that planned 20 searches cannot starve one that planned 5.
+    Calls that hit a 429 are retried up to `max_retries` times, after a short
+    backoff, at the back of their job's queue.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 32,
+        providers: dict[str, ProviderLimit] | None = None,
+        max_retries: int = 2,
+        retry_backoff: float = 1.0,
+    ) -> None:
+        self.max_concurrency = max_concurrency
+        self.providers: dict[str, ProviderLimit] = providers or {}
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.in_flight = 0
+        # Job -> waiting (provider, future) pairs; job order is the round-robin order
+        self._queues: OrderedDict[Hashable, deque[tuple[str, asyncio.Future[None]]]] = (
+            OrderedDict()
+        )
+        self._job_ids = itertools.count(1)
+
+    def new_job(self) -> int:
+        """Key for one research job's calls."""
+        return next(self._job_ids)
+
+    def provider(self, name: str) -> ProviderLimit:
+        if name not in self.providers:
+            self.providers[name] = ProviderLimit()
+        return self.providers[name]
+
+    async def run(
+        self,
+        job: Hashable,
+        call: Callable[[], Awaitable[T]],
+        provider: str = "openai",
+    ) -> T:
+        """Run `call` when admitted, feeding its latency or 429 back into the limit."""
+        limit = self.provider(provider)
+        attempt = 0
+        while True:
+            await self._acquire(job, provider)
+            start = time.monotonic()
+            try:
+                result = await call()
+            except Exception as error:
+                if not is_rate_limited(error):
+                    raise
+                limit.on_rate_limited()
+                if attempt >= self.max_retries:
+                    raise
+            else:
+                limit.on_success(time.monotonic() - start)
+                return result
+            finally:
+                self.release(provider)
+            await asyncio.sleep(self.retry_backoff * 2**attempt)
+            attempt += 1
+
+    async def _acquire(self, job: Hashable, provider: str) -> None:
+        limit = self.provider(provider)
+        if not self._queues and self.in_flight < self.max_concurrency and limit.has_capacity():
+            self._admit(provider)
+            return
+
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._queues.setdefault(job, deque()).append((provider, future))
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Admitted just before being cancelled: hand the slot back
+                self.release(provider)
+            else:
+                self._discard(job, future)
+            raise
+
+    def try_acquire(self, provider: str = "openai") -> bool:
+        """Take a slot now if one is free and nobody is waiting; never queues.
+
+        For extra calls that are only worth making on spare capacity, such as
+        hedges. A True result must be paired with `release(provider)`.
+        """
+        if self._queues or self.in_flight >= self.max_concurrency:
+            return False
+        if not self.provider(provider).has_capacity():
+            return False
+        self._admit(provider)
+        return True
+
+    def _admit(self, provider: str) -> None:
+        self.in_flight += 1
+        self.providers[provider].in_flight += 1
+
+    def release(self, provider: str = "openai") -> None:
+        self.in_flight -= 1
+        self.providers[provider].in_flight -= 1
+        self._dispatch()
+
+    def _discard(self, job: Hashable, future: asyncio.Future[None]) -> None:
+        queue = self._queues.get(job)
+        if queue is None:
+            return
+        for entry in queue:
+            if entry[1] is future:
+                queue.remove(entry)
+                break
+        if not queue:
+            del self._queues[job]
+
+    def _dispatch(self) -> None:
+        """Grant free slots round-robin across jobs with admissible waiting calls."""
+        granted = True
+        while granted and self._queues and self.in_flight < self.max_concurrency:
+            granted = False
+            for job in list(self._queues):
+                queue = self._queues[job]
+                for entry in list(queue):
+                    provider, future = entry
+                    if future.done():
+                        # Its caller was cancelled and will discard it
+                        queue.remove(entry)
+                    elif self.providers[provider].has_capacity():
+                        queue.remove(entry)
+                        self._admit(provider)
+                        future.set_result(None)
+                        granted = True
+                        break
+                if not queue:
+                    del self._queues[job]
+                elif granted:
+                    # Served jobs go to the back of the round-robin order
+                    self._queues.move_to_end(job)
+                if granted:
+                    break
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "in_flight": self.in_flight,
+            "waiting": sum(len(queue) for queue in self._queues.values()),
+            "waiting_jobs": len(self._queues),
+            "providers": {
+                name: {
+                    "limit": round(limit.limit, 2),
+                    "in_flight": limit.in_flight,
+                    "successes": limit.successes,
+                    "rate_limited": limit.rate_limited,
+                    "latency_ewma": limit.latency_ewma,
+                }
+                for name, limit in self.providers.items()
+            },
+        }
+
+
+# One scheduler per process, so concurrent research jobs share the provider limits
+default_scheduler = AdaptiveSearchScheduler()
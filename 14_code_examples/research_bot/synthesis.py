@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import asyncio
+
+from agents import Runner, custom_span
+
+from .agents.synthesis_agent import synthesis_agent
+
+
+class RunningSynthesis:
+    """Folds search summaries into running notes while the searches continue.
+
+    Whenever `batch_size` summaries are waiting and no fold is in progress,
+    one `synthesis_agent` call merges them into the notes. Folds run one at
+    a time; summaries that arrive meanwhile wait for the next one. If a fold
+    fails, its summaries are kept verbatim and folding stops.
+    """
+
+    def __init__(self, query: str, batch_size: int = 3) -> None:
+        self.query = query
+        self.batch_size = batch_size
+        self.notes = ""
+        self.pending: list[str] = []
+        self.unfolded: list[str] = []
+        self.folds = 0
+        self._task: asyncio.Task[None] | None = None
+        self._failed = False
+
+    def add(self, summary: str) -> None:
+        self.pending.append(summary)
+        if self._task is None or self._task.done():
+            if len(self.pending) >= self.batch_size and not self._failed:
+                self._task = asyncio.create_task(self._fold_batches())
+
+    async def _fold_batches(self) -> None:
+        while len(self.pending) >= self.batch_size and not self._failed:
+            batch, self.pending = self.pending, []
+            summaries = "\n\n".join(f"- {summary}" for summary in batch)
+            input = (
+                f"Original query: {self.query}\n"
+                f"Current notes:\n{self.notes or '(none yet)'}\n"
+                f"New search summaries:\n{summaries}"
+            )
+            try:
+                with custom_span("Fold search summaries"):
+                    result = await Runner.run(synthesis_agent, input)
+            except Exception:
+                self._failed = True
+                self.unfolded.extend(batch)
+            else:
+                self.notes = str(result.final_output)
+                self.folds += 1
+
+    async def finish(self) -> list[str]:
+        """Wait for the fold in progress and return the material for the writer.
+
+        The notes come first, followed by summaries too few to be worth
+        another fold. These are passed on verbatim, so writing starts
+        without one more model call.
+        """
+        if self._task is not None:
+            await self._task
+        material = [f"Running notes:\n{self.notes}"] if self.notes else []
+        return material + self.unfolded + self.pending